@@ -0,0 +1,22 @@
+// Tables envoyées par colonnes ({colonne: [valeurs]}, voir thesis_encodage.py)
+// remises en lignes pour les DataTable
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    encodage: {
+        enregistrements: function (colonnes) {
+            if (!colonnes) {
+                return [];
+            }
+            const noms = Object.keys(colonnes);
+            const nbLignes = noms.length ? colonnes[noms[0]].length : 0;
+            const lignes = new Array(nbLignes);
+            for (let i = 0; i < nbLignes; i++) {
+                const ligne = {};
+                for (const nom of noms) {
+                    ligne[nom] = colonnes[nom][i];
+                }
+                lignes[i] = ligne;
+            }
+            return lignes;
+        },
+    },
+});
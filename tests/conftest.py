@@ -0,0 +1,5 @@
+# Modules du mémoire (thesis_*.py) importables depuis les tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,126 @@
+# Data manipulation
+import numpy as np
+import pandas as pd
+import pytest
+
+# Moteur de rééquilibrage
+from thesis_backtest import dates_reequilibrage, simuler_reequilibrage
+
+
+# =================================================================================
+#                                   Données
+# =================================================================================
+
+
+def marche(T=130, N=6, M=3, graine=0):
+    # Prix d'actions (marche aléatoire géométrique) et poids cibles positifs
+    generateur = np.random.default_rng(graine)
+    dates = pd.bdate_range("2020-01-01", periods=T)
+    prix = pd.DataFrame(
+        100 * np.exp(np.cumsum(generateur.normal(0, 0.02, (T, N)), axis=0)),
+        index=dates,
+        columns=[f"a{i}" for i in range(N)],
+    )
+    poids = pd.DataFrame(
+        generateur.uniform(0, 1, (N, M)),
+        index=prix.columns,
+        columns=[f"m{j}" for j in range(M)],
+    )
+    poids.iloc[0, 0] = 0.0
+    return prix, poids / poids.sum()
+
+
+def simulation_naive(P, cibles, reequilibrages, cout, valeur_initiale, seuil=None):
+    # Référence : chaque modèle séparément, date par date, parts détenues
+    # cibles : (T x N x M) cible en vigueur à chaque date
+    T, N, M = cibles.shape
+    valeur = np.zeros((T, M))
+    derive = np.zeros((T, M))
+    rotation = np.zeros((T, M))
+    couts = np.zeros((T, M))
+    for m in range(M):
+        parts = cibles[0, :, m] * valeur_initiale / P[0]
+        valeur[0, m] = valeur_initiale
+        for t in range(1, T):
+            montants = parts * P[t]
+            v = montants.sum()
+            ecart = np.abs(cibles[t, :, m] - montants / v).sum()
+            derive[t, m] = 0.5 * ecart
+            if (seuil is None and t in reequilibrages) or (
+                seuil is not None and 0.5 * ecart > seuil
+            ):
+                rotation[t, m] = 0.5 * ecart
+                couts[t, m] = cout * ecart * v
+                v -= couts[t, m]
+                parts = cibles[t, :, m] * v / P[t]
+                derive[t, m] = 0.0
+            valeur[t, m] = v
+    return valeur, derive, rotation, couts
+
+
+# =================================================================================
+#                     Comparaison à une boucle quotidienne
+# =================================================================================
+
+
+@pytest.mark.parametrize("reequilibrage", ["mensuel", "trimestriel", "aucun"])
+def test_calendrier(reequilibrage):
+    prix, poids = marche()
+    resultat = simuler_reequilibrage(prix, poids, reequilibrage, cout=0.001)
+
+    P = prix.to_numpy()
+    cibles = np.broadcast_to(poids.to_numpy(), (len(P), *poids.shape))
+    reequilibrages = set(dates_reequilibrage(prix.index, reequilibrage))
+    valeur, derive, rotation, couts = simulation_naive(
+        P, cibles, reequilibrages, 0.001, 100.0
+    )
+
+    np.testing.assert_allclose(resultat["valeur"], valeur, rtol=1e-10)
+    np.testing.assert_allclose(resultat["derive"], derive, atol=1e-12)
+    np.testing.assert_allclose(resultat["rotation"], rotation, atol=1e-12)
+    np.testing.assert_allclose(resultat["couts"], couts, atol=1e-12)
+
+
+def test_cibles_successives():
+    # Une nouvelle cible déclenche un rééquilibrage à sa date d'effet
+    prix, poids = marche()
+    seconde = poids.iloc[::-1].set_axis(poids.index)
+    changement = 50
+    resultat = simuler_reequilibrage(
+        prix, {prix.index[0]: poids, prix.index[changement]: seconde}, cout=0.002
+    )
+
+    P = prix.to_numpy()
+    cibles = np.stack(
+        [(poids if t < changement else seconde).to_numpy() for t in range(len(P))]
+    )
+    reequilibrages = set(dates_reequilibrage(prix.index, "mensuel")) | {changement}
+    valeur, _, rotation, _ = simulation_naive(P, cibles, reequilibrages, 0.002, 100.0)
+
+    np.testing.assert_allclose(resultat["valeur"], valeur, rtol=1e-10)
+    np.testing.assert_allclose(resultat["rotation"], rotation, atol=1e-12)
+
+
+def test_seuil():
+    prix, poids = marche()
+    resultat = simuler_reequilibrage(prix, poids, "seuil", seuil=0.02, cout=0.001)
+
+    P = prix.to_numpy()
+    cibles = np.broadcast_to(poids.to_numpy(), (len(P), *poids.shape))
+    valeur, derive, rotation, couts = simulation_naive(
+        P, cibles, set(), 0.001, 100.0, seuil=0.02
+    )
+
+    assert (rotation > 0).any()
+    np.testing.assert_allclose(resultat["valeur"], valeur, rtol=1e-10)
+    np.testing.assert_allclose(resultat["derive"], derive, atol=1e-12)
+    np.testing.assert_allclose(resultat["couts"], couts, atol=1e-12)
+
+
+def test_sans_cout_achat_conservation():
+    # Sans rééquilibrage ni coût : valeur = parts initiales x prix
+    prix, poids = marche()
+    resultat = simuler_reequilibrage(prix, poids, "aucun")
+
+    parts = poids.to_numpy() * 100.0 / prix.to_numpy()[0][:, None]
+    np.testing.assert_allclose(resultat["valeur"], prix.to_numpy() @ parts, rtol=1e-12)
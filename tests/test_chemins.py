@@ -0,0 +1,28 @@
+# Data manipulation
+import numpy as np
+
+# Index des chemins de régularisation par cardinalité
+from thesis_chemins import index_cardinalites
+
+
+# =================================================================================
+#                  Index K -> point face à un parcours du chemin
+# =================================================================================
+
+
+def test_index_cardinalites():
+    generateur = np.random.default_rng(0)
+    # Chemin non monotone (les actions entrent et sortent), points vides inclus
+    nb_variables = np.r_[0, 0, generateur.integers(3, 40, 120)]
+    erreurs = generateur.uniform(0.01, 0.05, len(nb_variables))
+
+    index = index_cardinalites(nb_variables, erreurs).set_index("k")["point"]
+
+    attendu = {}
+    for k in range(1, nb_variables.max() + 1):
+        candidats = np.flatnonzero((nb_variables > 0) & (nb_variables <= k))
+        if len(candidats):
+            attendu[k] = candidats[np.argmin(erreurs[candidats])]
+
+    assert min(attendu) == nb_variables[nb_variables > 0].min()
+    assert index.to_dict() == attendu
@@ -0,0 +1,55 @@
+# Data manipulation
+import numpy as np
+from statsmodels.tsa.stattools import acf, pacf
+
+# Diagnostics des séries de rendements
+from thesis_diagnostics import acf_fft, ljung_box, pacf_durbin_levinson
+
+
+# =================================================================================
+#                                   Données
+# =================================================================================
+
+
+def rendements(T=500, k=3, graine=0):
+    # Colonnes AR(1) de coefficients différents
+    generateur = np.random.default_rng(graine)
+    bruit = generateur.normal(0, 0.01, (T, k))
+    R = np.zeros((T, k))
+    phi = np.array([0.0, 0.3, -0.5])[:k]
+    for t in range(1, T):
+        R[t] = phi * R[t - 1] + bruit[t]
+    return R
+
+
+# =================================================================================
+#                         ACF, PACF et Ljung-Box de référence
+# =================================================================================
+
+
+def test_acf_pacf():
+    R = rendements()
+    autocorrelations = acf_fft(R, 20)
+    partielles = pacf_durbin_levinson(autocorrelations)
+    for j in range(R.shape[1]):
+        # statsmodels : estimateur biaisé (dénominateur n), Durbin-Levinson
+        np.testing.assert_allclose(
+            autocorrelations[:, j], acf(R[:, j], nlags=20, fft=False), atol=1e-12
+        )
+        np.testing.assert_allclose(
+            partielles[:, j], pacf(R[:, j], nlags=20, method="ldb")[1:], atol=1e-10
+        )
+
+
+def test_ljung_box():
+    R = rendements()
+    n = len(R)
+    autocorrelations = acf_fft(R, 10)
+    q, p_valeurs = ljung_box(autocorrelations, n)
+
+    h = np.arange(1, 11)[:, None]
+    attendues = n * (n + 2) * np.cumsum(autocorrelations[1:] ** 2 / (n - h), axis=0)
+    np.testing.assert_allclose(q, attendues, rtol=1e-12)
+    # AR(1) marqué : autocorrélation détectée, bruit blanc : non
+    assert (p_valeurs[:, 2] < 1e-6).all()
+    assert p_valeurs[0, 0] > 0.01
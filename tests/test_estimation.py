@@ -0,0 +1,125 @@
+# Data manipulation
+import numpy as np
+import pytest
+
+# Moteurs de calcul du mémoire
+from thesis_estimation import (
+    CorrelationsDistanceGlissantes,
+    MomentsGlissants,
+    ajuster,
+    correlations_distance,
+    enet_positif,
+    facteurs_penalite,
+)
+
+
+# =================================================================================
+#                                   Données
+# =================================================================================
+
+
+def donnees(T=300, p=12, graine=0):
+    # Indice = combinaison positive des actions + bruit, écart-type de y loin de 1
+    generateur = np.random.default_rng(graine)
+    X = generateur.normal(0, 0.01, (T, p))
+    poids = generateur.uniform(0.2, 1.0, p)
+    y = X @ poids + generateur.normal(0, 0.002, T)
+    return X, y
+
+
+def glmnet_standardise(X, y, lambda_, alpha, facteurs=None):
+    # Procédure de glmnet (famille gaussienne) : y réduit par s_y, lambda / s_y,
+    # ajustement sur les variables standardisées, puis retour à l'échelle de y
+    s = MomentsGlissants(X, y).positionner(0, len(y)).standardise()
+    s_y = np.sqrt(s["variance_y"])
+    beta = enet_positif(s["C"], s["c"] / s_y, lambda_ / s_y, alpha, facteurs)
+    return beta * s_y, s
+
+
+# =================================================================================
+#                     Elastic Net non négatif (objectif de glmnet)
+# =================================================================================
+
+
+def test_ridge_forme_fermee():
+    # Solution intérieure (tous les poids > 0) : système linéaire de glmnet
+    X, y = donnees()
+    lambda_ = 1e-3
+    s = MomentsGlissants(X, y).positionner(0, len(y)).standardise()
+    s_y = np.sqrt(s["variance_y"])
+    reference = s_y * np.linalg.solve(
+        s["C"] + lambda_ / s_y * np.eye(len(s["c"])), s["c"] / s_y
+    )
+    assert np.all(reference > 0)
+
+    _, coefficients, beta = ajuster(
+        MomentsGlissants(X, y).positionner(0, len(y)), lambda_, 0.0
+    )
+    np.testing.assert_allclose(beta, reference, rtol=1e-4)
+    np.testing.assert_allclose(coefficients, reference / s["ecarts"], rtol=1e-4)
+
+
+@pytest.mark.parametrize("alpha", [0.0, 0.3, 0.5, 1.0])
+def test_equivalence_y_reduit(alpha):
+    # Même solution que l'ajustement de glmnet sur y / s_y (pénalités comprises)
+    X, y = donnees(graine=1)
+    facteurs = np.random.default_rng(2).uniform(0.5, 2.0, X.shape[1])
+    for lambda_ in [1e-5, 1e-4, 1e-3]:
+        reference, s = glmnet_standardise(X, y, lambda_, alpha, facteurs)
+        beta = enet_positif(
+            s["C"], s["c"], lambda_, alpha, facteurs, ecart_y=s["ecart_y"]
+        )
+        np.testing.assert_allclose(beta, reference, rtol=1e-4, atol=1e-9)
+
+
+def test_conditions_kkt():
+    # Gradient nul sur les poids actifs, positif (à la tolérance près) ailleurs
+    X, y = donnees(p=40, graine=3)
+    s = MomentsGlissants(X, y).positionner(0, len(y)).standardise()
+    lambda_, alpha = 1e-2, 0.7
+    beta = enet_positif(s["C"], s["c"], lambda_, alpha, ecart_y=s["ecart_y"])
+    pf = facteurs_penalite(None, len(beta))
+    gradient = (
+        s["C"] @ beta
+        - s["c"]
+        + lambda_ * pf * ((1 - alpha) * beta / s["ecart_y"] + alpha)
+    )
+    actifs = beta > 0
+    assert actifs.any() and (~actifs).any()
+    np.testing.assert_allclose(gradient[actifs], 0, atol=1e-6)
+    assert np.all(gradient[~actifs] > -1e-6)
+
+
+# =================================================================================
+#                 Filtrage DC-SIS : corrélations de distance
+# =================================================================================
+
+
+def correlation_distance_directe(x, y):
+    # Székely et al. (2007) : matrices de distances doublement centrées
+    def centrees(v):
+        a = np.abs(v[:, None] - v[None, :])
+        return a - a.mean(axis=0) - a.mean(axis=1)[:, None] + a.mean()
+
+    A, B = centrees(x), centrees(y)
+    return np.sqrt((A * B).mean() / np.sqrt((A * A).mean() * (B * B).mean()))
+
+
+def test_correlations_distance():
+    X, y = donnees(T=80, p=6)
+    X[:, 0] = X[:, 1] ** 2  # dépendance non linéaire
+    attendues = [correlation_distance_directe(X[:, j], y) for j in range(X.shape[1])]
+    np.testing.assert_allclose(correlations_distance(X, y), attendues, rtol=1e-10)
+
+
+def test_correlations_distance_glissantes():
+    # Fenêtre glissante (mises à jour et recalculs périodiques) = calcul direct
+    X, y = donnees(T=200, p=8)
+    glissantes = CorrelationsDistanceGlissantes(X, y, recalcul_periodique=3)
+    for debut, fin in [(0, 60), (5, 65), (12, 70), (13, 71), (40, 120), (30, 110)]:
+        glissantes.positionner(debut, fin)
+        np.testing.assert_allclose(
+            glissantes.correlations(),
+            correlations_distance(X[debut:fin], y[debut:fin]),
+            rtol=1e-9,
+        )
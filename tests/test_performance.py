@@ -0,0 +1,114 @@
+# Data manipulation
+import numpy as np
+
+# Mesures de performance et bootstrap
+from thesis_performance import (
+    MESURES,
+    bootstrap_mesures,
+    indices_bootstrap,
+    mesures_performance,
+)
+
+
+# =================================================================================
+#                                   Données
+# =================================================================================
+
+
+def series(T=400, M=3, N=2, graine=0):
+    # Indices, ETF proches de l'indice et taux sans risque quotidiens
+    generateur = np.random.default_rng(graine)
+    Rb = generateur.normal(3e-4, 0.01, (T, N))
+    Ra = Rb[:, :1] * generateur.uniform(0.8, 1.2, M) + generateur.normal(
+        0, 0.002, (T, M)
+    )
+    Rf = np.abs(generateur.normal(1e-4, 2e-5, T))
+    return Ra, Rb, Rf
+
+
+def mesures_naives(ra, rb, rf, periodes=252):
+    # Définitions de PerformanceAnalytics, une série à la fois
+    annualise = lambda r: np.prod(1 + r) ** (periodes / len(r)) - 1
+    active = annualise(ra) - annualise(rb)
+    tracking = np.std(ra - rb, ddof=1) * np.sqrt(periodes)
+    excedent_a, excedent_b = ra - rf, rb - rf
+    beta = np.cov(excedent_a, excedent_b)[0, 1] / np.var(excedent_b, ddof=1)
+    return {
+        "Tracking_Error": tracking,
+        "Active_Return": active,
+        "Information_Ratio": active / tracking,
+        "Correlation_SP500": np.corrcoef(ra, rb)[0, 1],
+        "Beta": beta,
+        "Jensen_Alpha": annualise(ra) - rf.mean() - beta * (annualise(rb) - rf.mean()),
+    }
+
+
+# =================================================================================
+#                          Mesures face aux définitions
+# =================================================================================
+
+
+def test_mesures_un_indice():
+    Ra, Rb, Rf = series()
+    mesures = mesures_performance(Ra, Rb[:, 0], Rf)
+    for m in range(Ra.shape[1]):
+        attendues = mesures_naives(Ra[:, m], Rb[:, 0], Rf)
+        for mesure in MESURES:
+            np.testing.assert_allclose(mesures[mesure][m], attendues[mesure], rtol=1e-9)
+
+
+def test_mesures_plusieurs_indices():
+    # (N x M) couples en une passe = chaque indice séparément
+    Ra, Rb, Rf = series()
+    mesures = mesures_performance(Ra, Rb, Rf)
+    for n in range(Rb.shape[1]):
+        separees = mesures_performance(Ra, Rb[:, n], Rf)
+        for mesure in MESURES:
+            np.testing.assert_allclose(mesures[mesure][n], separees[mesure], rtol=1e-12)
+
+
+# =================================================================================
+#                          Bootstrap par blocs stationnaire
+# =================================================================================
+
+
+def indices_naifs(generateur, nb_replications, T, longueur_bloc):
+    # Mêmes tirages que indices_bootstrap, bloc par bloc
+    nouveau_bloc = generateur.random((nb_replications, T)) < 1 / longueur_bloc
+    departs = generateur.integers(0, T, size=(nb_replications, T))
+    indices = np.empty((nb_replications, T), dtype=int)
+    for b in range(nb_replications):
+        for t in range(T):
+            if t == 0 or nouveau_bloc[b, t]:
+                indices[b, t] = departs[b, t]
+            else:
+                indices[b, t] = (indices[b, t - 1] + 1) % T
+    return indices
+
+
+def test_indices_bootstrap():
+    indices = indices_bootstrap(np.random.default_rng(7), 20, 50, 5)
+    attendus = indices_naifs(np.random.default_rng(7), 20, 50, 5)
+    np.testing.assert_array_equal(indices, attendus)
+
+
+def test_bootstrap_mesures():
+    # Réplications vectorisées = mesures recalculées réplication par réplication
+    Ra, Rb, Rf = series(T=120)
+    replications = bootstrap_mesures(
+        Ra, Rb, Rf, nb_replications=6, longueur_bloc=4, taille_lot=4, nb_processus=1
+    )
+
+    graines = np.random.SeedSequence(2103).spawn(2)
+    indices = np.vstack(
+        [
+            indices_naifs(np.random.default_rng(g), taille, len(Rb), 4)
+            for g, taille in zip(graines, [4, 2])
+        ]
+    )
+    for b, lignes in enumerate(indices):
+        attendues = mesures_performance(Ra[lignes], Rb[lignes], Rf[lignes])
+        for mesure in MESURES:
+            np.testing.assert_allclose(
+                replications[mesure][b], attendues[mesure], rtol=1e-12
+            )
@@ -0,0 +1,58 @@
+# Data manipulation
+import pandas as pd
+
+# Registre des modèles
+from thesis_registre import RegistreModeles
+
+
+# =================================================================================
+#                                   Données
+# =================================================================================
+
+
+def registre_run(run, lambda_lasso):
+    modeles = pd.DataFrame(
+        {
+            "run": run,
+            "model": ["ridge", "lasso", "adlasso"],
+            "libelle": ["Ridge", "Lasso", "Adaptive Lasso"],
+        }
+    )
+    hyperparametres = pd.DataFrame(
+        {
+            "Modele": ["Ridge", "Lasso", "Adaptive Lasso"],
+            "alpha": [0.0, 1.0, 1.0],
+            "lambda": [1e-3, lambda_lasso, 1e-5],
+        }
+    )
+    return RegistreModeles.depuis_tables(modeles, hyperparametres)
+
+
+# =================================================================================
+#                              Clés (run, libellé)
+# =================================================================================
+
+
+def test_runs_distinctes():
+    registre = RegistreModeles.fusionner(
+        [registre_run("publie", 1e-6), registre_run("reprise", 2e-6)]
+    )
+
+    assert registre.runs == ["publie", "reprise"]
+    assert len(registre.entrees) == 6
+    # Même libellé, hyperparamètres de chaque run conservés
+    assert registre.entree("Lasso", "publie")["lambda"] == 1e-6
+    assert registre.entree("Lasso", "reprise")["lambda"] == 2e-6
+    assert registre.entree("Lasso")["run"] == "reprise"
+
+
+def test_acces_par_run():
+    registre = RegistreModeles.fusionner(
+        [registre_run("publie", 1e-6), registre_run("reprise", 2e-6)]
+    )
+
+    assert registre.libelles("publie") == ["Ridge", "Lasso", "Adaptive Lasso"]
+    assert registre.rechercher(famille="Lasso") == ["Lasso"]
+    assert registre.rechercher("publie", alpha=1.0) == ["Lasso", "Adaptive Lasso"]
+    assert registre.index["run"]["publie"][0] == ("publie", "Ridge")
+    assert registre.pilotes("publie") == {"Adaptive Lasso": "Ridge"}
@@ -0,0 +1,75 @@
+# Standard libraries
+import itertools
+
+# Data manipulation
+import numpy as np
+
+# Modèle de risque actif
+from thesis_risque import covariance_ledoit_wolf, moindres_carres_positifs
+
+
+# =================================================================================
+#                     Covariance rétrécie (Ledoit-Wolf, 2004)
+# =================================================================================
+
+
+def ledoit_wolf_direct(X):
+    # Définitions de l'article, observation par observation (norme ||.||² / p)
+    n, p = X.shape
+    centre = X - X.mean(axis=0)
+    S = centre.T @ centre / n
+    m = np.trace(S) / p
+    d2 = np.sum((S - m * np.eye(p)) ** 2) / p
+    b2 = sum(np.sum((np.outer(x, x) - S) ** 2) / p for x in centre) / n**2
+    b2 = min(b2, d2)
+    return b2 / d2 * m * np.eye(p) + (1 - b2 / d2) * S, b2 / d2
+
+
+def test_ledoit_wolf():
+    generateur = np.random.default_rng(0)
+    X = generateur.normal(0, 0.01, (60, 25)) + generateur.normal(0, 0.01, (60, 1))
+    quartique = (np.sum((X - X.mean(axis=0)) ** 2, axis=1) ** 2).sum()
+
+    covariance, intensite = covariance_ledoit_wolf(
+        X.T @ X, X.sum(axis=0), quartique, 60
+    )
+    attendue, intensite_attendue = ledoit_wolf_direct(X)
+
+    assert 0 < intensite < 1
+    np.testing.assert_allclose(intensite, intensite_attendue, rtol=1e-9)
+    np.testing.assert_allclose(covariance, attendue, rtol=1e-9, atol=1e-18)
+
+
+# =================================================================================
+#               Moindres carrés positifs (FISTA) : énumération des supports
+# =================================================================================
+
+
+def moindres_carres_positifs_enumeration(A, b):
+    # min 1/2 x'Ax - b'x sous x >= 0 : solution sans contrainte sur chaque
+    # support, meilleure solution admissible
+    p = len(b)
+    meilleur, valeur_min = np.zeros(p), 0.0
+    for taille in range(1, p + 1):
+        for support in itertools.combinations(range(p), taille):
+            support = list(support)
+            x = np.zeros(p)
+            x[support] = np.linalg.solve(A[np.ix_(support, support)], b[support])
+            if (x >= 0).all():
+                valeur = 0.5 * x @ A @ x - b @ x
+                if valeur < valeur_min:
+                    meilleur, valeur_min = x, valeur
+    return meilleur
+
+
+def test_moindres_carres_positifs():
+    generateur = np.random.default_rng(1)
+    for _ in range(5):
+        facteur = generateur.normal(size=(12, 7))
+        A = facteur.T @ facteur / 12 + 0.1 * np.eye(7)
+        b = generateur.normal(size=7)
+
+        x = moindres_carres_positifs(A, b, tol=1e-12, max_iter=100_000)
+        attendu = moindres_carres_positifs_enumeration(A, b)
+        assert (attendu == 0).any() and (attendu > 0).any()
+        np.testing.assert_allclose(x, attendu, atol=1e-8)
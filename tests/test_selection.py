@@ -0,0 +1,78 @@
+# Data manipulation
+import numpy as np
+import pandas as pd
+
+# Recouvrements des sélections (bitsets)
+from thesis_selection import bitsets_selection, intersections, popcount, recouvrements
+
+
+# =================================================================================
+#                                   Données
+# =================================================================================
+
+
+def coefficients(p=150, M=5, graine=0):
+    # Actions x modèles, supports de tailles variées (NaN = non retenue)
+    generateur = np.random.default_rng(graine)
+    valeurs = generateur.uniform(0, 1, (p, M))
+    valeurs[generateur.uniform(size=(p, M)) < np.linspace(0.2, 0.95, M)] = 0.0
+    valeurs[:, -1] = 0.0  # modèle sans action
+    valeurs[::7, 0] = np.nan
+    return pd.DataFrame(
+        valeurs, index=[f"a{i}" for i in range(p)], columns=[f"m{j}" for j in range(M)]
+    )
+
+
+def ensembles(coefficients):
+    return {
+        m: set(coefficients.index[coefficients[m].fillna(0) != 0])
+        for m in coefficients.columns
+    }
+
+
+# =================================================================================
+#                      Bitsets face aux ensembles Python
+# =================================================================================
+
+
+def test_popcount():
+    mots = np.random.default_rng(0).integers(0, 2**63, 200, dtype=np.uint64)
+    attendus = [bin(int(m)).count("1") for m in mots]
+    np.testing.assert_array_equal(popcount(mots), attendus)
+
+
+def test_intersections():
+    table = coefficients()
+    selections = ensembles(table)
+    communes = intersections(bitsets_selection(table.to_numpy().T))
+    for i, a in enumerate(table.columns):
+        for j, b in enumerate(table.columns):
+            assert communes[i, j] == len(selections[a] & selections[b])
+
+
+def test_recouvrements():
+    table = coefficients()
+    selections = ensembles(table)
+    poids = table.fillna(0) / table.fillna(0).sum().replace(0, np.nan)
+    matrices = recouvrements(table)
+
+    for a in table.columns:
+        for b in table.columns:
+            communes = selections[a] & selections[b]
+            unions = selections[a] | selections[b]
+            plus_petit = min(len(selections[a]), len(selections[b]))
+            jaccard = matrices["Jaccard"].loc[a, b]
+            chevauchement = matrices["Chevauchement"].loc[a, b]
+            if unions:
+                assert jaccard == len(communes) / len(unions)
+            else:
+                assert np.isnan(jaccard)
+            if plus_petit:
+                assert chevauchement == len(communes) / plus_petit
+            else:
+                assert np.isnan(chevauchement)
+            np.testing.assert_allclose(
+                matrices["Poids communs"].loc[a, b],
+                np.minimum(poids[a], poids[b]).fillna(0).sum(),
+                atol=1e-12,
+            )
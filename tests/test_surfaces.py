@@ -0,0 +1,52 @@
+# Data manipulation
+import numpy as np
+
+# Surfaces de validation croisée
+from thesis_surfaces import pyramide
+
+
+# =================================================================================
+#                Pyramide de zoom face aux moyennes par blocs directes
+# =================================================================================
+
+
+def moyennes_blocs_directes(cube, taille):
+    # Moyenne des cellules évaluées de chaque bloc taille x taille (plis, lambdas)
+    nb_plis = -(-cube.shape[0] // taille)
+    nb_lambdas = -(-cube.shape[2] // taille)
+    resultat = np.full((nb_plis, cube.shape[1], nb_lambdas), np.nan)
+    for i in range(nb_plis):
+        for k in range(nb_lambdas):
+            bloc = cube[i * taille : (i + 1) * taille, :, k * taille : (k + 1) * taille]
+            evaluees = ~np.isnan(bloc).all(axis=(0, 2))
+            resultat[i, evaluees, k] = np.nanmean(bloc[:, evaluees], axis=(0, 2))
+    return resultat
+
+
+def test_pyramide():
+    generateur = np.random.default_rng(0)
+    cube = generateur.uniform(size=(8, 3, 16))
+    plis = np.arange(8, dtype=np.float64)
+    log_lambdas = np.linspace(-5, -1, 16)
+
+    niveaux = pyramide(cube, plis, log_lambdas)
+
+    assert len(niveaux) == 5
+    for niveau, (c, p, l) in enumerate(niveaux):
+        taille = 2**niveau
+        np.testing.assert_allclose(c, moyennes_blocs_directes(cube, taille), rtol=1e-12)
+        np.testing.assert_allclose(p, plis.reshape(-1, min(taille, 8)).mean(axis=1))
+        np.testing.assert_allclose(l, log_lambdas.reshape(-1, taille).mean(axis=1))
+
+
+def test_pyramide_cellules_non_evaluees():
+    # Halving : les candidats éliminés n'ont que les premiers plis ; un bloc
+    # sans cellule évaluée reste NaN
+    generateur = np.random.default_rng(1)
+    cube = generateur.uniform(size=(4, 2, 8))
+    cube[2:, 1, :4] = np.nan
+
+    c, _, _ = pyramide(cube, np.arange(4.0), np.linspace(-4, -1, 8))[1]
+
+    np.testing.assert_allclose(c, moyennes_blocs_directes(cube, 2), rtol=1e-12)
+    assert np.isnan(c[1, 1, :2]).all()
@@ -0,0 +1,84 @@
+# Standard libraries
+import gc
+import importlib
+import threading
+
+# Dash core components
+from dash import Dash
+from flask import Flask
+
+# Dash Bootstrap Components
+import dash_bootstrap_components as dbc
+
+# Calculs longs exécutés hors des workers (voir thesis_taches.py)
+from thesis_taches import gestionnaire_taches
+
+
+# =================================================================================
+#                     Création de l'application (chargement différé)
+# =================================================================================
+
+# Importer thesis_data_visualization coûte cher : plotly.express, scipy,
+# moteurs de calcul, lecture de la base de résultats, matrices de recouvrement,
+# construction de tout l'arbre de composants. creer_app() ne crée que
+# l'application Dash ; le tableau de bord est importé au premier usage :
+#   - par défaut, à la première requête (démarrage d'un worker, rechargement,
+#     import de ce module : coût minimal) ;
+#   - avec precharger=True, immédiatement. Sous gunicorn --preload, le
+#     processus maître charge alors données et composants une seule fois avant
+#     de créer les workers, qui les partagent en copie sur écriture :
+#
+#       gunicorn --preload -w 4 "thesis_app:creer_serveur(precharger=True)"
+#
+# Les callbacks sont déclarés avec dash.callback (liste globale) : Dash les
+# rattache à l'application lors de la première requête, d'où le crochet
+# before_request enregistré avant ceux de Dash.
+
+MODULE_TABLEAU = "thesis_data_visualization"
+
+FEUILLES_STYLE = [
+    dbc.themes.BOOTSTRAP,
+    "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.5/font/bootstrap-icons.css",
+]
+
+
+def creer_app(precharger=False):
+    serveur = Flask(__name__)
+    verrou = threading.Lock()
+    app = None
+
+    def charger_tableau():
+        # Import unique (thread-safe), puis mise en page avant sa validation
+        # par Dash (_setup_server)
+        if app.layout is None:
+            with verrou:
+                if app.layout is None:
+                    app.layout = importlib.import_module(MODULE_TABLEAU).layout
+
+    serveur.before_request(charger_tableau)
+
+    app = Dash(
+        __name__,
+        server=serveur,
+        external_stylesheets=FEUILLES_STYLE,
+        background_callback_manager=gestionnaire_taches,
+        # Réponses compressées (gzip, brotli) selon Accept-Encoding du navigateur
+        compress=True,
+    )
+
+    if precharger:
+        charger_tableau()
+        # Objets chargés exclus du ramasse-miettes : les workers ne réécrivent
+        # pas leurs pages mémoire en les parcourant (copie sur écriture)
+        gc.freeze()
+
+    return app
+
+
+def creer_serveur(precharger=False):
+    # Point d'entrée WSGI (gunicorn "thesis_app:creer_serveur()")
+    return creer_app(precharger).server
+
+
+if __name__ == "__main__":
+    creer_app().run(debug=True, port=8888, jupyter_mode="external")
@@ -0,0 +1,469 @@
+# Standard libraries
+import time
+
+# Data manipulation
+import numpy as np
+import pandas as pd
+
+# Moteur d'estimation
+from thesis_estimation import (
+    CorrelationsDistanceGlissantes,
+    MomentsGlissants,
+    enet_positif,
+)
+from thesis_resultats import enregistrer_historique
+
+
+# =================================================================================
+#                 Simulation de rééquilibrage et de rotation des ETF
+# =================================================================================
+
+# Version vectorisée de la section 3.1.3 de thesis.qmd : au lieu d'un vecteur de
+# poids statique par modèle (pivot_longer -> jointure -> pivot_wider), on simule
+# la détention réelle des ETF :
+#   - entre deux rééquilibrages le nombre de parts est constant et les poids
+#     dérivent avec les prix ;
+#   - à chaque rééquilibrage les poids reviennent à la cible, ce qui génère une
+#     rotation (1/2 somme |poids cible - poids dérivés|) et un coût de
+#     transaction proportionnel au montant échangé.
+#
+# Dimensions : dates (T) x actions (N) x modèles (M).
+# Calendrier mensuel / trimestriel : chaque segment entre deux rééquilibrages
+# se réduit à un produit matriciel (T_segment x N) @ (N x M).
+# Seuil de dérive : dépendant de la trajectoire, simulé date par date mais
+# vectorisé sur actions x modèles.
+
+FREQUENCES = {"mensuel": "M", "trimestriel": "Q"}
+
+TAILLE_BLOC_MODELES = 64  # modèles traités ensemble pour le calcul de dérive
+
+
+# -----------------------------------------
+# Préparation des données
+# -----------------------------------------
+
+
+def prix_depuis_rendements(rendements_log, prix_initial=100.0):
+    # Prix reconstitués à partir de rendements logarithmiques (thesis.qmd, 1.3)
+    return prix_initial * np.exp(rendements_log.fillna(0).cumsum())
+
+
+def normaliser_poids(poids):
+    # poids : DataFrame actions x modèles (colonnes de coefficients.csv)
+    poids = poids.fillna(0).clip(lower=0)
+    totaux = poids.sum(axis=0).replace(0, np.nan)
+    return (poids / totaux).fillna(0)
+
+
+def dates_reequilibrage(dates, frequence):
+    # Première séance de chaque mois / trimestre ; la première date est toujours
+    # une date de construction du portefeuille
+    dates = pd.DatetimeIndex(dates)
+    if frequence == "aucun":
+        indices = np.array([0])
+    else:
+        periodes = dates.to_period(FREQUENCES[frequence])
+        indices = np.flatnonzero(np.r_[True, periodes[1:] != periodes[:-1]])
+    return indices
+
+
+def cibles_par_date(indices, indices_cibles, nb_cibles):
+    # Cible en vigueur à chaque indice de date (dernière cible publiée)
+    if indices_cibles is None:
+        return np.zeros(len(indices), dtype=int)
+    position = np.searchsorted(indices_cibles, indices, side="right") - 1
+    return np.clip(position, 0, nb_cibles - 1)
+
+
+# -----------------------------------------
+# Rééquilibrage calendaire (segments vectorisés)
+# -----------------------------------------
+
+
+def _simuler_calendrier(
+    P,
+    W,
+    indices_cibles,
+    reequilibrages,
+    cout,
+    valeur_initiale,
+    conserver_parts,
+    derive_quotidienne,
+):
+    T, N = P.shape
+    M = W.shape[2]  # W : cibles x actions x modèles
+
+    valeur = np.empty((T, M))
+    derive = np.zeros((T, M))
+    rotation = np.zeros((T, M))
+    couts = np.zeros((T, M))
+    parts = {} if conserver_parts else None
+
+    cibles = cibles_par_date(reequilibrages, indices_cibles, W.shape[0])
+    bornes = np.r_[reequilibrages[1:], T - 1]
+
+    valeur_apres = np.full(M, float(valeur_initiale))
+    for k, (debut, fin) in enumerate(zip(reequilibrages, bornes)):
+        cible = W[cibles[k]]  # N x M
+        if parts is not None:
+            parts[debut] = cible * valeur_apres[None, :] / P[debut][:, None]
+
+        # Croissance relative des actions depuis le rééquilibrage
+        G = P[debut : fin + 1] / P[debut]  # L x N
+        croissance = G @ cible  # L x M
+        valeur[debut : fin + 1] = valeur_apres * croissance
+
+        # Dérive des poids : 1/2 somme_i w_i |G_i - g| / g, par blocs de modèles
+        # (sinon seulement à la veille du rééquilibrage, voir plus bas)
+        if derive_quotidienne:
+            for m0 in range(0, M, TAILLE_BLOC_MODELES):
+                m1 = min(m0 + TAILLE_BLOC_MODELES, M)
+                ecarts = np.abs(G[:, :, None] - croissance[:, None, m0:m1])  # L x N x m
+                derive[debut : fin + 1, m0:m1] = (
+                    0.5
+                    * np.einsum("lnm,nm->lm", ecarts, cible[:, m0:m1])
+                    / croissance[:, m0:m1]
+                )
+
+        # Rééquilibrage en fin de segment
+        if k + 1 < len(reequilibrages):
+            nouvelle_cible = W[cibles[k + 1]]
+            poids_derives = cible * G[-1][:, None] / croissance[-1]
+            echange = np.abs(nouvelle_cible - poids_derives).sum(axis=0)
+            if not derive_quotidienne:
+                derive[fin] = 0.5 * np.abs(cible - poids_derives).sum(axis=0)
+            rotation[fin] = 0.5 * echange
+            couts[fin] = cout * echange * valeur[fin]
+            valeur[fin] -= couts[fin]
+            valeur_apres = valeur[fin]
+
+    return valeur, derive, rotation, couts, parts
+
+
+# -----------------------------------------
+# Rééquilibrage sur seuil de dérive (date par date)
+# -----------------------------------------
+
+
+def _simuler_seuil(P, W, indices_cibles, seuil, cout, valeur_initiale, conserver_parts):
+    T, N = P.shape
+    M = W.shape[2]  # W : cibles x actions x modèles
+
+    valeur = np.empty((T, M))
+    derive = np.zeros((T, M))
+    rotation = np.zeros((T, M))
+    couts = np.zeros((T, M))
+    parts = {} if conserver_parts else None
+
+    cibles = cibles_par_date(np.arange(T), indices_cibles, W.shape[0])
+
+    # Parts détenues : modèles x actions
+    cible = W[cibles[0]].T
+    H = cible * valeur_initiale / P[0]
+    valeur[0] = valeur_initiale
+    if parts is not None:
+        parts[0] = H.T.copy()
+
+    for t in range(1, T):
+        montants = H * P[t]
+        valeur[t] = montants.sum(axis=1)
+        cible = W[cibles[t]].T
+        poids_derives = montants / valeur[t][:, None]
+        echange = np.abs(cible - poids_derives).sum(axis=1)
+        derive[t] = 0.5 * echange
+
+        declenche = derive[t] > seuil
+        if declenche.any():
+            rotation[t, declenche] = derive[t, declenche]
+            couts[t, declenche] = cout * echange[declenche] * valeur[t, declenche]
+            valeur[t, declenche] -= couts[t, declenche]
+            H[declenche] = (
+                cible[declenche] * valeur[t, declenche][:, None] / P[t][None, :]
+            )
+            derive[t, declenche] = 0.0
+            if parts is not None:
+                parts[t] = H.T.copy()
+
+    return valeur, derive, rotation, couts, parts
+
+
+# -----------------------------------------
+# Point d'entrée
+# -----------------------------------------
+
+
+def simuler_reequilibrage(
+    prix,
+    poids,
+    reequilibrage="mensuel",
+    seuil=0.05,
+    cout=0.0,
+    valeur_initiale=100.0,
+    dates_cibles=None,
+    conserver_parts=False,
+    derive_quotidienne=True,
+):
+    # prix : DataFrame dates x actions
+    # poids : DataFrame actions x modèles (cible statique) ou dictionnaire
+    #         {date d'effet: DataFrame actions x modèles} (cibles successives)
+    # reequilibrage : "mensuel", "trimestriel", "seuil" ou "aucun"
+    # cout : coût de transaction par unité échangée (0.001 = 10 points de base)
+    # conserver_parts : renvoie les parts détenues après chaque rééquilibrage
+    #                   (tableau actions x modèles par date, volumineux)
+    # derive_quotidienne : dérive des poids à chaque date (coût O(T·N·M)) ou
+    #                      seulement à la veille des rééquilibrages calendaires
+    if isinstance(poids, dict):
+        dates_cibles = sorted(poids)
+        tableaux = [normaliser_poids(poids[d]) for d in dates_cibles]
+    else:
+        tableaux = [normaliser_poids(poids)]
+
+    actions = tableaux[0].index
+    modeles = tableaux[0].columns
+    prix = prix.reindex(columns=actions).ffill().bfill()
+    P = prix.to_numpy(dtype=np.float64)
+    W = np.stack(
+        [t.reindex(index=actions, columns=modeles).fillna(0).to_numpy() for t in tableaux]
+    )
+
+    indices_cibles = None
+    if dates_cibles is not None:
+        indices_cibles = prix.index.searchsorted(pd.DatetimeIndex(dates_cibles))
+
+    if reequilibrage == "seuil":
+        valeur, derive, rotation, couts, parts = _simuler_seuil(
+            P, W, indices_cibles, seuil, cout, valeur_initiale, conserver_parts
+        )
+    else:
+        reequilibrages = dates_reequilibrage(prix.index, reequilibrage)
+        if indices_cibles is not None:
+            # Une nouvelle cible déclenche aussi un rééquilibrage
+            reequilibrages = np.union1d(
+                reequilibrages, indices_cibles[indices_cibles < len(P)]
+            )
+        valeur, derive, rotation, couts, parts = _simuler_calendrier(
+            P,
+            W,
+            indices_cibles,
+            reequilibrages,
+            cout,
+            valeur_initiale,
+            conserver_parts,
+            derive_quotidienne,
+        )
+
+    en_tableau = lambda x: pd.DataFrame(x, index=prix.index, columns=modeles)
+    valeur = en_tableau(valeur)
+
+    return {
+        "valeur": valeur,
+        "rendements": valeur.pct_change().iloc[1:],
+        "derive": en_tableau(derive),
+        "rotation": en_tableau(rotation),
+        "couts": en_tableau(couts),
+        "parts": {
+            prix.index[t]: pd.DataFrame(H, index=actions, columns=modeles)
+            for t, H in (parts or {}).items()
+        },
+    }
+
+
+# =================================================================================
+#                 Ré-estimation glissante (walk-forward) des modèles
+# =================================================================================
+
+# À chaque date de rééquilibrage t, chaque modèle est ré-estimé sur la fenêtre
+# des `fenetre` séances précédentes, avec ses hyperparamètres retenus :
+#   - les moments (X'X, X'y) glissent d'une date à l'autre par mises à jour de
+#     rang k (MomentsGlissants) ;
+#   - la descente par coordonnées démarre de la solution de la date précédente,
+#     son ensemble actif compris : le coût dépend des actions qui entrent ou
+#     sortent, pas d'un ajustement complet.
+# Les poids estimés avec les rendements jusqu'à t - 1 sont appliqués à la clôture
+# de t - 1 : les rendements de l'ETF à partir de t sont hors échantillon.
+# Pour qu'ils le soient vraiment, tout ce qui dépend des données est refait sur
+# la fenêtre : filtrage DC-SIS (même nombre d'actions que l'univers publié,
+# classement commun aux modèles DC-SIS, corrélations de distance glissantes) et
+# Ridge pilote des poids de l'Adaptive Lasso. Seuls les hyperparamètres restent
+# ceux de thesis.qmd, y compris ceux du pilote (voir
+# ReestimationInteractive.specification).
+
+CHEMIN_RENDEMENTS_ETF = "data/walk_forward_returns.csv"
+
+
+def reestimation_glissante(
+    rendements_actions,
+    rendements_indice,
+    specifications,
+    fenetre=504,
+    frequence="mensuel",
+    cout=0.0,
+):
+    # rendements_actions : DataFrame dates x actions (log), rendements_indice : Series
+    # specifications : {modèle: {"alpha", "lambda", "indices", "facteurs",
+    # "taille_ecran", "pilote"}} (ReestimationInteractive.specification) ;
+    # indices et facteurs publiés ne servent que sans taille_ecran / pilote
+    actions = np.asarray(rendements_actions.columns)
+    dates = rendements_actions.index
+    moments = MomentsGlissants(rendements_actions.to_numpy(), rendements_indice)
+    p = len(actions)
+
+    reequilibrages = dates_reequilibrage(dates, frequence)
+    reequilibrages = reequilibrages[reequilibrages >= fenetre]
+    if len(reequilibrages) == 0:
+        raise ValueError(
+            f"Aucune date de rééquilibrage après les {fenetre} premières séances "
+            f"({len(dates)} dates) : réduire la fenêtre ou allonger l'échantillon"
+        )
+
+    # Corrélations de distance glissantes, seulement si un modèle est filtré
+    if any(spec.get("taille_ecran") is not None for spec in specifications.values()):
+        correlations = CorrelationsDistanceGlissantes(moments.X, moments.y)
+
+    # Solutions précédentes sur toutes les actions (démarrages à chaud même
+    # lorsque l'univers filtré change d'une fenêtre à l'autre)
+    betas = {modele: np.zeros(p) for modele in specifications}
+    betas_pilotes = {modele: np.zeros(p) for modele in specifications}
+    historique = []
+    poids = {}
+    journal = []
+
+    for t in reequilibrages:
+        s = moments.positionner(t - fenetre, t).standardise()
+        date_effet = dates[t - 1]
+        cibles = pd.DataFrame(0.0, index=actions, columns=list(specifications))
+        ecrans = {}
+
+        for modele, spec in specifications.items():
+            precedent = betas[modele]
+            debut_calcul = time.perf_counter()
+
+            # Univers : filtrage DC-SIS sur la fenêtre (partagé par taille)
+            indices = spec["indices"]
+            taille = spec.get("taille_ecran")
+            if taille is not None:
+                if taille not in ecrans:
+                    ecrans[taille] = correlations.positionner(t - fenetre, t).ecran(
+                        taille
+                    )
+                indices = ecrans[taille]
+            C = s["C"][np.ix_(indices, indices)]
+            c = s["c"][indices]
+            ecarts = s["ecarts"][indices]
+
+            # Pénalités adaptatives : Ridge pilote ajusté sur la même fenêtre
+            facteurs = spec["facteurs"]
+            if spec.get("pilote") is not None:
+                pilote = enet_positif(
+                    C,
+                    c,
+                    spec["pilote"]["lambda"],
+                    spec["pilote"]["alpha"],
+                    spec["pilote"]["facteurs"],
+                    betas_pilotes[modele][indices],
+                    s["ecart_y"],
+                )
+                betas_pilotes[modele] = np.zeros(p)
+                betas_pilotes[modele][indices] = pilote
+                facteurs = 1 / (np.abs(pilote / ecarts) + 1e-5)
+
+            beta = enet_positif(
+                C,
+                c,
+                spec["lambda"],
+                spec["alpha"],
+                facteurs,
+                precedent[indices],
+                s["ecart_y"],
+            )
+            betas[modele] = np.zeros(p)
+            betas[modele][indices] = beta
+            coefficients = beta / ecarts
+            cibles.iloc[indices, cibles.columns.get_loc(modele)] = coefficients
+
+            # Historique (coefficients non nuls uniquement)
+            actives = np.flatnonzero(coefficients)
+            historique.append(
+                pd.DataFrame(
+                    {
+                        "date": date_effet,
+                        "Modele": modele,
+                        "Action": actions[indices[actives]],
+                        "coefficient": coefficients[actives],
+                    }
+                )
+            )
+
+            # Nombre de changements de composition depuis la date précédente
+            changements = int(((precedent > 0) != (betas[modele] > 0)).sum())
+            journal.append(
+                {
+                    "date": date_effet,
+                    "Modele": modele,
+                    "nb_variables": len(actives),
+                    "changements": changements,
+                    "duree": time.perf_counter() - debut_calcul,
+                }
+            )
+
+        poids[date_effet] = cibles
+
+    # Rendements hors échantillon des ETF ré-estimés
+    prix = prix_depuis_rendements(rendements_actions).loc[min(poids) :]
+    simulation = simuler_reequilibrage(
+        prix, poids, reequilibrage="aucun", cout=cout, derive_quotidienne=False
+    )
+
+    return {
+        "historique": pd.concat(historique, ignore_index=True),
+        "rendements": simulation["rendements"],
+        "rotation": simulation["rotation"].loc[list(poids)],
+        "journal": pd.DataFrame(journal),
+    }
+
+
+# -----------------------------------------
+# Export pour le tableau de bord
+# -----------------------------------------
+
+
+def exporter_reestimation_glissante(resultat, run):
+    # Historique des coefficients dans la base de résultats (lu date par date
+    # par le tableau de bord), rendements des ETF en CSV
+    enregistrer_historique(run, resultat["historique"])
+    resultat["rendements"].rename_axis("date").to_csv(CHEMIN_RENDEMENTS_ETF)
+
+
+if __name__ == "__main__":
+    from thesis_estimation import ReestimationInteractive, charger_rendements
+    from thesis_registre import RegistreModeles
+    from thesis_resultats import (
+        lire_coefficients,
+        lire_hyperparametres,
+        lire_modeles,
+        ouvrir_resultats,
+        run_recente,
+    )
+
+    ouvrir_resultats()
+    run = run_recente()
+    hyperparametres = lire_hyperparametres(run)
+    registre = RegistreModeles.depuis_tables(lire_modeles(run), hyperparametres)
+
+    rendements_actions, rendements_indice = charger_rendements()
+    reestimation = ReestimationInteractive(
+        rendements_actions,
+        rendements_indice,
+        lire_coefficients(run),
+        hyperparametres,
+        pilotes=registre.pilotes(),
+    )
+    specifications = {
+        modele: reestimation.specification(modele) for modele in registre.libelles()
+    }
+
+    resultat = reestimation_glissante(
+        rendements_actions, rendements_indice, specifications
+    )
+    exporter_reestimation_glissante(resultat, run)
+    print(resultat["journal"].groupby("Modele")[["changements", "duree"]].sum())
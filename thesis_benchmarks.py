@@ -0,0 +1,282 @@
+# Standard libraries
+import json
+import subprocess
+import sys
+
+# Data manipulation
+import pandas as pd
+
+# Encodage des tables
+from thesis_encodage import colonnes_compactes
+
+
+# =================================================================================
+#                  Mesures de performance du tableau de bord
+# =================================================================================
+
+# python thesis_benchmarks.py [nombre de répétitions]
+# Chaque mesure de démarrage est faite dans un processus neuf (import à froid
+# des modules, caches disque conservés) ; on retient la médiane des répétitions.
+
+NB_REPETITIONS = 5
+
+
+# -----------------------------------------
+# Démarrage : création de l'application et première réponse
+# -----------------------------------------
+
+# Trois modes :
+#   - "différé"   : creer_app() puis premières requêtes (le tableau de bord est
+#                   importé à la première requête) ;
+#   - "préchargé" : creer_app(precharger=True), coût payé par le maître gunicorn ;
+#   - "worker"    : première réponse d'un processus créé par fork après le
+#                   préchargement (gunicorn --preload).
+# Temps relevés depuis le lancement de l'interpréteur : "application" quand
+# creer_app() rend la main, "première réponse" après GET / et /_dash-layout.
+
+SCRIPT_DEMARRAGE = """
+import json, os, sys, time
+debut = time.perf_counter()
+from thesis_app import creer_app
+mode = sys.argv[1]
+app = creer_app(precharger=mode != "différé")
+application = time.perf_counter() - debut
+
+def premiere_reponse():
+    client = app.server.test_client()
+    for url in ["/", "/_dash-layout"]:
+        assert client.get(url).status_code == 200
+    return time.perf_counter() - debut
+
+if mode == "worker":
+    lecture, ecriture = os.pipe()
+    if os.fork() == 0:
+        debut = time.perf_counter()
+        os.write(ecriture, str(premiere_reponse()).encode())
+        os._exit(0)
+    os.wait()
+    reponse = float(os.read(lecture, 64))
+    application = None
+else:
+    reponse = premiere_reponse()
+
+print(json.dumps({"application": application, "premiere_reponse": reponse}))
+"""
+
+
+def mesurer_demarrage(mode):
+    sortie = subprocess.run(
+        [sys.executable, "-c", SCRIPT_DEMARRAGE, mode],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(sortie.stdout.strip().splitlines()[-1])
+
+
+def benchmark_demarrage(nb_repetitions=NB_REPETITIONS):
+    mesures = pd.DataFrame(
+        [
+            {"mode": mode, **mesurer_demarrage(mode)}
+            for mode in ["différé", "préchargé", "worker"]
+            for _ in range(nb_repetitions)
+        ]
+    )
+    return mesures.groupby("mode", sort=False).median().rename(
+        columns={
+            "application": "Application (s)",
+            "premiere_reponse": "Première réponse (s)",
+        }
+    )
+
+
+# -----------------------------------------
+# Volume des réponses des callbacks
+# -----------------------------------------
+
+# Les requêtes /_dash-update-component sont reconstituées à partir de
+# /_dash-dependencies et des valeurs initiales de la mise en page ; chaque
+# interaction ne modifie que quelques entrées et déclenche tous les callbacks
+# qui en dépendent (callbacks en arrière-plan exclus). Le chargement de la page
+# déclenche tous les callbacks sans prevent_initial_call. Octets mesurés sur le
+# corps des réponses, sans compression puis en gzip et brotli lorsque
+# l'application compresse ses réponses.
+# Deux formats de table sont comparés sur les mêmes requêtes :
+#   - "lignes"   : ancien format, data.to_dict("records") à pleine précision
+#                  (noms de colonnes répétés à chaque ligne) ;
+#   - "colonnes" : format actuel, colonnes_compactes (colonnes + arrondi).
+# Le format est choisi en remplaçant colonnes_compactes dans le module du
+# tableau de bord, lu par les callbacks à chaque appel.
+# Toute réponse autre que 200 interrompt la mesure : un callback en erreur
+# renverrait quelques octets et fausserait la comparaison.
+
+ENCODAGES = {"aucun": "identity", "gzip": "gzip", "brotli": "br"}
+
+
+def lignes_completes(data, columns):
+    # Ancien format des tables : une entrée {colonne: valeur} par ligne
+    return data.to_dict("records")
+
+
+FORMATS_TABLES = {"lignes": lignes_completes, "colonnes": colonnes_compactes}
+
+
+def valeurs_initiales(composant, valeurs=None):
+    # Propriétés de chaque composant identifié de la mise en page : "id.prop"
+    valeurs = {} if valeurs is None else valeurs
+    if isinstance(composant, list):
+        for enfant in composant:
+            valeurs_initiales(enfant, valeurs)
+    elif isinstance(composant, dict) and "props" in composant:
+        props = composant["props"]
+        if isinstance(props.get("id"), str):
+            for prop, valeur in props.items():
+                valeurs[f"{props['id']}.{prop}"] = valeur
+        valeurs_initiales(props.get("children"), valeurs)
+    return valeurs
+
+
+def sorties_dependance(dependance):
+    return [
+        {"id": o.split(".")[0], "property": o.split(".")[1].split("@")[0]}
+        for o in dependance["output"].strip(".").split("...")
+    ]
+
+
+def cles(proprietes):
+    return {f"{e['id']}.{e['property']}" for e in proprietes}
+
+
+def corps_requete(dependance, valeurs, declencheurs):
+    def entree(e):
+        cle = f"{e['id']}.{e['property']}"
+        return {"id": e["id"], "property": e["property"], "value": valeurs.get(cle)}
+
+    sorties = sorties_dependance(dependance)
+    return {
+        "output": dependance["output"],
+        "outputs": sorties if dependance["output"].startswith("..") else sorties[0],
+        "inputs": [entree(e) for e in dependance["inputs"]],
+        "state": [entree(e) for e in dependance["state"]],
+        "changedPropIds": declencheurs,
+    }
+
+
+def poster(client, corps, entete):
+    reponse = client.post(
+        "/_dash-update-component", json=corps, headers={"Accept-Encoding": entete}
+    )
+    if reponse.status_code != 200:
+        raise RuntimeError(
+            f"Callback {corps['output']} : réponse {reponse.status_code} "
+            f"({reponse.get_data(as_text=True)[:200]!r})"
+        )
+    return reponse
+
+
+def rejouer(client, dependances, valeurs, modifiees):
+    # Requêtes envoyées par le navigateur pour une interaction, dans son ordre :
+    # un callback attend ceux qui produisent l'une de ses entrées, reçoit leurs
+    # valeurs et déclenche à son tour les callbacks qui dépendent de ses sorties.
+    # Chaque callback est appelé au plus une fois.
+    valeurs = {**valeurs, **modifiees}
+    if modifiees:
+        a_lancer = [d for d in dependances if cles(d["inputs"]) & set(modifiees)]
+    else:
+        a_lancer = [d for d in dependances if not d.get("prevent_initial_call")]
+    lances = {d["output"] for d in a_lancer}
+    declencheurs = {d["output"]: list(modifiees) for d in a_lancer}
+
+    requetes = []
+    while a_lancer:
+        attendues = {d["output"]: cles(sorties_dependance(d)) for d in a_lancer}
+        produites = set().union(*attendues.values())
+        prets = [
+            d
+            for d in a_lancer
+            if not cles(d["inputs"]) & (produites - attendues[d["output"]])
+        ] or a_lancer[:1]
+
+        for d in prets:
+            a_lancer.remove(d)
+            corps = corps_requete(d, valeurs, declencheurs[d["output"]])
+            requetes.append(corps)
+            reponse = poster(client, corps, "identity").get_json()
+            modifiees_callback = [
+                f"{composant}.{prop}"
+                for composant, props in reponse.get("response", {}).items()
+                for prop in props
+            ]
+            valeurs.update(
+                {
+                    f"{composant}.{prop}": valeur
+                    for composant, props in reponse.get("response", {}).items()
+                    for prop, valeur in props.items()
+                }
+            )
+            for suivant in dependances:
+                declenchantes = cles(suivant["inputs"]) & set(modifiees_callback)
+                if declenchantes and suivant["output"] not in lances:
+                    lances.add(suivant["output"])
+                    declencheurs[suivant["output"]] = sorted(declenchantes)
+                    a_lancer.append(suivant)
+    return requetes
+
+
+def interactions_tableau(modeles):
+    # Nom -> valeurs modifiées ("id.prop" -> valeur), {} pour le chargement
+    return {
+        "Chargement (tous les modèles)": {},
+        "Sélection de trois modèles": {"filtre-modeles.value": modeles[:3]},
+        "Normalisation des coefficients": {"etat-normalisation.data": True},
+        "Diagnostics (retard 20)": {"diagnostic-retard.value": 20},
+    }
+
+
+def octets_interaction(client, requetes, entete):
+    return sum(len(poster(client, corps, entete).data) for corps in requetes)
+
+
+def benchmark_volume():
+    import thesis_data_visualization
+    from thesis_app import creer_app
+
+    app = creer_app(precharger=True)
+    client = app.server.test_client()
+    dependances = [
+        d
+        for d in client.get("/_dash-dependencies").get_json()
+        if not d.get("long") and not d.get("clientside_function")
+    ]
+    initiales = valeurs_initiales(client.get("/_dash-layout").get_json())
+    modeles = [o["value"] for o in initiales["filtre-modeles.options"][1:]]
+    modeles = [m for m in modeles if not m.startswith("groupe:")]
+
+    lignes = []
+    for nom, modifiees in interactions_tableau(modeles).items():
+        requetes = rejouer(client, dependances, initiales, modifiees)
+        ligne = {"interaction": nom, "callbacks": len(requetes)}
+        for format_table, encodeur in FORMATS_TABLES.items():
+            thesis_data_visualization.colonnes_compactes = encodeur
+            try:
+                for encodage, entete in ENCODAGES.items():
+                    ligne[(format_table, encodage)] = octets_interaction(
+                        client, requetes, entete
+                    )
+            finally:
+                thesis_data_visualization.colonnes_compactes = colonnes_compactes
+        lignes.append(ligne)
+
+    mesures = pd.DataFrame(lignes).set_index(["interaction", "callbacks"])
+    mesures.columns = pd.MultiIndex.from_tuples(mesures.columns)
+    return mesures
+
+
+if __name__ == "__main__":
+    nb_repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else NB_REPETITIONS
+
+    print("Démarrage (médiane sur", nb_repetitions, "répétitions)")
+    print(benchmark_demarrage(nb_repetitions).round(3).to_string())
+
+    print("\nOctets par interaction")
+    print(benchmark_volume().to_string())
@@ -0,0 +1,168 @@
+# Data manipulation
+import numpy as np
+import pandas as pd
+
+# Moteurs de calcul
+from thesis_estimation import GRILLE_LAMBDA, enet_positif, facteurs_penalite
+from thesis_performance import mesures_performance
+
+
+# =================================================================================
+#              Chemin de régularisation indexé par le nombre d'actions
+# =================================================================================
+
+# Pour chaque modèle (univers, pénalités et alpha retenus), le chemin complet
+# de lambda est parcouru une fois, du plus petit lambda qui annule tous les
+# poids jusqu'au bas de la grille de thesis.qmd, chaque point démarrant à chaud
+# du précédent. En chaque point : poids, nombre d'actions retenues et mesures
+# de performance de l'ETF (toutes les colonnes en un seul produit matriciel).
+# L'index « au plus K actions » associe à chaque K le point du chemin de plus
+# faible erreur de suivi parmi ceux qui retiennent au plus K actions : le
+# tableau de bord lit ce point dans la base de résultats, sans ré-estimation.
+
+NB_POINTS_CHEMIN = 200
+
+
+def lambdas_chemin(c, alpha, facteurs=None, nb_points=NB_POINTS_CHEMIN):
+    # Conditions KKT en beta = 0 : c_j <= lambda * alpha * pf_j pour tout j
+    pf = facteurs_penalite(facteurs, len(c))
+    if alpha > 0 and np.any(c > 0):
+        lambda_max = float(np.max(c / (alpha * pf)))
+    else:
+        lambda_max = float(GRILLE_LAMBDA.max())  # Ridge : pas de sélection
+    lambda_min = min(float(GRILLE_LAMBDA.min()), lambda_max)
+    return np.geomspace(lambda_max, lambda_min, nb_points)
+
+
+def index_cardinalites(nb_variables, erreurs):
+    # K -> point de plus faible erreur parmi les points à au plus K actions
+    # (portefeuilles vides exclus)
+    candidats = np.flatnonzero(nb_variables > 0)
+    candidats = candidats[np.argsort(nb_variables[candidats], kind="stable")]
+
+    meilleurs = []
+    for i in candidats:
+        if not meilleurs or erreurs[i] < erreurs[meilleurs[-1]]:
+            meilleurs.append(i)
+        else:
+            meilleurs.append(meilleurs[-1])
+
+    k = np.arange(1, nb_variables.max() + 1)
+    positions = np.searchsorted(nb_variables[candidats], k, side="right") - 1
+    valides = positions >= 0
+    return pd.DataFrame(
+        {"k": k[valides], "point": np.asarray(meilleurs)[positions[valides]]}
+    )
+
+
+def chemin_cardinalites(reestimation, modele, Rb, Rf, lignes, nb_points=NB_POINTS_CHEMIN):
+    # reestimation : ReestimationInteractive ; Rb, Rf : rendements arithmétiques
+    # de l'indice et du taux sans risque aux dates lignes (positions dans X)
+    u = reestimation.univers(modele)
+    alpha = reestimation.specification(modele)["alpha"]
+    lambdas = lambdas_chemin(u["c"], alpha, u["facteurs"], nb_points)
+
+    coefficients = np.empty((len(lambdas), len(u["indices"])))
+    beta = None
+    for point, lambda_ in enumerate(lambdas):
+        beta = enet_positif(
+            u["C"], u["c"], lambda_, alpha, u["facteurs"], beta, u["ecart_y"]
+        )
+        coefficients[point] = beta / u["ecarts"]
+
+    # Rendements des ETF du chemin (poids normalisés à 1), comme rendements_etf
+    totaux = coefficients.sum(axis=1, keepdims=True)
+    poids = np.divide(
+        coefficients, totaux, out=np.zeros_like(coefficients), where=totaux != 0
+    )
+    Ra = np.expm1(reestimation.X[np.ix_(lignes, u["indices"])] @ poids.T)
+    with np.errstate(divide="ignore", invalid="ignore"):  # portefeuilles vides
+        mesures = mesures_performance(Ra, Rb, Rf)
+
+    nb_variables = (coefficients != 0).sum(axis=1)
+    chemin = pd.DataFrame(
+        {
+            "point": np.arange(len(lambdas)),
+            "alpha": alpha,
+            "lambda": lambdas,
+            "nb_variables": nb_variables,
+            **mesures,
+        }
+    )
+
+    point, colonne = np.nonzero(coefficients)
+    actions = np.asarray(reestimation.actions)[u["indices"]]
+    poids_longs = pd.DataFrame(
+        {
+            "point": point,
+            "stock": actions[colonne],
+            "coefficient": coefficients[point, colonne],
+        }
+    )
+
+    return chemin, poids_longs, index_cardinalites(
+        nb_variables, chemin["Tracking_Error"].to_numpy()
+    )
+
+
+if __name__ == "__main__":
+    import time
+
+    from thesis_estimation import ReestimationInteractive, charger_rendements
+    from thesis_registre import RegistreModeles
+    from thesis_resultats import (
+        empreinte_chemins,
+        enregistrer_chemin,
+        lire_coefficients,
+        lire_hyperparametres,
+        lire_indices,
+        lire_modeles,
+        lire_rendements,
+        ouvrir_resultats,
+        run_recente,
+    )
+
+    ouvrir_resultats()
+    run = run_recente()
+    empreinte = empreinte_chemins()
+    hyperparametres = lire_hyperparametres(run)
+    registre = RegistreModeles.depuis_tables(lire_modeles(run), hyperparametres)
+
+    rendements_actions, rendements_indice = charger_rendements()
+    reestimation = ReestimationInteractive(
+        rendements_actions,
+        rendements_indice,
+        lire_coefficients(run),
+        hyperparametres,
+        pilotes=registre.pilotes(),
+    )
+
+    # Dates de data_performance.csv, comme la simulation du tableau de bord ;
+    # erreur de suivi face à l'indice répliqué
+    indice = lire_indices(run)[0]
+    reference = lire_rendements(run, [indice, "Rf"]).set_index("date")
+    lignes = rendements_actions.index.get_indexer(reference.index)
+    reference = reference[lignes >= 0]
+    lignes = lignes[lignes >= 0]
+
+    for modele in registre.libelles():
+        debut = time.perf_counter()
+        chemin, poids, cardinalites = chemin_cardinalites(
+            reestimation,
+            modele,
+            reference[indice].to_numpy(),
+            reference["Rf"].to_numpy(),
+            lignes,
+        )
+        enregistrer_chemin(
+            run,
+            registre.entree(modele)["identifiant"],
+            chemin,
+            poids,
+            cardinalites,
+            empreinte,
+        )
+        print(
+            f"{modele} : {len(chemin)} points, K <= {cardinalites['k'].max()}, "
+            f"{time.perf_counter() - debut:.1f} s"
+        )
@@ -1,11 +1,15 @@
 # Standard libraries
 import math
+import time
 
 # Data manipulation
+import numpy as np
 import pandas as pd
 
 # Dash core components
-from dash import Dash, dcc, html, dash_table, Input, Output, State, callback
+from dash import dcc, html, dash_table, Input, Output, State, callback
+from dash import ClientsideFunction, clientside_callback
+from dash.exceptions import PreventUpdate
 from dash.dash_table.Format import Format, Scheme, Sign
 
 # Dash Bootstrap Components
@@ -15,19 +19,62 @@ import dash_bootstrap_components as dbc
 import plotly.express as px
 import plotly.graph_objects as go
 
+# Moteurs de calcul du mémoire
+from thesis_diagnostics import (
+    diagnostics,
+    empreinte_rendements,
+    nb_retards_defaut,
+    tableau_ljung_box,
+)
+from thesis_encodage import colonnes_compactes
+from thesis_estimation import (
+    ReestimationInteractive,
+    charger_rendements,
+    grille,
+)
+from thesis_performance import (
+    bootstrap_mesures,
+    intervalles_confiance,
+    mesures_performance,
+)
+from thesis_registre import RegistreModeles
+from thesis_resultats import (
+    empreinte_chemins,
+    lire_actions,
+    lire_chemin,
+    lire_coefficients,
+    lire_dates_historique,
+    lire_historique,
+    lire_hyperparametres,
+    lire_indices,
+    lire_modeles,
+    lire_modeles_chemins,
+    lire_nb_variables,
+    lire_nb_variables_historique,
+    lire_performance,
+    lire_portefeuille,
+    lire_rendements,
+    ouvrir_resultats,
+    run_recente,
+)
+from thesis_risque import RisqueActif
+from thesis_selection import CHEMIN_STABILITE, StabiliteSelection, recouvrements
+from thesis_surfaces import CHEMIN_SURFACES, SurfacesValidation
+from thesis_taches import tache_partagee
+
 
 # =================================================================================
 #                        Initialisation de l'application
 # =================================================================================
 
-app = Dash(
-    __name__,
-    external_stylesheets=[
-        dbc.themes.BOOTSTRAP,
-        "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.5/font/bootstrap-icons.css",
-    ],
-)
-server = app.server
+# L'application Dash est créée par thesis_app.py (creer_app), qui n'importe ce
+# module, ses dépendances et les données qu'au premier usage. Les callbacks
+# (dash.callback) et la mise en page (layout) sont rattachés à ce moment-là.
+
+# Base de résultats (voir thesis_resultats.py) : les CSV publiés sont importés
+# au premier lancement, les callbacks n'en lisent que les lignes utiles
+ouvrir_resultats()
+run_affichee = run_recente()
 
 
 # =================================================================================
@@ -50,6 +97,31 @@ def format_scientifique(x):
         return x
 
 
+def selection_modeles(valeur):
+    # Valeur de filtre-modeles -> liste de libellés, None = tous les modèles ;
+    # les groupes ("groupe:famille:Lasso"...) sont développés par le registre
+    if not valeur or "all" in valeur:
+        return None
+    selection = []
+    for v in valeur:
+        if v.startswith("groupe:"):
+            _, attribut, groupe = v.split(":", 2)
+            selection.extend(registre.rechercher(**{attribut: groupe}))
+        else:
+            selection.append(v)
+    return list(dict.fromkeys(selection))
+
+
+def relier_table(table):
+    # Données envoyées par colonnes dans le Store "<table>-colonnes", remises en
+    # lignes dans le navigateur (assets/encodage.js, voir thesis_encodage.py)
+    clientside_callback(
+        ClientsideFunction(namespace="encodage", function_name="enregistrements"),
+        Output(table, "data"),
+        Input(f"{table}-colonnes", "data"),
+    )
+
+
 # =================================================================================
 #                             Listes utiles
 # =================================================================================
@@ -58,31 +130,24 @@ def format_scientifique(x):
 #                modèles
 # =========================================
 
-modeles = [
-    "Ridge",
-    "Lasso",
-    "Elastic Net (α = 0.5)",
-    "Elastic Net",
-    "Adaptive Lasso",
-    "Ridge (DC-SIS)",
-    "Lasso (DC-SIS)",
-    "Elastic Net (DC-SIS) (α = 0.5)",
-    "Elastic Net (DC-SIS)",
-    "Adaptive Lasso (DC-SIS)",
-]
+# Registre découvert dans la base de résultats (voir thesis_registre.py) :
+# libellés, famille, présélection, alpha, run et couleur de chaque modèle
+registre = RegistreModeles.depuis_tables(
+    lire_modeles(run_affichee), lire_hyperparametres(run_affichee)
+)
 
-couleurs_modeles = {
-    "Ridge": "#1f77b4",  # bleu classique
-    "Lasso": "#ff7f0e",  # orange
-    "Elastic Net (α = 0.5)": "#2ca02c",  # vert
-    "Elastic Net": "#d62728",  # rouge brique
-    "Adaptive Lasso": "#9467bd",  # violet
-    "Ridge (DC-SIS)": "#8c564b",  # brun
-    "Lasso (DC-SIS)": "#e377c2",  # rose
-    "Elastic Net (DC-SIS) (α = 0.5)": "#7f7f7f",  # gris
-    "Elastic Net (DC-SIS)": "#bcbd22",  # jaune olive
-    "Adaptive Lasso (DC-SIS)": "#17becf",  # bleu turquoise
-}
+modeles = registre.libelles()
+
+couleurs_modeles = registre.couleurs()
+
+
+# =========================================
+#          indices de référence
+# =========================================
+
+# Indices de même univers d'actions (S&P 500 en tête) ; toutes les mesures
+# sont calculées face à chacun d'eux (voir thesis_performance.py)
+indices_reference = lire_indices(run_affichee)
 
 
 # =================================================================================
@@ -93,9 +158,19 @@ couleurs_modeles = {
 #               En-tête amélioré
 # =========================================
 
-options_modeles = [{"label": "Tous les modèles", "value": "all"}] + [
-    {"label": m, "value": m} for m in sorted(set(modeles))
+# Groupes (famille, présélection) puis modèles ; au-delà de NB_OPTIONS modèles,
+# la liste est filtrée côté serveur au fil de la saisie (rechercher_modeles)
+NB_OPTIONS = 50
+
+options_groupes = [{"label": "Tous les modèles", "value": "all"}] + [
+    {"label": f"{titre} : {groupe}", "value": f"groupe:{attribut}:{groupe}"}
+    for attribut, titre in [("famille", "Famille"), ("preselection", "Présélection")]
+    for groupe in registre.index[attribut]
 ]
+options_individuelles = [{"label": m, "value": m} for m in sorted(modeles)]
+libelles_options = {o["value"]: o["label"] for o in options_groupes}
+
+options_modeles = options_groupes + options_individuelles[:NB_OPTIONS]
 
 entete_appli = html.Div(
     [
@@ -177,37 +252,51 @@ entete_appli = html.Div(
 # -----------------------------------------
 
 
+# Éléments construits une fois par modèle ; une sélection ne fait que les choisir
+NB_LEGENDE = 30
+
+
+def element_legende(modele):
+    return html.Div(
+        [
+            html.Span(
+                style={
+                    "display": "inline-block",
+                    "width": "2vw",
+                    "height": "2vw",
+                    "backgroundColor": couleurs_modeles[modele],
+                    "marginRight": "0.5vw",
+                    "border": "0.1vw solid black",
+                    "borderRadius": "0.5vw",
+                }
+            ),
+            html.Span(
+                modele,
+                style={
+                    "fontSize": "2.5vh",
+                    "color": "black",
+                    "fontWeight": "bold",
+                    "whiteSpace": "nowrap",
+                },
+            ),
+        ],
+        style={"display": "flex", "alignItems": "center", "margin": "1vh 0.5vw"},
+    )
+
+
+elements_legende = {modele: element_legende(modele) for modele in modeles}
+
+
 def construire_legende_modeles(modeles_affiches):
-    legend_items = []
-    for modele in modeles_affiches:
-        if modele not in couleurs_modeles:
-            continue
-        item = html.Div(
-            [
-                html.Span(
-                    style={
-                        "display": "inline-block",
-                        "width": "2vw",
-                        "height": "2vw",
-                        "backgroundColor": couleurs_modeles[modele],
-                        "marginRight": "0.5vw",
-                        "border": "0.1vw solid black",
-                        "borderRadius": "0.5vw",
-                    }
-                ),
-                html.Span(
-                    modele,
-                    style={
-                        "fontSize": "2.5vh",
-                        "color": "black",
-                        "fontWeight": "bold",
-                        "whiteSpace": "nowrap",
-                    },
-                ),
-            ],
-            style={"display": "flex", "alignItems": "center", "margin": "1vh 0.5vw"},
+    affiches = [m for m in modeles_affiches if m in elements_legende]
+    legend_items = [elements_legende[m] for m in affiches[:NB_LEGENDE]]
+    if len(affiches) > NB_LEGENDE:
+        legend_items.append(
+            html.Span(
+                f"+ {len(affiches) - NB_LEGENDE} autres modèles",
+                style={"fontSize": "2.2vh", "fontStyle": "italic"},
+            )
         )
-        legend_items.append(item)
 
     return html.Div(
         legend_items,
@@ -251,29 +340,6 @@ appli_legende_modeles = html.Div(
 #             hyperparametres
 # =========================================
 
-# -----------------------------------------
-# Chargement des données
-# -----------------------------------------
-
-hyperparametres = pd.read_csv("data/hyperparameters.csv")
-
-hyperparametres_modeles = {
-    "ridge": "Ridge",
-    "lasso": "Lasso",
-    "en1": "Elastic Net (α = 0.5)",
-    "en2": "Elastic Net",
-    "adlasso": "Adaptive Lasso",
-    "ridge_dcsis": "Ridge (DC-SIS)",
-    "lasso_dcsis": "Lasso (DC-SIS)",
-    "en1_dcsis": "Elastic Net (DC-SIS) (α = 0.5)",
-    "en2_dcsis": "Elastic Net (DC-SIS)",
-    "adlasso_dcsis": "Adaptive Lasso (DC-SIS)",
-}
-
-hyperparametres["Model"] = hyperparametres["Model"].map(hyperparametres_modeles)
-hyperparametres.rename(columns={"Model": "Modele"}, inplace=True)
-
-
 # -----------------------------------------
 # Fonction
 # -----------------------------------------
@@ -387,23 +453,7 @@ appli_diagramme_lambda = html.Div(
 # Chargement des données
 # -----------------------------------------
 
-nb_variables = pd.read_csv("data/nb_variables.csv")
-
-colonnes = {
-    "stock": "Action",
-    "ridge": "Ridge",
-    "lasso": "Lasso",
-    "en1": "Elastic Net (α = 0.5)",
-    "en2": "Elastic Net",
-    "adlasso": "Adaptive Lasso",
-    "ridge_dcsis": "Ridge (DC-SIS)",
-    "lasso_dcsis": "Lasso (DC-SIS)",
-    "en1_dcsis": "Elastic Net (DC-SIS) (α = 0.5)",
-    "en2_dcsis": "Elastic Net (DC-SIS)",
-    "adlasso_dcsis": "Adaptive Lasso (DC-SIS)",
-}
-
-nb_variables.rename(columns=colonnes, inplace=True)
+# Lu par modèle dans update_dashboard (lire_nb_variables)
 
 
 # -----------------------------------------
@@ -497,9 +547,21 @@ appli_diagramme_nb_variables = html.Div(
 # Chargement des données
 # -----------------------------------------
 
-coefficients = pd.read_csv("data/coefficients.csv")
+# Aucune table chargée en entier : la table relit uniquement les modèles
+# sélectionnés, les moteurs de calcul lisent ce qu'il leur faut à leur création
 
-coefficients.rename(columns=colonnes, inplace=True)
+# Fréquences de sélection sur les plis et rééquilibrages, précalculées par
+# thesis_selection.py (facultatives)
+try:
+    stabilite = (
+        StabiliteSelection.charger(CHEMIN_STABILITE)
+        .frequences()
+        .reindex(lire_actions(run_affichee))
+    )
+except FileNotFoundError:
+    stabilite = None
+
+SUFFIXE_STABILITE = " (stabilité)"
 
 
 # -----------------------------------------
@@ -589,6 +651,7 @@ appli_table_coefficients = html.Div(
                 # "borderRadius": "0.5vw",
             },
         ),
+        dcc.Store(id="table-coefficients-colonnes"),
         dash_table.DataTable(
             id="table-coefficients",
             columns=[],
@@ -639,167 +702,120 @@ appli_table_coefficients = html.Div(
 )
 
 
+relier_table("table-coefficients")
+
+
 # =========================================
-#               PERFORMANCE
+#        recouvrement des sélections
 # =========================================
 
 # -----------------------------------------
 # Chargement des données
 # -----------------------------------------
 
-performance = pd.read_csv("data/performance.csv")
-
-performance_modeles = {
-    "sp500": "S&P 500",
-    "ridge": "Ridge",
-    "lasso": "Lasso",
-    "en1": "Elastic Net (α = 0.5)",
-    "en2": "Elastic Net",
-    "adlasso": "Adaptive Lasso",
-    "ridge_dcsis": "Ridge (DC-SIS)",
-    "lasso_dcsis": "Lasso (DC-SIS)",
-    "en1_dcsis": "Elastic Net (DC-SIS) (α = 0.5)",
-    "en2_dcsis": "Elastic Net (DC-SIS)",
-    "adlasso_dcsis": "Adaptive Lasso (DC-SIS)",
+# Matrices modèle x modèle calculées une fois (bitsets, voir thesis_selection.py)
+matrices_recouvrement = recouvrements(
+    lire_coefficients(run_affichee, modeles).set_index("Action")[modeles]
+)
+
+mesures_recouvrement = {
+    "Jaccard": "Indice de Jaccard",
+    "Chevauchement": "Coefficient de chevauchement",
+    "Poids communs": "Poids communs",
+    "Actions communes": "Nombre d'actions communes",
 }
 
-performance["Index_ETF"] = performance["Index_ETF"].map(performance_modeles)
 
 # -----------------------------------------
-# Fonction de visualisation
+# Fonction
 # -----------------------------------------
 
 
-def tracer_performance(df, colonne):
-    df_modeles = df[df["Index_ETF"] != "S&P 500"].copy()
-
-    # Formater la valeur avec 4 décimales
-    df_modeles["val_formatee"] = df_modeles[colonne].map(lambda x: f"{x:.4f}")
-
-    # Titres personnalisés pour les graphiques
-    titres_personnalises = {
-        "Tracking_Error": "Erreur de suivi",
-        "Active_Return": "Rendements excédentaires",
-        "Information_Ratio": "Ratio d'information",
-        "Correlation_SP500": "Corrélation",
-        "Beta": "Bêta",
-        "Jensen_Alpha": "Alpha de Jensen",
-    }
-
-    titre = titres_personnalises.get(colonne, colonne.replace("_", " "))
-
-    fig = px.line(
-        df_modeles,
-        x="Index_ETF",
-        y=colonne,
-        color="Index_ETF",
-        markers=True,
-        color_discrete_map=couleurs_modeles,
-        text="val_formatee",  # Valeur affichée sur les points
-    )
+def diagramme_recouvrement(matrice, mesure):
+    format_texte = "%{z:d}" if mesure == "Actions communes" else "%{z:.2f}"
 
-    fig.update_traces(
-        marker=dict(size=12),
-        textposition="top center",
-        textfont=dict(size=14),
+    fig = go.Figure(
+        go.Heatmap(
+            z=matrice.to_numpy(),
+            x=matrice.columns,
+            y=matrice.index,
+            colorscale="Blues",
+            zmin=0,
+            zmax=None if mesure == "Actions communes" else 1,
+            texttemplate=format_texte,
+            hovertemplate="%{y}<br>%{x}<br>" + format_texte + "<extra></extra>",
+        )
     )
 
     fig.update_layout(
         title=dict(
-            text=f"<b>{titre}</b>",
-            font=dict(size=20, color="black"),
+            text=f"<b>{mesures_recouvrement[mesure]} entre modèles</b>",
+            font=dict(size=21.5, color="black"),
             x=0.5,
         ),
-        xaxis=dict(showticklabels=False, title_text=None),
-        yaxis_title=titre,
-        showlegend=False,
-        annotations=[
-            dict(
-                text="Modèle",
-                x=0.5,
-                y=-0.15,
-                xref="paper",
-                yref="paper",
-                showarrow=False,
-                font=dict(size=16),
-            )
-        ],
+        yaxis=dict(autorange="reversed"),
+        margin=dict(t=70, b=50, l=10, r=10),
     )
 
     return fig
 
 
-def generer_graphiques_performance(df, modeles_selectionnes=None):
-    df_modeles = df[df["Index_ETF"] != "S&P 500"]
-    if modeles_selectionnes and modeles_selectionnes != ["all"]:
-        df_modeles = df_modeles[df_modeles["Index_ETF"].isin(modeles_selectionnes)]
-
-    mesures = [
-        "Tracking_Error",
-        "Active_Return",
-        "Information_Ratio",
-        "Correlation_SP500",
-        "Beta",
-        "Jensen_Alpha",
-    ]
-
-    figures = [
-        html.Div(
-            dcc.Graph(
-                figure=tracer_performance(df_modeles, mesure),
-                id=f"graph-performance-{mesure}",
-                config={"displayModeBar": False},
-            ),
-            style={
-                "backgroundColor": "white",
-                "border": "0.4vw solid #001F3F",
-                "borderRadius": "1.5vw",
-                "padding": "0.5vw",
-                "boxShadow": "0 4px 8px rgba(0, 0, 0, 0.1)",
-            },
-        )
-        for mesure in mesures
-    ]
-
-    return figures
-
-
 # -----------------------------------------
 # Intégration à l'application
 # -----------------------------------------
 
-# Création des graphiques dans l'ordre
-appli_diagramme_performance = html.Div(
-    id="bloc-performance",
+appli_recouvrement = html.Div(
+    [
+        dcc.RadioItems(
+            id="recouvrement-mesure",
+            options=[{"label": v, "value": k} for k, v in mesures_recouvrement.items()],
+            value="Jaccard",
+            inline=True,
+            inputStyle={"marginRight": "0.3vw", "marginLeft": "1vw"},
+            style={"fontSize": "1.8vh"},
+        ),
+        dcc.Graph(
+            id="diag-recouvrement",
+            style={"height": "60vh"},
+            config={"responsive": True},
+        ),
+    ],
     style={
         "width": "96.75vw",
-        "backgroundColor": "#e0e0e0",
         "borderRadius": "1.5vw",
+        "backgroundColor": "white",
         "border": "0.4vw solid #001F3F",
-        "padding": "0.5vw",
-        "display": "flex",
-        "flexDirection": "column",
-        "gap": "2vh",
+        "padding": "1vh 1vw",
+        "margin": "0 auto 1vh auto",
     },
 )
 
 
 # =========================================
-#             data_performance
+#          simulation (what-if)
 # =========================================
 
 # -----------------------------------------
 # Chargement des données
 # -----------------------------------------
 
-data_performance = pd.read_csv("data/data_performance.csv")
-data_performance.rename(
-    columns={k: v for k, v in colonnes.items() if k in data_performance.columns},
-    inplace=True,
-)
-data_performance["date"] = pd.to_datetime(
-    data_performance["date"]
-)  # Convertir la colonne "date" en datetime
+# Rendements des actions exportés par thesis.qmd (facultatifs : sans eux,
+# les curseurs de simulation sont désactivés)
+try:
+    rendements_actions, rendements_indice = charger_rendements()
+except FileNotFoundError:
+    rendements_actions, rendements_indice = None, None
+
+if rendements_actions is not None:
+    reestimation = ReestimationInteractive(
+        rendements_actions,
+        rendements_indice,
+        lire_coefficients(run_affichee),
+        lire_hyperparametres(run_affichee),
+        pilotes=registre.pilotes(),
+    )
+else:
+    reestimation = None
 
 
 # -----------------------------------------
@@ -807,95 +823,1273 @@ data_performance["date"] = pd.to_datetime(
 # -----------------------------------------
 
 
+def simuler_modele(modele, alpha, lambda_):
+    coefficients_simules = reestimation.reestimer(modele, alpha, lambda_)
+
+    # Rendements arithmétiques de l'ETF simulé, alignés sur ceux des indices
+    rendements = pd.Series(
+        np.expm1(reestimation.rendements_etf(coefficients_simules)),
+        index=rendements_actions.index,
+    )
+    references = lire_rendements(run_affichee, [*indices_reference, "Rf"])
+    donnees = references.set_index("date").join(
+        rendements.rename("simulation"), how="inner"
+    )
+    # Face à tous les indices en une passe : mesures (indices x 1)
+    mesures = mesures_performance(
+        donnees[["simulation"]].to_numpy(),
+        donnees[indices_reference].to_numpy(),
+        donnees["Rf"].to_numpy(),
+    )
+
+    return {
+        "modele": modele,
+        "alpha": alpha,
+        "lambda": lambda_,
+        "coefficients": coefficients_simules.dropna().to_dict(),
+        "nb_variables": int((coefficients_simules.fillna(0) != 0).sum()),
+        "performance": {
+            indice: {mesure: float(v[i, 0]) for mesure, v in mesures.items()}
+            for i, indice in enumerate(indices_reference)
+        },
+    }
+
+
+# Validation croisée complète (calcul long, exécuté en arrière-plan), sur la
+# grille d'alpha de la famille du modèle
+
+@tache_partagee(attente=(100, "Calcul identique en cours..."))
+def valider_modele(set_progress, modele):
+    def progression(pli, nb_plis):
+        set_progress((100 * pli / nb_plis, f"Pli {pli}/{nb_plis}"))
+
+    resultats, meilleur = reestimation.valider(
+        modele, grille(registre.alphas_validation(modele)), progression
+    )
+    return float(meilleur["alpha"]), float(meilleur["lambda"])
+
+
 # -----------------------------------------
 # Intégration à l'application
 # -----------------------------------------
 
+marques_lambda = {x: {"label": f"1e{x}"} for x in range(-7, -1)}
 
-# ==================================================================================
-#                               Interface utilisateur
-# ==================================================================================
-
-app.layout = dbc.Container(
+appli_simulation = html.Div(
     [
-        dbc.Row(
+        dcc.Store(id="simulation", data=None),
+        html.Div(
             [
-                dbc.Col(
-                    [entete_appli],
-                    style={
-                        "height": "19vh",
-                        "display": "flex",
-                        "alignItems": "center",
-                        "backgroundColor": "#395C93",
-                    },
-                    md=12,
+                dcc.Dropdown(
+                    id="simulation-modele",
+                    options=[{"label": m, "value": m} for m in modeles],
+                    value=None,
+                    placeholder="Modèle à ré-estimer",
+                    disabled=reestimation is None,
+                    style={"width": "20vw", "font-size": "2vh"},
                 ),
-            ]
-        ),
-        # Ajout de la légende
-        dbc.Row(
-            [
-                dbc.Col(
-                    [appli_legende_modeles],
-                    style={
-                        "display": "flex",
-                        "justifyContent": "center",
-                        "backgroundColor": "#6E8DBE",
-                        "padding": "0",
-                    },
-                    md=12,
+                dbc.Button(
+                    html.I(className="bi-arrow-counterclockwise"),
+                    id="simulation-reset",
+                    color="light",
+                    style={"marginLeft": "0.5vw"},
                 ),
-            ]
+            ],
+            style={"display": "flex", "alignItems": "center"},
         ),
-        # Graphiques
-        dbc.Row(
+        html.Div(
             [
-                dbc.Col(
-                    appli_diagramme_alpha,
-                    md=6,
-                    style={
-                        "padding": "0 0.5vw 1vh 1vw",
-                    },
+                html.Div(
+                    [
+                        dbc.Button(
+                            "Validation croisée",
+                            id="simulation-cv",
+                            color="primary",
+                            size="sm",
+                            disabled=reestimation is None,
+                        ),
+                        dbc.Button(
+                            html.I(className="bi-x-lg"),
+                            id="simulation-annuler",
+                            color="danger",
+                            size="sm",
+                            disabled=True,
+                            style={"marginLeft": "0.3vw"},
+                        ),
+                    ],
+                    style={"display": "flex"},
                 ),
-                dbc.Col(
-                    appli_diagramme_lambda,
-                    md=6,
-                    style={
-                        "padding": "0 1vw 1vh 0.5vw",
-                    },
+                dbc.Progress(
+                    id="simulation-progression",
+                    value=0,
+                    label="",
+                    style={"height": "1.8vh", "marginTop": "0.5vh"},
                 ),
             ],
-            style={
-                "height": "72vh",
-                "backgroundColor": "#6E8DBE",
-            },
+            style={"width": "12vw", "marginLeft": "1vw"},
         ),
-        dbc.Row(
+        html.Div(
             [
-                dbc.Col(
-                    appli_diagramme_nb_variables,
-                    md=6,
-                    style={
-                        "padding": "0 0.5vw 1vh 1vw",
-                    },
-                ),
-                dbc.Col(
-                    [
-                        # STORE doit venir avant les callbacks dépendants
-                        dcc.Store(id="etat-normalisation", data=False),
-                        appli_table_coefficients,
-                    ],
-                    md=6,
-                    style={
-                        "padding": "0 1vw 1vh 0.5vw",
-                    },
+                html.Span("alpha", style={"fontWeight": "bold"}),
+                dcc.Slider(
+                    id="simulation-alpha",
+                    min=0,
+                    max=1,
+                    step=0.05,
+                    value=None,
+                    marks={x / 10: f"{x / 10:.1f}" for x in range(0, 11, 2)},
+                    disabled=reestimation is None,
                 ),
             ],
-            style={
-                "height": "72vh",
+            style={"flex": "1", "margin": "0 1vw"},
+        ),
+        html.Div(
+            [
+                html.Span("log10(lambda)", style={"fontWeight": "bold"}),
+                dcc.Slider(
+                    id="simulation-lambda",
+                    min=-7,
+                    max=-2,
+                    step=0.05,
+                    value=None,
+                    marks=marques_lambda,
+                    disabled=reestimation is None,
+                ),
+            ],
+            style={"flex": "1", "margin": "0 1vw"},
+        ),
+        html.Div(
+            id="simulation-statut",
+            children=(
+                "Simulation indisponible : data/returns.csv absent"
+                if reestimation is None
+                else "Choisissez un modèle pour le ré-estimer"
+            ),
+            style={"width": "18vw", "fontSize": "1.8vh"},
+        ),
+    ],
+    style={
+        "width": "96.75vw",
+        "display": "flex",
+        "alignItems": "center",
+        "borderRadius": "1.5vw",
+        "backgroundColor": "white",
+        "border": "0.4vw solid #001F3F",
+        "padding": "1.5vh 1vw",
+        "margin": "0 auto 1vh auto",
+    },
+)
+
+
+# =========================================
+#     attribution de l'erreur de suivi
+# =========================================
+
+# -----------------------------------------
+# Chargement des données
+# -----------------------------------------
+
+# Modèle de risque sur fenêtres glissantes de 504 jours (rendements arithmétiques),
+# recalculé de façon incrémentale quand la fenêtre se déplace
+if rendements_actions is not None:
+    risque_actif = RisqueActif(np.expm1(rendements_actions), np.expm1(rendements_indice))
+    fins_fenetres = list(
+        range(len(rendements_actions), risque_actif.fenetre - 1, -21)
+    )[::-1]
+else:
+    risque_actif = None
+    fins_fenetres = []
+
+NB_CONTRIBUTIONS = 20
+
+
+# -----------------------------------------
+# Fonction
+# -----------------------------------------
+
+
+def diagramme_attribution(attribution, erreur_suivi, modele):
+    # Principales contributions (en valeur absolue) à l'erreur de suivi
+    principales = (
+        attribution.reindex(
+            attribution["contribution"].abs().sort_values(ascending=False).index
+        )
+        .head(NB_CONTRIBUTIONS)
+        .iloc[::-1]
+    )
+
+    fig = go.Figure(
+        go.Bar(
+            x=principales["contribution"],
+            y=principales["Action"],
+            orientation="h",
+            marker_color=couleurs_modeles.get(modele, "#001F3F"),
+            customdata=principales[["poids", "poids_indice", "part"]],
+            hovertemplate=(
+                "<b>%{y}</b><br>Contribution : %{x:.5f}<br>"
+                "Poids ETF : %{customdata[0]:.4f}<br>"
+                "Poids répliquant : %{customdata[1]:.4f}<br>"
+                "Part : %{customdata[2]:.1%}<extra></extra>"
+            ),
+        )
+    )
+
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Contributions à l'erreur de suivi ({erreur_suivi:.4f})</b>",
+            font=dict(size=21.5, color="black"),
+            x=0.5,
+        ),
+        xaxis_title="Contribution annualisée",
+        margin=dict(t=70, b=50, l=110, r=10),
+        plot_bgcolor="white",
+    )
+
+    return fig
+
+
+# -----------------------------------------
+# Intégration à l'application
+# -----------------------------------------
+
+appli_attribution = html.Div(
+    [
+        html.Div(
+            [
+                dcc.Dropdown(
+                    id="attribution-modele",
+                    options=[{"label": m, "value": m} for m in modeles],
+                    value=modeles[0],
+                    clearable=False,
+                    style={"width": "20vw", "font-size": "2vh"},
+                ),
+                html.Div(
+                    dcc.Slider(
+                        id="attribution-fin",
+                        min=0,
+                        max=max(len(fins_fenetres) - 1, 0),
+                        step=1,
+                        value=max(len(fins_fenetres) - 1, 0),
+                        marks={
+                            i: rendements_actions.index[fin - 1].strftime("%Y")
+                            for i, fin in enumerate(fins_fenetres)
+                            if i == 0
+                            or rendements_actions.index[fin - 1].year
+                            != rendements_actions.index[fins_fenetres[i - 1] - 1].year
+                        },
+                    ),
+                    style={"flex": "1", "margin": "0 1vw"},
+                ),
+                html.Div(id="attribution-statut", style={"fontSize": "1.8vh"}),
+            ],
+            style={"display": "flex", "alignItems": "center"},
+        ),
+        dcc.Graph(
+            id="diag-attribution",
+            style={"height": "60vh"},
+            config={"responsive": True},
+        ),
+    ],
+    style={
+        "width": "96.75vw",
+        "borderRadius": "1.5vw",
+        "backgroundColor": "white",
+        "border": "0.4vw solid #001F3F",
+        "padding": "1vh 1vw",
+        "margin": "0 auto 1vh auto",
+        "display": "block" if risque_actif is not None else "none",
+    },
+)
+
+
+# =========================================
+#     portefeuille à au plus K actions
+# =========================================
+
+# -----------------------------------------
+# Chargement des données
+# -----------------------------------------
+
+# Chemins de régularisation précalculés par thesis_chemins.py (facultatifs,
+# ignorés s'ils ont été calculés sur d'autres données) ; chaque valeur de K est
+# une lecture indexée dans la base de résultats
+modeles_chemins = lire_modeles_chemins(run_affichee, empreinte_chemins())
+
+colonnes_cardinalite = [
+    {"name": "Action", "id": "Action"},
+    {
+        "name": "Poids",
+        "id": "poids",
+        "type": "numeric",
+        "format": Format(precision=2, scheme=Scheme.percentage),
+    },
+    {
+        "name": "Coefficient",
+        "id": "coefficient",
+        "type": "numeric",
+        "format": Format(precision=2, scheme="e"),
+    },
+]
+
+
+# -----------------------------------------
+# Fonction
+# -----------------------------------------
+
+
+def diagramme_cardinalite(chemin, point, modele):
+    # Erreur de suivi le long du chemin en fonction du nombre d'actions
+    chemin = chemin[chemin["nb_variables"] > 0]
+    couleur = couleurs_modeles.get(modele, "#001F3F")
+
+    fig = go.Figure(
+        [
+            go.Scatter(
+                x=chemin["nb_variables"],
+                y=chemin["Tracking_Error"],
+                mode="lines+markers",
+                line=dict(color=couleur, width=1.5),
+                marker=dict(size=5),
+                customdata=chemin[["lambda"]],
+                hovertemplate=(
+                    "%{x} actions<br>Erreur de suivi : %{y:.4f}<br>"
+                    "λ = %{customdata[0]:.2e}<extra></extra>"
+                ),
+                name="Chemin",
+            ),
+            go.Scatter(
+                x=[point["nb_variables"]],
+                y=[point["Tracking_Error"]],
+                mode="markers",
+                marker=dict(size=16, symbol="star", color="#001F3F"),
+                hovertemplate=(
+                    "Portefeuille retenu<br>%{x} actions<br>"
+                    "Erreur de suivi : %{y:.4f}<extra></extra>"
+                ),
+                name="Portefeuille retenu",
+            ),
+        ]
+    )
+
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Erreur de suivi le long du chemin : {modele}</b>",
+            font=dict(size=21.5, color="black"),
+            x=0.5,
+        ),
+        xaxis_title="Nombre d'actions",
+        yaxis_title="Erreur de suivi",
+        showlegend=False,
+        margin=dict(t=70, b=50, l=70, r=10),
+        plot_bgcolor="white",
+    )
+
+    return fig
+
+
+# -----------------------------------------
+# Intégration à l'application
+# -----------------------------------------
+
+appli_cardinalite = html.Div(
+    [
+        html.Div(
+            [
+                dcc.Dropdown(
+                    id="cardinalite-modele",
+                    options=[{"label": m, "value": m} for m in modeles_chemins],
+                    value=modeles_chemins[0] if modeles_chemins else None,
+                    clearable=False,
+                    style={"width": "20vw", "font-size": "2vh"},
+                ),
+                html.Div(
+                    dcc.Slider(
+                        id="cardinalite-k",
+                        min=1,
+                        max=100,
+                        step=1,
+                        value=50,
+                        tooltip={"placement": "bottom", "always_visible": True},
+                    ),
+                    style={"flex": "1", "margin": "0 1vw"},
+                ),
+                html.Div(id="cardinalite-statut", style={"fontSize": "1.8vh"}),
+            ],
+            style={"display": "flex", "alignItems": "center"},
+        ),
+        html.Div(
+            [
+                dcc.Graph(
+                    id="diag-cardinalite",
+                    style={"width": "60%", "height": "60vh"},
+                    config={"responsive": True},
+                ),
+                dcc.Store(id="table-cardinalite-colonnes"),
+                dash_table.DataTable(
+                    id="table-cardinalite",
+                    columns=colonnes_cardinalite,
+                    data=[],
+                    page_action="none",
+                    style_table={"height": "60vh", "overflowY": "auto", "width": "38%"},
+                    style_cell={
+                        "textAlign": "center",
+                        "font_family": "Arial",
+                        "font_size": "14px",
+                    },
+                    style_header={
+                        "backgroundColor": "#001F3F",
+                        "fontWeight": "bold",
+                        "color": "white",
+                    },
+                    fixed_rows={"headers": True},
+                    sort_action="native",
+                    filter_action="native",
+                    filter_options={"placeholder_text": "Filtrer..."},
+                    export_format="csv",
+                ),
+            ],
+            style={"display": "flex", "justifyContent": "space-between"},
+        ),
+    ],
+    style={
+        "width": "96.75vw",
+        "borderRadius": "1.5vw",
+        "backgroundColor": "white",
+        "border": "0.4vw solid #001F3F",
+        "padding": "1vh 1vw",
+        "margin": "0 auto 1vh auto",
+        "display": "block" if modeles_chemins else "none",
+    },
+)
+
+relier_table("table-cardinalite")
+
+
+# =========================================
+#    surfaces de validation croisée
+# =========================================
+
+# -----------------------------------------
+# Chargement des données
+# -----------------------------------------
+
+# Cubes alpha x lambda x pli précalculés par thesis_surfaces.py (facultatifs) ;
+# la surface affichée est lue au niveau de zoom adapté à la fenêtre visible
+try:
+    surfaces = SurfacesValidation.charger(CHEMIN_SURFACES)
+    libelles_surfaces = list(surfaces.libelles.values())
+except FileNotFoundError:
+    surfaces = None
+    libelles_surfaces = []
+
+libelles_mesures_cv = {"RMSE": "RMSE", "Rsquared": "R²", "MAE": "MAE"}
+
+
+# -----------------------------------------
+# Fonction
+# -----------------------------------------
+
+
+def diagramme_surface(surface, modele, mesure, vue, alpha):
+    # Carte de chaleur et lignes de niveau de la mesure de validation croisée
+    titre_y = "α" if vue == "moyenne" else "Pli"
+    titre = (
+        f"{libelles_mesures_cv[mesure]} moyen sur les plis : {modele}"
+        if vue == "moyenne"
+        else f"{libelles_mesures_cv[mesure]} par pli (α = {alpha:.2f}) : {modele}"
+    )
+
+    fig = go.Figure(
+        [
+            go.Heatmap(
+                z=surface["z"],
+                x=surface["x"],
+                y=surface["y"],
+                colorscale="Viridis",
+                reversescale=mesure == "Rsquared",
+                colorbar=dict(title=libelles_mesures_cv[mesure]),
+                hovertemplate=(
+                    "log10(λ) = %{x:.2f}<br>"
+                    + titre_y
+                    + " = %{y:.2f}<br>%{z:.4f}<extra></extra>"
+                ),
+            ),
+            go.Contour(
+                z=surface["z"],
+                x=surface["x"],
+                y=surface["y"],
+                contours=dict(coloring="none", showlabels=True),
+                line=dict(color="white", width=1),
+                showscale=False,
+                hoverinfo="skip",
+            ),
+        ]
+    )
+
+    fig.update_layout(
+        title=dict(
+            text=f"<b>{titre}</b>",
+            font=dict(size=21.5, color="black"),
+            x=0.5,
+        ),
+        xaxis_title="log10(λ)",
+        yaxis_title=titre_y,
+        margin=dict(t=70, b=50, l=70, r=10),
+        plot_bgcolor="white",
+        # Zoom conservé lorsque seules les données changent
+        uirevision=f"{modele}-{vue}",
+    )
+
+    return fig
+
+
+def fenetre_zoom(relayout, axe):
+    # Plage visible d'un axe dans relayoutData (None : vue complète)
+    if not relayout or relayout.get(f"{axe}.autorange"):
+        return None
+    if f"{axe}.range[0]" in relayout:
+        return relayout[f"{axe}.range[0]"], relayout[f"{axe}.range[1]"]
+    return relayout.get(f"{axe}.range")
+
+
+# -----------------------------------------
+# Intégration à l'application
+# -----------------------------------------
+
+appli_surface = html.Div(
+    [
+        html.Div(
+            [
+                dcc.Dropdown(
+                    id="surface-modele",
+                    options=[{"label": m, "value": m} for m in libelles_surfaces],
+                    value=libelles_surfaces[0] if libelles_surfaces else None,
+                    clearable=False,
+                    style={"width": "20vw", "font-size": "2vh"},
+                ),
+                dcc.RadioItems(
+                    id="surface-mesure",
+                    options=[
+                        {"label": libelle, "value": mesure}
+                        for mesure, libelle in libelles_mesures_cv.items()
+                    ],
+                    value="RMSE",
+                    inline=True,
+                    inputStyle={"marginRight": "0.3vw", "marginLeft": "1vw"},
+                    style={"fontSize": "1.8vh"},
+                ),
+                dcc.RadioItems(
+                    id="surface-vue",
+                    options=[
+                        {"label": "Moyenne (α x λ)", "value": "moyenne"},
+                        {"label": "Par pli (pli x λ)", "value": "plis"},
+                    ],
+                    value="moyenne",
+                    inline=True,
+                    inputStyle={"marginRight": "0.3vw", "marginLeft": "1vw"},
+                    style={"fontSize": "1.8vh"},
+                ),
+                dcc.Dropdown(
+                    id="surface-alpha",
+                    clearable=False,
+                    placeholder="α",
+                    style={"width": "8vw", "font-size": "2vh", "marginLeft": "1vw"},
+                ),
+                html.Div(
+                    id="surface-statut",
+                    style={"fontSize": "1.8vh", "marginLeft": "auto"},
+                ),
+            ],
+            style={"display": "flex", "alignItems": "center"},
+        ),
+        dcc.Graph(
+            id="diag-surface",
+            style={"width": "100%", "height": "60vh"},
+            config={"responsive": True},
+        ),
+    ],
+    style={
+        "width": "96.75vw",
+        "borderRadius": "1.5vw",
+        "backgroundColor": "white",
+        "border": "0.4vw solid #001F3F",
+        "padding": "1vh 1vw",
+        "margin": "0 auto 1vh auto",
+        "display": "block" if surfaces is not None else "none",
+    },
+)
+
+
+# =========================================
+#        ré-estimation glissante
+# =========================================
+
+# -----------------------------------------
+# Chargement des données
+# -----------------------------------------
+
+# Historique des coefficients enregistré dans la base par thesis_backtest.py
+# (facultatif) : seules les dates sont lues ici, le callback relit la date et
+# les modèles affichés
+dates_historique = lire_dates_historique(run_affichee)
+
+
+# -----------------------------------------
+# Fonction
+# -----------------------------------------
+
+
+def diagramme_historique(data, date_selectionnee):
+    fig = px.line(
+        data,
+        x="date",
+        y="Nb_variables",
+        color="Modele",
+        color_discrete_map=couleurs_modeles,
+        labels={"date": "Date de ré-estimation", "Nb_variables": "Nombre de variables"},
+    )
+
+    if date_selectionnee is not None:
+        fig.add_vline(x=date_selectionnee, line_dash="dash", line_color="black")
+
+    fig.update_layout(
+        title=dict(
+            text="<b>Nombre de variables par ré-estimation</b>",
+            font=dict(size=21.5, color="black"),
+            x=0.5,
+        ),
+        showlegend=False,
+        margin=dict(t=70, b=50, l=60, r=10),
+    )
+
+    return fig
+
+
+# -----------------------------------------
+# Intégration à l'application
+# -----------------------------------------
+
+appli_historique = html.Div(
+    [
+        dcc.Slider(
+            id="historique-date",
+            min=0,
+            max=max(len(dates_historique) - 1, 0),
+            step=1,
+            value=max(len(dates_historique) - 1, 0),
+            marks={
+                i: pd.Timestamp(d).strftime("%Y")
+                for i, d in enumerate(dates_historique)
+                if i == 0 or pd.Timestamp(d).year != pd.Timestamp(dates_historique[i - 1]).year
+            },
+            disabled=not dates_historique,
+        ),
+        html.Div(
+            [
+                dcc.Graph(
+                    id="diag-historique",
+                    style={"width": "50%", "height": "60vh"},
+                    config={"responsive": True},
+                ),
+                dcc.Store(id="table-historique-colonnes"),
+                dash_table.DataTable(
+                    id="table-historique",
+                    columns=[],
+                    data=[],
+                    page_action="none",
+                    style_table={"height": "60vh", "overflowY": "auto", "width": "48%"},
+                    style_cell={
+                        "textAlign": "center",
+                        "font_family": "Arial",
+                        "font_size": "14px",
+                    },
+                    style_header={
+                        "backgroundColor": "#001F3F",
+                        "fontWeight": "bold",
+                        "color": "white",
+                    },
+                    fixed_rows={"headers": True},
+                    sort_action="native",
+                    filter_action="native",
+                    filter_options={"placeholder_text": "Filtrer..."},
+                ),
+            ],
+            style={"display": "flex", "justifyContent": "space-between"},
+        ),
+    ],
+    style={
+        "width": "96.75vw",
+        "borderRadius": "1.5vw",
+        "backgroundColor": "white",
+        "border": "0.4vw solid #001F3F",
+        "padding": "1vh 1vw",
+        "margin": "0 auto 1vh auto",
+        "display": "block" if dates_historique else "none",
+    },
+)
+
+relier_table("table-historique")
+
+
+# =========================================
+#               PERFORMANCE
+# =========================================
+
+# -----------------------------------------
+# Chargement des données
+# -----------------------------------------
+
+# Lu par modèle dans update_graphiques_performance (lire_performance)
+
+# -----------------------------------------
+# Fonction de visualisation
+# -----------------------------------------
+
+
+def tracer_performance(df, colonne):
+    df_modeles = df[~df["Index_ETF"].isin(indices_reference)].copy()
+
+    # Formater la valeur avec 4 décimales
+    df_modeles["val_formatee"] = df_modeles[colonne].map(lambda x: f"{x:.4f}")
+
+    # Barres d'erreur : intervalles de confiance bootstrap (si calculés)
+    barres_erreur = {}
+    if f"{colonne}_inf" in df_modeles.columns:
+        df_modeles["erreur_plus"] = df_modeles[f"{colonne}_sup"] - df_modeles[colonne]
+        df_modeles["erreur_moins"] = df_modeles[colonne] - df_modeles[f"{colonne}_inf"]
+        barres_erreur = {"error_y": "erreur_plus", "error_y_minus": "erreur_moins"}
+
+    # Un panneau par indice de référence lorsqu'il y en a plusieurs
+    panneaux = {}
+    if df_modeles["Indice"].nunique() > 1:
+        panneaux = {"facet_col": "Indice"}
+
+    # Titres personnalisés pour les graphiques
+    titres_personnalises = {
+        "Tracking_Error": "Erreur de suivi",
+        "Active_Return": "Rendements excédentaires",
+        "Information_Ratio": "Ratio d'information",
+        "Correlation_SP500": "Corrélation",
+        "Beta": "Bêta",
+        "Jensen_Alpha": "Alpha de Jensen",
+    }
+
+    titre = titres_personnalises.get(colonne, colonne.replace("_", " "))
+
+    fig = px.line(
+        df_modeles,
+        x="Index_ETF",
+        y=colonne,
+        color="Index_ETF",
+        markers=True,
+        color_discrete_map=couleurs_modeles,
+        text="val_formatee",  # Valeur affichée sur les points
+        **barres_erreur,
+        **panneaux,
+    )
+
+    fig.update_traces(
+        marker=dict(size=12),
+        textposition="top center",
+        textfont=dict(size=14),
+    )
+    fig.update_xaxes(showticklabels=False, title_text=None)
+    # Titres des panneaux : "Indice=S&P 500" -> "S&P 500"
+    fig.for_each_annotation(
+        lambda a: a.update(text=f"<b>{a.text.split('=', 1)[-1]}</b>")
+    )
+
+    fig.update_layout(
+        title=dict(
+            text=f"<b>{titre}</b>",
+            font=dict(size=20, color="black"),
+            x=0.5,
+        ),
+        yaxis_title=titre,
+        showlegend=False,
+    )
+    fig.add_annotation(
+        text="Modèle",
+        x=0.5,
+        y=-0.15,
+        xref="paper",
+        yref="paper",
+        showarrow=False,
+        font=dict(size=16),
+    )
+
+    return fig
+
+
+def generer_graphiques_performance(df, modeles_selectionnes=None, intervalles=None):
+    df_modeles = df[~df["Index_ETF"].isin(indices_reference)]
+    if modeles_selectionnes and modeles_selectionnes != ["all"]:
+        df_modeles = df_modeles[df_modeles["Index_ETF"].isin(modeles_selectionnes)]
+
+    # intervalles : une ligne par couple (Indice, Index_ETF)
+    if intervalles:
+        df_modeles = df_modeles.merge(
+            pd.DataFrame(intervalles), on=["Indice", "Index_ETF"], how="left"
+        )
+
+    mesures = [
+        "Tracking_Error",
+        "Active_Return",
+        "Information_Ratio",
+        "Correlation_SP500",
+        "Beta",
+        "Jensen_Alpha",
+    ]
+
+    figures = [
+        html.Div(
+            dcc.Graph(
+                figure=tracer_performance(df_modeles, mesure),
+                id=f"graph-performance-{mesure}",
+                config={"displayModeBar": False},
+            ),
+            style={
+                "backgroundColor": "white",
+                "border": "0.4vw solid #001F3F",
+                "borderRadius": "1.5vw",
+                "padding": "0.5vw",
+                "boxShadow": "0 4px 8px rgba(0, 0, 0, 0.1)",
+            },
+        )
+        for mesure in mesures
+    ]
+
+    return figures
+
+
+# -----------------------------------------
+# Intervalles de confiance (bootstrap par blocs stationnaire)
+# -----------------------------------------
+
+# Les dates des rendements (indices, ETF et Rf) sont rééchantillonnées
+# conjointement, chaque réplication donnant les mesures de tous les couples
+# (indice, modèle) ; calcul long exécuté en arrière-plan (voir thesis_taches.py)
+
+NB_REPLICATIONS = 2000
+
+
+@tache_partagee(attente=(100, "Calcul identique en cours..."))
+def intervalles_bootstrap(set_progress, nb_replications, indices):
+    def progression(lot, nb_lots):
+        set_progress((100 * lot / nb_lots, f"Lot {lot}/{nb_lots}"))
+
+    rendements = lire_rendements(run_affichee, [*modeles, *indices, "Rf"])
+    modeles_etf = [m for m in modeles if m in rendements.columns]
+    replications = bootstrap_mesures(
+        rendements[modeles_etf].to_numpy(),
+        rendements[list(indices)].to_numpy(),
+        rendements["Rf"].to_numpy(),
+        nb_replications=nb_replications,
+        progression=progression,
+    )
+    intervalles = intervalles_confiance(replications, modeles_etf, indices=indices)
+    return intervalles.reset_index().to_dict(orient="records")
+
+
+# -----------------------------------------
+# Intégration à l'application
+# -----------------------------------------
+
+appli_bootstrap = html.Div(
+    [
+        dcc.Store(id="intervalles-performance", data=None),
+        dbc.Button(
+            "Intervalles de confiance (bootstrap)",
+            id="bootstrap-lancer",
+            color="primary",
+            size="sm",
+        ),
+        dbc.Button(
+            html.I(className="bi-x-lg"),
+            id="bootstrap-annuler",
+            color="danger",
+            size="sm",
+            disabled=True,
+            style={"marginLeft": "0.3vw"},
+        ),
+        dbc.Progress(
+            id="bootstrap-progression",
+            value=0,
+            label="",
+            style={"width": "20vw", "height": "1.8vh", "marginLeft": "1vw"},
+        ),
+        html.Span(
+            f"IC à 95 %, {NB_REPLICATIONS} réplications par blocs stationnaires",
+            style={"marginLeft": "1vw", "fontSize": "1.8vh"},
+        ),
+        # Indices de référence affichés (un panneau par indice)
+        dcc.Dropdown(
+            id="filtre-indices",
+            options=[{"label": i, "value": i} for i in indices_reference],
+            value=indices_reference,
+            multi=True,
+            placeholder="Indices de référence",
+            style={
+                "width": "30vw",
+                "font-size": "1.8vh",
+                "marginLeft": "auto",
+                "display": "block" if len(indices_reference) > 1 else "none",
+            },
+        ),
+    ],
+    style={
+        "width": "96.75vw",
+        "display": "flex",
+        "alignItems": "center",
+        "borderRadius": "1.5vw",
+        "backgroundColor": "white",
+        "border": "0.4vw solid #001F3F",
+        "padding": "1vh 1vw",
+        "margin": "0 auto 1vh auto",
+    },
+)
+
+# Création des graphiques dans l'ordre
+appli_diagramme_performance = html.Div(
+    id="bloc-performance",
+    style={
+        "width": "96.75vw",
+        "backgroundColor": "#e0e0e0",
+        "borderRadius": "1.5vw",
+        "border": "0.4vw solid #001F3F",
+        "padding": "0.5vw",
+        "display": "flex",
+        "flexDirection": "column",
+        "gap": "2vh",
+    },
+)
+
+
+# =========================================
+#             diagnostics
+# =========================================
+
+# -----------------------------------------
+# Chargement des données
+# -----------------------------------------
+
+# Séries soumises aux diagnostics (ACF, PACF, Ljung-Box, voir thesis_diagnostics.py) :
+# indices et ETF seulement (sans Rf), "date" déjà en datetime
+rendements_etf = lire_rendements(run_affichee, indices_reference + modeles)
+series_diagnostics = {
+    "ETF": rendements_etf.set_index("date")[
+        [s for s in indices_reference + modeles if s in rendements_etf.columns]
+    ]
+}
+if rendements_actions is not None:
+    series_diagnostics["Actions"] = rendements_actions
+
+nb_retards_diagnostics = nb_retards_defaut(len(series_diagnostics["ETF"]))
+
+# Empreintes (clés du cache des diagnostics) calculées une fois, pas à chaque callback
+empreintes_diagnostics = {
+    groupe: empreinte_rendements(series)
+    for groupe, series in series_diagnostics.items()
+}
+
+colonnes_diagnostics = [
+    {"name": "Série", "id": "Serie"},
+    {
+        "name": "Q",
+        "id": "X_squared",
+        "type": "numeric",
+        "format": Format(precision=2, scheme=Scheme.fixed),
+    },
+    {
+        "name": "p-valeur",
+        "id": "p_value",
+        "type": "numeric",
+        "format": Format(precision=4, scheme=Scheme.fixed),
+    },
+    {
+        "name": "ACF(1)",
+        "id": "acf_1",
+        "type": "numeric",
+        "format": Format(precision=4, scheme=Scheme.fixed),
+    },
+    {"name": "Décision", "id": "decision"},
+]
+
+
+# -----------------------------------------
+# Fonction
+# -----------------------------------------
+
+
+def diagramme_autocorrelation(resultat, serie):
+    fig = go.Figure()
+    for nom, decalage, couleur in [("ACF", -0.15, "#001F3F"), ("PACF", 0.15, "#FF851B")]:
+        valeurs = resultat[nom.lower()][serie]
+        fig.add_trace(
+            go.Bar(
+                x=valeurs.index + decalage,
+                y=valeurs,
+                width=0.3,
+                name=nom,
+                marker_color=couleur,
+            )
+        )
+
+    # Bandes de confiance à 95 %
+    for signe in (1, -1):
+        fig.add_hline(y=signe * resultat["ic"], line_dash="dash", line_color="black")
+
+    fig.update_layout(
+        title=dict(
+            text=f"<b>Autocorrélations : {serie}</b>",
+            font=dict(size=21.5, color="black"),
+            x=0.5,
+        ),
+        xaxis_title="Retard",
+        legend=dict(orientation="h", y=-0.15, x=0.5, xanchor="center"),
+        margin=dict(t=70, b=50, l=60, r=10),
+        plot_bgcolor="white",
+    )
+
+    return fig
+
+
+# -----------------------------------------
+# Intégration à l'application
+# -----------------------------------------
+
+appli_diagnostics = html.Div(
+    [
+        html.Div(
+            [
+                dcc.RadioItems(
+                    id="diagnostic-groupe",
+                    options=[{"label": g, "value": g} for g in series_diagnostics],
+                    value="ETF",
+                    inline=True,
+                    inputStyle={"marginRight": "0.3vw", "marginLeft": "1vw"},
+                    style={"fontSize": "1.8vh"},
+                ),
+                html.Span(
+                    "Retard du test de Ljung-Box",
+                    style={"fontWeight": "bold", "marginLeft": "2vw"},
+                ),
+                html.Div(
+                    dcc.Slider(
+                        id="diagnostic-retard",
+                        min=1,
+                        max=nb_retards_diagnostics,
+                        step=1,
+                        value=min(10, nb_retards_diagnostics),
+                        marks={
+                            x: str(x) for x in range(0, nb_retards_diagnostics + 1, 5)
+                        },
+                    ),
+                    style={"flex": "1", "margin": "0 1vw"},
+                ),
+            ],
+            style={"display": "flex", "alignItems": "center"},
+        ),
+        html.Div(
+            [
+                dcc.Store(id="table-diagnostics-colonnes"),
+                dash_table.DataTable(
+                    id="table-diagnostics",
+                    columns=colonnes_diagnostics,
+                    data=[],
+                    page_action="none",
+                    style_table={"height": "60vh", "overflowY": "auto", "width": "48%"},
+                    style_cell={
+                        "textAlign": "center",
+                        "font_family": "Arial",
+                        "font_size": "14px",
+                    },
+                    style_header={
+                        "backgroundColor": "#001F3F",
+                        "fontWeight": "bold",
+                        "color": "white",
+                    },
+                    style_data_conditional=[
+                        {
+                            "if": {"filter_query": '{decision} = "Reject H0"'},
+                            "backgroundColor": "#ff4d4d",
+                        }
+                    ],
+                    fixed_rows={"headers": True},
+                    sort_action="native",
+                    filter_action="native",
+                    filter_options={"placeholder_text": "Filtrer..."},
+                ),
+                dcc.Graph(
+                    id="diag-autocorrelation",
+                    style={"width": "50%", "height": "60vh"},
+                    config={"responsive": True},
+                ),
+            ],
+            style={"display": "flex", "justifyContent": "space-between"},
+        ),
+    ],
+    style={
+        "width": "96.75vw",
+        "borderRadius": "1.5vw",
+        "backgroundColor": "white",
+        "border": "0.4vw solid #001F3F",
+        "padding": "1vh 1vw",
+        "margin": "0 auto 1vh auto",
+    },
+)
+
+relier_table("table-diagnostics")
+
+
+# ==================================================================================
+#                               Interface utilisateur
+# ==================================================================================
+
+layout = dbc.Container(
+    [
+        dbc.Row(
+            [
+                dbc.Col(
+                    [entete_appli],
+                    style={
+                        "height": "19vh",
+                        "display": "flex",
+                        "alignItems": "center",
+                        "backgroundColor": "#395C93",
+                    },
+                    md=12,
+                ),
+            ]
+        ),
+        # Ajout de la légende
+        dbc.Row(
+            [
+                dbc.Col(
+                    [appli_legende_modeles],
+                    style={
+                        "display": "flex",
+                        "justifyContent": "center",
+                        "backgroundColor": "#6E8DBE",
+                        "padding": "0",
+                    },
+                    md=12,
+                ),
+            ]
+        ),
+        # Graphiques
+        dbc.Row(
+            [
+                dbc.Col(
+                    appli_diagramme_alpha,
+                    md=6,
+                    style={
+                        "padding": "0 0.5vw 1vh 1vw",
+                    },
+                ),
+                dbc.Col(
+                    appli_diagramme_lambda,
+                    md=6,
+                    style={
+                        "padding": "0 1vw 1vh 0.5vw",
+                    },
+                ),
+            ],
+            style={
+                "height": "72vh",
+                "backgroundColor": "#6E8DBE",
+            },
+        ),
+        dbc.Row(
+            dbc.Col(
+                appli_simulation,
+                md=12,
+                style={"padding": "0 1vw"},
+            ),
+            style={"backgroundColor": "#6E8DBE"},
+        ),
+        dbc.Row(
+            [
+                dbc.Col(
+                    appli_diagramme_nb_variables,
+                    md=6,
+                    style={
+                        "padding": "0 0.5vw 1vh 1vw",
+                    },
+                ),
+                dbc.Col(
+                    [
+                        # STORE doit venir avant les callbacks dépendants
+                        dcc.Store(id="etat-normalisation", data=False),
+                        appli_table_coefficients,
+                    ],
+                    md=6,
+                    style={
+                        "padding": "0 1vw 1vh 0.5vw",
+                    },
+                ),
+            ],
+            style={
+                "height": "72vh",
                 "backgroundColor": "#6E8DBE",
             },
         ),
+        dbc.Row(
+            dbc.Col(
+                appli_recouvrement,
+                md=12,
+                style={"padding": "0 1vw"},
+            ),
+            style={"backgroundColor": "#6E8DBE"},
+        ),
+        dbc.Row(
+            dbc.Col(
+                appli_attribution,
+                md=12,
+                style={"padding": "0 1vw"},
+            ),
+            style={"backgroundColor": "#6E8DBE"},
+        ),
+        dbc.Row(
+            dbc.Col(
+                appli_cardinalite,
+                md=12,
+                style={"padding": "0 1vw"},
+            ),
+            style={"backgroundColor": "#6E8DBE"},
+        ),
+        dbc.Row(
+            dbc.Col(
+                appli_surface,
+                md=12,
+                style={"padding": "0 1vw"},
+            ),
+            style={"backgroundColor": "#6E8DBE"},
+        ),
+        dbc.Row(
+            dbc.Col(
+                appli_historique,
+                md=12,
+                style={"padding": "0 1vw"},
+            ),
+            style={"backgroundColor": "#6E8DBE"},
+        ),
+        dbc.Row(
+            dbc.Col(
+                appli_diagnostics,
+                md=12,
+                style={"padding": "0 1vw"},
+            ),
+            style={"backgroundColor": "#6E8DBE"},
+        ),
+        dbc.Row(
+            dbc.Col(
+                appli_bootstrap,
+                md=12,
+                style={"padding": "0 1vw"},
+            ),
+            style={"backgroundColor": "#6E8DBE"},
+        ),
         dbc.Row(
             [
                 dbc.Col(
@@ -951,11 +2145,35 @@ app.layout = dbc.Container(
 
 @callback(Output("legende-modeles", "children"), Input("filtre-modeles", "value"))
 def update_legende_modeles(selected_modeles):
-    if not selected_modeles or selected_modeles == ["all"]:
-        modeles_a_afficher = modeles
+    return construire_legende_modeles(selection_modeles(selected_modeles) or modeles)
+
+
+@callback(
+    Output("filtre-modeles", "options"),
+    Input("filtre-modeles", "search_value"),
+    State("filtre-modeles", "value"),
+)
+def rechercher_modeles(recherche, valeur):
+    # Groupes, modèles déjà choisis, puis les NB_OPTIONS premiers qui correspondent
+    if not recherche:
+        correspondants = options_individuelles[:NB_OPTIONS]
     else:
-        modeles_a_afficher = selected_modeles
-    return construire_legende_modeles(modeles_a_afficher)
+        recherche = recherche.lower()
+        correspondants = [
+            o for o in options_individuelles if recherche in o["label"].lower()
+        ][:NB_OPTIONS]
+
+    choisis = [
+        {"label": libelles_options.get(v, v), "value": v}
+        for v in (valeur or [])
+        if v != "all"
+    ]
+    deja = {o["value"] for o in choisis}
+    return (
+        options_groupes
+        + [o for o in choisis if o["value"] not in libelles_options]
+        + [o for o in correspondants if o["value"] not in deja]
+    )
 
 
 @callback(
@@ -973,22 +2191,26 @@ def reset_model_filter(n_clicks):
         Output("diag-lambda", "figure"),
         Output("diag-nb-var", "figure"),
     ],
-    [Input("filtre-modeles", "value")],
+    [Input("filtre-modeles", "value"), Input("simulation", "data")],
 )
-def update_dashboard(modele):
-
-    hyperparametres_filtre = hyperparametres.copy()
-    nb_variables_filtre = nb_variables.copy()
-
-    if modele and modele != ["all"]:
-        hyperparametres_filtre = hyperparametres_filtre[
-            hyperparametres_filtre["Modele"].isin(modele)
+def update_dashboard(modele, simulation):
+    modele = selection_modeles(modele)
+
+    # Uniquement les modèles sélectionnés
+    hyperparametres_filtre = lire_hyperparametres(run_affichee, modele)
+    nb_variables_filtre = lire_nb_variables(run_affichee, modele)
+    if modele:
+        nb_variables_filtre = nb_variables_filtre[
+            ["Action"] + [m for m in modele if m in nb_variables_filtre.columns]
         ]
 
-        # On garde uniquement les colonnes correspondantes, en vérifiant leur présence
-        colonnes_existantes = [col for col in modele if col in nb_variables.columns]
-        colonnes_a_garder = ["Action"] + colonnes_existantes
-        nb_variables_filtre = nb_variables_filtre[colonnes_a_garder]
+    # Remplacer le modèle ré-estimé par sa simulation
+    if simulation:
+        ligne = hyperparametres_filtre["Modele"] == simulation["modele"]
+        hyperparametres_filtre.loc[ligne, "alpha"] = simulation["alpha"]
+        hyperparametres_filtre.loc[ligne, "lambda"] = simulation["lambda"]
+        if simulation["modele"] in nb_variables_filtre.columns:
+            nb_variables_filtre[simulation["modele"]] = simulation["nb_variables"]
 
     diag_alpha = diagramme_hyperparametres(
         hyperparametres_filtre,
@@ -1030,21 +2252,30 @@ def toggle_normalisation(n_clicks, is_normalized):
 
 @callback(
     [
-        Output("table-coefficients", "data"),
+        Output("table-coefficients-colonnes", "data"),
         Output("table-coefficients", "columns"),
         Output("table-coefficients", "style_data_conditional"),
         Output("table-coefficients", "style_header_conditional"),
     ],
-    [Input("filtre-modeles", "value"), Input("etat-normalisation", "data")],
+    [
+        Input("filtre-modeles", "value"),
+        Input("etat-normalisation", "data"),
+        Input("simulation", "data"),
+    ],
 )
-def update_table_coefficients(selected_modeles, is_normalized):
-    filtered_data = coefficients.copy()
-
-    if selected_modeles and selected_modeles != ["all"]:
-        colonnes_a_conserver = ["Action"] + [
-            col for col in selected_modeles if col in filtered_data.columns
+def update_table_coefficients(selected_modeles, is_normalized, simulation):
+    selected_modeles = selection_modeles(selected_modeles)
+    filtered_data = lire_coefficients(run_affichee, selected_modeles)
+    if selected_modeles:
+        filtered_data = filtered_data[
+            ["Action"] + [m for m in selected_modeles if m in filtered_data.columns]
         ]
-        filtered_data = filtered_data[colonnes_a_conserver]
+
+    # Remplacer le modèle ré-estimé par sa simulation
+    if simulation and simulation["modele"] in filtered_data.columns:
+        filtered_data[simulation["modele"]] = filtered_data["Action"].map(
+            simulation["coefficients"]
+        )
 
     # Appliquer normalisation si activée
     if is_normalized:
@@ -1071,25 +2302,34 @@ def update_table_coefficients(selected_modeles, is_normalized):
                 }
             )
 
-    # Style conditionnel des données
+            # Fréquence de sélection du modèle, à droite de ses coefficients
+            if stabilite is not None and col in stabilite.columns:
+                display_data[col + SUFFIXE_STABILITE] = stabilite[col].to_numpy()
+                columns.append(
+                    {
+                        "name": "stabilité",
+                        "id": col + SUFFIXE_STABILITE,
+                        "type": "numeric",
+                        "format": Format(precision=0, scheme=Scheme.percentage),
+                    }
+                )
+
+    # Style conditionnel des données : deux règles par colonne (filter_query),
+    # évaluées dans le navigateur, y compris après un tri ou un filtre
     style_data_conditional = []
-    for i, row in display_data.iterrows():
-        for col in display_data.columns:
-            if col == "Action":
-                continue
-            try:
-                val = float(row[col])
-            except:
-                val = None
-
-            color = (
-                "#ff4d4d"
-                if (val is None or val == 0.0 or math.isnan(val))
-                else "#85e085"
-            )
-            style_data_conditional.append(
-                {"if": {"row_index": i, "column_id": col}, "backgroundColor": color}
-            )
+    for col in display_data.columns:
+        if col == "Action" or col.endswith(SUFFIXE_STABILITE):
+            continue
+        style_data_conditional += [
+            {"if": {"column_id": col}, "backgroundColor": "#85e085"},
+            {
+                "if": {
+                    "column_id": col,
+                    "filter_query": f"{{{col}}} = 0 || {{{col}}} is blank",
+                },
+                "backgroundColor": "#ff4d4d",
+            },
+        ]
 
     # Header coloré
     style_header_conditional = [
@@ -1100,10 +2340,19 @@ def update_table_coefficients(selected_modeles, is_normalized):
         }
         for col in display_data.columns
         if col in couleurs_modeles
+    ] + [
+        {
+            "if": {"column_id": col + SUFFIXE_STABILITE},
+            "backgroundColor": couleurs_modeles[col],
+            "color": "white",
+            "fontSize": "12px",
+        }
+        for col in display_data.columns
+        if col in couleurs_modeles and col + SUFFIXE_STABILITE in display_data.columns
     ]
 
     return (
-        display_data.to_dict("records"),
+        colonnes_compactes(display_data, columns),
         columns,
         style_data_conditional,
         style_header_conditional,
@@ -1113,10 +2362,407 @@ def update_table_coefficients(selected_modeles, is_normalized):
 @callback(
     Output("bloc-performance", "children"),
     Input("filtre-modeles", "value"),
+    Input("filtre-indices", "value"),
+    Input("simulation", "data"),
+    Input("intervalles-performance", "data"),
+)
+def update_graphiques_performance(modeles_selectionnes, indices, simulation, intervalles):
+    modeles_selectionnes = selection_modeles(modeles_selectionnes)
+    performance_affichee = lire_performance(
+        run_affichee, modeles_selectionnes, indices or indices_reference[:1]
+    )
+
+    # Remplacer le modèle ré-estimé par sa simulation (face à chaque indice)
+    if simulation:
+        for indice, mesures in simulation["performance"].items():
+            ligne = (performance_affichee["Index_ETF"] == simulation["modele"]) & (
+                performance_affichee["Indice"] == indice
+            )
+            for mesure, valeur in mesures.items():
+                performance_affichee.loc[ligne, mesure] = valeur
+
+        # Les intervalles publiés ne s'appliquent plus au modèle simulé
+        if intervalles:
+            intervalles = [
+                i for i in intervalles if i["Index_ETF"] != simulation["modele"]
+            ]
+
+    return generer_graphiques_performance(
+        performance_affichee, modeles_selectionnes, intervalles
+    )
+
+
+@callback(
+    Output("intervalles-performance", "data"),
+    Input("bootstrap-lancer", "n_clicks"),
+    background=True,
+    running=[
+        (Output("bootstrap-lancer", "disabled"), True, False),
+        (Output("bootstrap-annuler", "disabled"), False, True),
+    ],
+    cancel=[Input("bootstrap-annuler", "n_clicks")],
+    progress=[
+        Output("bootstrap-progression", "value"),
+        Output("bootstrap-progression", "label"),
+    ],
+    cache_args_to_ignore=[0],
+    prevent_initial_call=True,
+)
+def lancer_bootstrap(set_progress, n_clicks):
+    return intervalles_bootstrap(set_progress, NB_REPLICATIONS, tuple(indices_reference))
+
+
+@callback(
+    Output("diag-historique", "figure"),
+    Output("table-historique-colonnes", "data"),
+    Output("table-historique", "columns"),
+    Input("filtre-modeles", "value"),
+    Input("historique-date", "value"),
+)
+def update_historique(selected_modeles, indice_date):
+    selected_modeles = selection_modeles(selected_modeles)
+    if not dates_historique:
+        raise PreventUpdate
+
+    date_selectionnee = dates_historique[indice_date]
+    nb_variables_affiche = lire_nb_variables_historique(run_affichee, selected_modeles)
+    coefficients_date = lire_historique(
+        run_affichee, date_selectionnee, selected_modeles
+    )
+
+    # Coefficients à la date choisie : une ligne par action, une colonne par modèle
+    table = coefficients_date.pivot(
+        index="Action", columns="Modele", values="coefficient"
+    ).reset_index()
+    columns = [{"name": "Action", "id": "Action"}] + [
+        {
+            "name": col,
+            "id": col,
+            "type": "numeric",
+            "format": Format(precision=2, scheme="e"),
+        }
+        for col in table.columns
+        if col != "Action"
+    ]
+
+    return (
+        diagramme_historique(nb_variables_affiche, date_selectionnee),
+        colonnes_compactes(table, columns),
+        columns,
+    )
+
+
+@callback(
+    Output("diag-recouvrement", "figure"),
+    Input("filtre-modeles", "value"),
+    Input("recouvrement-mesure", "value"),
+)
+def update_recouvrement(selected_modeles, mesure):
+    selected_modeles = selection_modeles(selected_modeles)
+    matrice = matrices_recouvrement[mesure]
+    if selected_modeles:
+        selected_modeles = [m for m in selected_modeles if m in matrice.index]
+        matrice = matrice.loc[selected_modeles, selected_modeles]
+    return diagramme_recouvrement(matrice, mesure)
+
+
+@callback(
+    Output("table-diagnostics-colonnes", "data"),
+    Input("diagnostic-groupe", "value"),
+    Input("diagnostic-retard", "value"),
+)
+def update_table_diagnostics(groupe, retard):
+    resultat = diagnostics(
+        series_diagnostics[groupe],
+        nb_retards_diagnostics,
+        empreintes_diagnostics[groupe],
+    )
+    return colonnes_compactes(tableau_ljung_box(resultat, retard), colonnes_diagnostics)
+
+
+@callback(
+    Output("diag-autocorrelation", "figure"),
+    Input("diagnostic-groupe", "value"),
+    Input("table-diagnostics", "active_cell"),
+    State("table-diagnostics", "derived_viewport_data"),
+)
+def update_autocorrelation(groupe, cellule, lignes):
+    resultat = diagnostics(
+        series_diagnostics[groupe],
+        nb_retards_diagnostics,
+        empreintes_diagnostics[groupe],
+    )
+
+    # Série de la ligne cliquée (après tri et filtre), l'indice répliqué par défaut
+    serie = indices_reference[0]
+    if cellule and lignes and cellule["row"] < len(lignes):
+        serie = lignes[cellule["row"]]["Serie"]
+    if serie not in resultat["acf"].columns:
+        serie = resultat["acf"].columns[0]
+
+    return diagramme_autocorrelation(resultat, serie)
+
+
+@callback(
+    Output("attribution-modele", "value"),
+    Input("filtre-modeles", "value"),
+    prevent_initial_call=True,
+)
+def synchroniser_attribution(selected_modeles):
+    # Le modèle analysé suit le premier modèle sélectionné dans l'en-tête
+    selected_modeles = selection_modeles(selected_modeles)
+    if not selected_modeles:
+        raise PreventUpdate
+    return selected_modeles[0]
+
+
+@callback(
+    Output("diag-attribution", "figure"),
+    Output("attribution-statut", "children"),
+    Input("attribution-modele", "value"),
+    Input("attribution-fin", "value"),
+    Input("simulation", "data"),
+)
+def update_attribution(modele, indice_fin, simulation):
+    if risque_actif is None or not modele:
+        raise PreventUpdate
+
+    # Coefficients publiés, ou ceux de la simulation si elle porte sur ce modèle
+    if simulation and simulation["modele"] == modele:
+        poids = pd.Series(simulation["coefficients"])
+    else:
+        poids = lire_coefficients(run_affichee, [modele]).set_index("Action")[modele]
+
+    debut = time.perf_counter()
+    risque = risque_actif.fenetre_risque(fins_fenetres[indice_fin])
+    attribution, erreur_suivi = risque_actif.attribution(
+        poids, fins_fenetres[indice_fin]
+    )
+    duree = (time.perf_counter() - debut) * 1000
+
+    statut = [
+        f"Fenêtre : {risque['debut']:%d/%m/%Y} – {risque['fin']:%d/%m/%Y}",
+        html.Br(),
+        f"Rétrécissement Ledoit-Wolf : {risque['intensite']:.3f}",
+        html.Br(),
+        f"Calcul : {duree:.0f} ms",
+    ]
+    return diagramme_attribution(attribution, erreur_suivi, modele), statut
+
+
+@callback(
+    Output("cardinalite-k", "min"),
+    Output("cardinalite-k", "max"),
+    Output("cardinalite-k", "marks"),
+    Output("cardinalite-k", "value"),
+    Input("cardinalite-modele", "value"),
+    State("cardinalite-k", "value"),
+)
+def bornes_cardinalite(modele, k):
+    if not modele:
+        raise PreventUpdate
+
+    # Bornes : plus petit et plus grand nombre d'actions atteints sur le chemin
+    # (un Ridge ne descend jamais sous quelques centaines d'actions)
+    nb_variables = lire_chemin(run_affichee, modele)["nb_variables"]
+    k_min = max(int(nb_variables[nb_variables > 0].min()), 1)
+    k_max = int(nb_variables.max())
+    pas = max(10, round((k_max - k_min) / 10, -1))
+    marques = {x: str(x) for x in range(k_min, k_max + 1, int(pas))}
+    return k_min, k_max, marques, min(max(k or k_max, k_min), k_max)
+
+
+@callback(
+    Output("diag-cardinalite", "figure"),
+    Output("table-cardinalite-colonnes", "data"),
+    Output("cardinalite-statut", "children"),
+    Input("cardinalite-modele", "value"),
+    Input("cardinalite-k", "value"),
+)
+def update_cardinalite(modele, k):
+    if not modele or not k:
+        raise PreventUpdate
+
+    debut = time.perf_counter()
+    point, poids = lire_portefeuille(run_affichee, modele, k)
+    if point is None:
+        raise PreventUpdate
+    chemin = lire_chemin(run_affichee, modele)
+    duree = (time.perf_counter() - debut) * 1000
+
+    poids["poids"] = poids["coefficient"] / poids["coefficient"].sum()
+    table = poids[["Action", "poids", "coefficient"]]
+
+    statut = [
+        html.B(f"K ≤ {k} : {int(point['nb_variables'])} actions"),
+        html.Br(),
+        f"λ = {point['lambda']:.2e}, erreur de suivi {point['Tracking_Error']:.4f}",
+        html.Br(),
+        f"Ratio d'information {point['Information_Ratio']:.3f}, "
+        f"bêta {point['Beta']:.3f}",
+        html.Br(),
+        f"Lecture : {duree:.0f} ms",
+    ]
+    return (
+        diagramme_cardinalite(chemin, point, modele),
+        colonnes_compactes(table, colonnes_cardinalite),
+        statut,
+    )
+
+
+@callback(
+    Output("surface-alpha", "options"),
+    Output("surface-alpha", "value"),
+    Input("surface-modele", "value"),
+    State("surface-alpha", "value"),
+)
+def alphas_surface(modele, alpha):
+    if not modele or surfaces is None:
+        raise PreventUpdate
+
+    alphas = [float(a) for a in surfaces.alphas(modele)]
+    options = [{"label": f"{a:.2f}", "value": a} for a in alphas]
+    return options, alpha if alpha in alphas else alphas[len(alphas) // 2]
+
+
+@callback(
+    Output("diag-surface", "figure"),
+    Output("surface-statut", "children"),
+    Input("surface-modele", "value"),
+    Input("surface-mesure", "value"),
+    Input("surface-vue", "value"),
+    Input("surface-alpha", "value"),
+    Input("diag-surface", "relayoutData"),
+)
+def update_surface(modele, mesure, vue, alpha, relayout):
+    if not modele or surfaces is None or alpha is None:
+        raise PreventUpdate
+
+    debut = time.perf_counter()
+    if vue == "moyenne":
+        surface = surfaces.surface_moyenne(modele, mesure)
+    else:
+        surface = surfaces.tuile(
+            modele,
+            mesure,
+            alpha,
+            fenetre_zoom(relayout, "xaxis"),
+            fenetre_zoom(relayout, "yaxis"),
+        )
+    duree = (time.perf_counter() - debut) * 1000
+
+    statut = [
+        html.B(f"Niveau {surface['niveau']}"),
+        f" : {surface['z'].size} cellules, lecture {duree:.0f} ms",
+    ]
+    return diagramme_surface(surface, modele, mesure, vue, alpha), statut
+
+
+@callback(
+    Output("simulation-alpha", "value"),
+    Output("simulation-lambda", "value"),
+    Input("simulation-modele", "value"),
+    Input("simulation-reset", "n_clicks"),
+)
+def initialiser_curseurs(modele, n_clicks):
+    if not modele:
+        return None, None
+
+    # Hyperparamètres retenus par la validation croisée
+    choix = lire_hyperparametres(run_affichee, [modele]).set_index("Modele").loc[modele]
+    return float(choix["alpha"]), round(math.log10(choix["lambda"]), 2)
+
+
+@callback(
+    Output("simulation-alpha", "value", allow_duplicate=True),
+    Output("simulation-lambda", "value", allow_duplicate=True),
+    Input("simulation-cv", "n_clicks"),
+    State("simulation-modele", "value"),
+    background=True,
+    running=[
+        (Output("simulation-cv", "disabled"), True, False),
+        (Output("simulation-annuler", "disabled"), False, True),
+    ],
+    cancel=[Input("simulation-annuler", "n_clicks")],
+    progress=[
+        Output("simulation-progression", "value"),
+        Output("simulation-progression", "label"),
+    ],
+    cache_args_to_ignore=[0],
+    prevent_initial_call=True,
+)
+def lancer_validation_croisee(set_progress, n_clicks, modele):
+    if reestimation is None or not modele:
+        raise PreventUpdate
+
+    # Les curseurs se placent sur l'optimum, ce qui déclenche la ré-estimation
+    alpha, lambda_ = valider_modele(set_progress, modele)
+    return alpha, round(math.log10(lambda_), 2)
+
+
+@callback(
+    Output("simulation", "data"),
+    Output("simulation-statut", "children"),
+    Input("simulation-modele", "value"),
+    Input("simulation-alpha", "value"),
+    Input("simulation-lambda", "value"),
+    prevent_initial_call=True,
 )
-def update_graphiques_performance(modeles_selectionnes):
-    return generer_graphiques_performance(performance, modeles_selectionnes)
+def update_simulation(modele, alpha, log_lambda):
+    if reestimation is None or not modele or alpha is None or log_lambda is None:
+        return None, "Choisissez un modèle pour le ré-estimer"
+
+    # Pas de simulation tant que les curseurs sont sur l'ajustement publié
+    choix = lire_hyperparametres(run_affichee, [modele]).set_index("Modele").loc[modele]
+    if math.isclose(alpha, choix["alpha"]) and math.isclose(
+        log_lambda, round(math.log10(choix["lambda"]), 2)
+    ):
+        return None, f"{modele} : ajustement publié"
+
+    debut = time.perf_counter()
+    simulation = simuler_modele(modele, alpha, 10**log_lambda)
+    duree = (time.perf_counter() - debut) * 1000
+
+    statut = [
+        html.B(modele),
+        html.Br(),
+        f"{simulation['nb_variables']} variables, erreur de suivi "
+        f"{simulation['performance'][indices_reference[0]]['Tracking_Error']:.4f}",
+        html.Br(),
+        f"Ré-estimation : {duree:.0f} ms",
+    ]
+    return simulation, statut
+
+
+# =================================================================================
+#                        Compatibilité (ancien point d'entrée)
+# =================================================================================
+
+# Les déploiements existants pointent sur "thesis_data_visualization:server".
+# Le serveur n'est créé qu'à la lecture de cet attribut (PEP 562) : importer le
+# tableau de bord (ce que fait thesis_app au premier usage) ne construit aucune
+# application. L'application reçoit directement la mise en page de ce module,
+# sans repasser par l'import différé de thesis_app.
+
+_serveur = None
+
+
+def creer_app_tableau():
+    from thesis_app import creer_app
+
+    app = creer_app()
+    app.layout = layout
+    return app
+
+
+def __getattr__(nom):
+    global _serveur
+    if nom == "server":
+        if _serveur is None:
+            _serveur = creer_app_tableau().server
+        return _serveur
+    raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
 
 
 if __name__ == "__main__":
-    app.run(debug=True, port=8888, jupyter_mode="external")
+    creer_app_tableau().run(debug=True, port=8888, jupyter_mode="external")
@@ -0,0 +1,146 @@
+# Standard libraries
+import hashlib
+import os
+
+# Data manipulation
+import numpy as np
+import pandas as pd
+
+# Statistique de Ljung-Box et p-valeurs du khi-deux
+from statsmodels.tsa.stattools import q_stat
+
+
+# =================================================================================
+#             Diagnostics des séries de rendements (ACF, PACF, Ljung-Box)
+# =================================================================================
+
+# Version matricielle de la section 1.9 de thesis.qmd (compute_autocorrelation,
+# compute_lb_test) : toutes les colonnes de la matrice des rendements sont
+# traitées en une fois.
+#   - ACF : transformée de Fourier de chaque colonne centrée (complétée par des
+#     zéros pour éviter le repliement), |F|², transformée inverse ; même
+#     estimateur que forecast::Acf (dénominateur n) ;
+#   - PACF : récursion de Durbin-Levinson, vectorisée sur les colonnes ;
+#   - Ljung-Box : Q(h) = n (n + 2) sum_{k <= h} rho_k² / (n - k) pour tous les
+#     retards h (statsmodels q_stat sur les autocorrélations déjà calculées),
+#     p-valeur du khi-deux à h degrés de liberté.
+# Les résultats sont mis en cache (mémoire puis disque) par empreinte des données,
+# calculée une fois au chargement des séries (empreinte_rendements).
+
+REPERTOIRE_DIAGNOSTICS = "data/cache/diagnostics"
+SEUIL_LJUNG_BOX = 0.1
+
+cache_diagnostics = {}
+
+
+def nb_retards_defaut(n):
+    return round(np.sqrt(n))
+
+
+def acf_fft(R, nb_retards):
+    # R : (T x k), sans valeurs manquantes ; renvoie (nb_retards + 1) x k
+    R = np.asarray(R, dtype=np.float64)
+    T = R.shape[0]
+    centre = R - R.mean(axis=0)
+
+    taille = 1 << int(np.ceil(np.log2(2 * T - 1)))
+    spectre = np.fft.rfft(centre, n=taille, axis=0)
+    autocovariances = np.fft.irfft(spectre * spectre.conj(), n=taille, axis=0)
+    autocovariances = autocovariances[: nb_retards + 1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return autocovariances / autocovariances[0]
+
+
+def pacf_durbin_levinson(acf):
+    # acf : (nb_retards + 1) x k, acf[0] = 1 ; renvoie nb_retards x k (retards 1..)
+    nb_retards = acf.shape[0] - 1
+    pacf = np.empty((nb_retards, acf.shape[1]))
+    phi = np.zeros((0, acf.shape[1]))
+
+    for h in range(1, nb_retards + 1):
+        numerateur = acf[h] - (phi * acf[h - 1 : 0 : -1]).sum(axis=0)
+        denominateur = 1 - (phi * acf[1:h]).sum(axis=0)
+        phi_hh = numerateur / denominateur
+        phi = np.vstack([phi - phi_hh * phi[::-1], phi_hh])
+        pacf[h - 1] = phi_hh
+
+    return pacf
+
+
+def ljung_box(acf, n):
+    # Statistiques et p-valeurs pour les retards 1..nb_retards : nb_retards x k
+    resultats = [q_stat(colonne, n) for colonne in acf[1:].T]
+    q = np.column_stack([statistiques for statistiques, _ in resultats])
+    p_valeurs = np.column_stack([p for _, p in resultats])
+    return q, p_valeurs
+
+
+# -----------------------------------------
+# Point d'entrée (mis en cache)
+# -----------------------------------------
+
+
+def empreinte_rendements(rendements):
+    # À calculer une fois, au chargement des séries (coût : lecture complète)
+    empreinte = hashlib.sha1()
+    empreinte.update(np.ascontiguousarray(rendements.to_numpy(dtype=np.float64)))
+    empreinte.update("|".join(map(str, rendements.columns)).encode())
+    return empreinte.hexdigest()
+
+
+def diagnostics(rendements, nb_retards=None, empreinte=None):
+    # rendements : DataFrame dates x séries ; empreinte : empreinte_rendements
+    # de ces séries (recalculée si absente)
+    n = len(rendements)
+    nb_retards = nb_retards_defaut(n) if nb_retards is None else nb_retards
+    if empreinte is None:
+        empreinte = empreinte_rendements(rendements)
+    cle = f"{empreinte}-{nb_retards}"
+
+    if cle in cache_diagnostics:
+        return cache_diagnostics[cle]
+
+    chemin = os.path.join(REPERTOIRE_DIAGNOSTICS, f"{cle}.npz")
+    if os.path.exists(chemin):
+        with np.load(chemin) as fichier:
+            tableaux = dict(fichier)
+    else:
+        acf = acf_fft(rendements.to_numpy(), nb_retards)
+        q, p_valeurs = ljung_box(acf, n)
+        tableaux = {
+            "acf": acf[1:],
+            "pacf": pacf_durbin_levinson(acf),
+            "q": q,
+            "p_valeurs": p_valeurs,
+        }
+        os.makedirs(REPERTOIRE_DIAGNOSTICS, exist_ok=True)
+        np.savez(chemin, **tableaux)
+
+    # Tableaux retards x séries
+    retards = pd.Index(np.arange(1, nb_retards + 1), name="retard")
+    resultat = {
+        nom: pd.DataFrame(valeurs, index=retards, columns=rendements.columns)
+        for nom, valeurs in tableaux.items()
+    }
+    resultat["n"] = n
+    resultat["ic"] = 1.96 / np.sqrt(n)  # seuil de confiance à 95 %
+    cache_diagnostics[cle] = resultat
+    return resultat
+
+
+def tableau_ljung_box(resultat, retard, seuil=SEUIL_LJUNG_BOX):
+    # Une ligne par série au retard choisi (équivalent de compute_lb_test)
+    tableau = pd.DataFrame(
+        {
+            "Serie": resultat["q"].columns,
+            "X_squared": resultat["q"].loc[retard].to_numpy(),
+            "df": retard,
+            "p_value": resultat["p_valeurs"].loc[retard].to_numpy(),
+            "acf_1": resultat["acf"].loc[1].to_numpy(),
+        }
+    )
+    tableau["decision"] = np.where(
+        tableau["p_value"] < seuil, "Reject H0", "Fail to reject H0"
+    )
+    return tableau
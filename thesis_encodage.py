@@ -0,0 +1,93 @@
+# Standard libraries
+import re
+
+# Data manipulation
+import numpy as np
+
+
+# =================================================================================
+#                 Encodage compact des réponses des callbacks
+# =================================================================================
+
+# Les tables reçoivent leurs données colonne par colonne ({colonne: [valeurs]})
+# dans un dcc.Store ; une fonction JavaScript (assets/encodage.js) les remet en
+# lignes pour la DataTable dans le navigateur. Les noms de colonnes ne sont
+# plus répétés à chaque ligne.
+# Les nombres sont arrondis à la précision de leur format d'affichage
+# (spécificateur d3 de dash_table.Format) : ".2e" -> 3 chiffres significatifs,
+# ".4f" -> 4 décimales, ".0%" -> 2 décimales. Le texte de la table est
+# inchangé, la réponse ne transporte plus les 17 chiffres des CSV.
+# La compression (gzip, brotli) est négociée par Flask-Compress (compress=True
+# dans thesis_app.py).
+
+MOTIF_SPECIFICATEUR = re.compile(r"\.(\d+)([efgrs%])")
+
+
+def chiffres_format(format_colonne):
+    # Format (objet ou dict) -> ("decimales" | "significatifs", nombre) ou None
+    if format_colonne is None:
+        return None
+    if hasattr(format_colonne, "to_plotly_json"):
+        format_colonne = format_colonne.to_plotly_json()
+    correspondance = MOTIF_SPECIFICATEUR.search(format_colonne.get("specifier", ""))
+    if correspondance is None:
+        return None
+
+    precision, type_format = int(correspondance[1]), correspondance[2]
+    if type_format == "f":
+        return "decimales", precision
+    if type_format == "%":
+        return "decimales", precision + 2
+    if type_format == "e":
+        return "significatifs", precision + 1
+    return "significatifs", max(precision, 1)
+
+
+def arrondir_decimales(valeurs, decimales):
+    # Quotient exact par une puissance de 10 : le flottant obtenu est le plus
+    # proche du décimal arrondi, sa représentation JSON est donc la plus courte
+    echelle = 10.0**decimales
+    return np.round(valeurs * echelle) / echelle
+
+
+def arrondir_significatifs(valeurs, chiffres):
+    resultat = np.array(valeurs, dtype=np.float64)
+    finies = np.isfinite(resultat) & (resultat != 0)
+    exposants = np.floor(np.log10(np.abs(resultat[finies]))).astype(int)
+    decimales = chiffres - 1 - exposants
+
+    x = resultat[finies]
+    positives = decimales >= 0
+    # 10 ** d exact jusqu'à d = 22 : au-delà (valeurs < 1e-22), valeur conservée
+    exactes = positives & (decimales <= 22)
+    echelle = 10.0 ** decimales[exactes]
+    x[exactes] = np.round(x[exactes] * echelle) / echelle
+    echelle = 10.0 ** -decimales[~positives]
+    x[~positives] = np.round(x[~positives] / echelle) * echelle
+    resultat[finies] = x
+    return resultat
+
+
+def arrondir(valeurs, format_colonne):
+    chiffres = chiffres_format(format_colonne)
+    if chiffres is None:
+        return valeurs
+    mode, nombre = chiffres
+    if mode == "decimales":
+        return arrondir_decimales(np.asarray(valeurs, dtype=np.float64), nombre)
+    return arrondir_significatifs(valeurs, nombre)
+
+
+def colonnes_compactes(data, columns):
+    # data : DataFrame ; columns : définitions de colonnes de la DataTable
+    formats = {c["id"]: c.get("format") for c in columns if c.get("type") == "numeric"}
+    compactes = {}
+    for colonne in data.columns:
+        valeurs = data[colonne]
+        if colonne in formats:
+            valeurs = arrondir(valeurs.to_numpy(dtype=np.float64), formats[colonne])
+            # NaN -> null (cellule vide)
+            compactes[colonne] = [None if np.isnan(v) else v for v in valeurs.tolist()]
+        else:
+            compactes[colonne] = valeurs.where(valeurs.notna(), None).tolist()
+    return compactes
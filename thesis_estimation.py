@@ -0,0 +1,725 @@
+# Standard libraries
+import math
+from collections import OrderedDict
+
+# Data manipulation
+import numpy as np
+import pandas as pd
+
+
+# =================================================================================
+#                             Chargement des données
+# =================================================================================
+
+# Rendements logarithmiques exportés par thesis.qmd (section 2.1) :
+# une colonne "date", une colonne "S&P 500" puis une colonne par action
+
+CHEMIN_RENDEMENTS = "data/returns.csv"
+
+
+def charger_rendements(chemin=CHEMIN_RENDEMENTS):
+    rendements = pd.read_csv(chemin, parse_dates=["date"], index_col="date")
+    y = rendements.pop("S&P 500")
+    return rendements, y
+
+
+# =================================================================================
+#                        Grilles d'hyperparamètres
+# =================================================================================
+
+# Mêmes grilles que thesis.qmd (section 2.1)
+
+GRILLE_LAMBDA = 10 ** np.linspace(-7, -2, 100)
+GRILLE_ALPHA = np.round(np.arange(0.05, 0.951, 0.05), 2)
+
+
+def grille(alphas, lambdas=GRILLE_LAMBDA):
+    return pd.DataFrame(
+        [(alpha, lambda_) for alpha in alphas for lambda_ in lambdas],
+        columns=["alpha", "lambda"],
+    )
+
+
+# =================================================================================
+#                       Découpage temporel (rolling origin)
+# =================================================================================
+
+# Équivalent de caret::createTimeSlices(fixedWindow = TRUE) :
+# deux plis consécutifs ne diffèrent que de (saut + 1) lignes
+
+
+def decoupages_temporels(n, fenetre_initiale=504, horizon=21, saut=20):
+    debuts = range(0, n - fenetre_initiale - horizon + 1, saut + 1)
+    return [
+        (
+            (debut, debut + fenetre_initiale),
+            (debut + fenetre_initiale, debut + fenetre_initiale + horizon),
+        )
+        for debut in debuts
+    ]
+
+
+# =================================================================================
+#                     Moments glissants (X'X, X'y, moyennes)
+# =================================================================================
+
+# Les sommes brutes sont mises à jour par ajout/retrait de k lignes (rang k) :
+# déplacer la fenêtre coûte O(k·p²) au lieu de O(n·p²).
+# Un recalcul complet est forcé périodiquement pour borner la dérive numérique.
+
+
+class MomentsGlissants:
+    def __init__(self, X, y, recalcul_periodique=100):
+        self.X = np.ascontiguousarray(X, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.recalcul_periodique = recalcul_periodique
+
+        self.debut = 0
+        self.fin = 0
+        self.nb_mises_a_jour = 0
+        self._reinitialiser()
+
+    def _reinitialiser(self):
+        p = self.X.shape[1]
+        self.xtx = np.zeros((p, p))
+        self.xty = np.zeros(p)
+        self.somme_x = np.zeros(p)
+        self.somme_y = 0.0
+        self.yty = 0.0
+        self._standardise = None
+
+    def _accumuler(self, debut, fin, signe):
+        if fin <= debut:
+            return
+        Xk = self.X[debut:fin]
+        yk = self.y[debut:fin]
+        self.xtx += signe * (Xk.T @ Xk)
+        self.xty += signe * (Xk.T @ yk)
+        self.somme_x += signe * Xk.sum(axis=0)
+        self.somme_y += signe * yk.sum()
+        self.yty += signe * (yk @ yk)
+
+    # -----------------------------------------
+    # Déplacement de la fenêtre [debut, fin)
+    # -----------------------------------------
+
+    def positionner(self, debut, fin):
+        if (debut, fin) == (self.debut, self.fin):
+            return self
+
+        chevauchement = debut < self.fin and self.debut < fin
+        cout_incremental = abs(debut - self.debut) + abs(fin - self.fin)
+
+        if (
+            not chevauchement
+            or cout_incremental >= fin - debut
+            or self.nb_mises_a_jour >= self.recalcul_periodique
+        ):
+            self._reinitialiser()
+            self._accumuler(debut, fin, +1)
+            self.nb_mises_a_jour = 0
+        else:
+            # Lignes entrantes
+            self._accumuler(debut, self.debut, +1)
+            self._accumuler(self.fin, fin, +1)
+            # Lignes sortantes
+            self._accumuler(self.debut, debut, -1)
+            self._accumuler(fin, self.fin, -1)
+            self.nb_mises_a_jour += 1
+
+        self.debut, self.fin = debut, fin
+        self._standardise = None
+        return self
+
+    @property
+    def n(self):
+        return self.fin - self.debut
+
+    # -----------------------------------------
+    # Moments standardisés (convention glmnet : variance en 1/n)
+    # -----------------------------------------
+
+    def standardise(self):
+        if self._standardise is None:
+            n = self.n
+            moyennes = self.somme_x / n
+            moyenne_y = self.somme_y / n
+            variances = np.maximum(np.diag(self.xtx) / n - moyennes**2, 0.0)
+            ecarts = np.sqrt(variances)
+            ecarts[ecarts == 0] = 1.0
+
+            # Matrice de corrélation C et covariances X/y réduites c
+            C = (self.xtx / n - np.outer(moyennes, moyennes)) / np.outer(ecarts, ecarts)
+            c = (self.xty / n - moyennes * moyenne_y) / ecarts
+            variance_y = self.yty / n - moyenne_y**2
+            ecart_y = math.sqrt(max(variance_y, 0.0)) or 1.0
+
+            self._standardise = {
+                "C": C,
+                "c": c,
+                "moyennes": moyennes,
+                "ecarts": ecarts,
+                "moyenne_y": moyenne_y,
+                "variance_y": variance_y,
+                "ecart_y": ecart_y,  # mise à l'échelle du terme L2 (glmnet)
+            }
+        return self._standardise
+
+
+# =================================================================================
+#                 Elastic Net non négatif sur la matrice de Gram
+# =================================================================================
+
+# Minimise, sur les variables standardisées et sous contrainte beta >= 0 :
+#   1/2 beta'C beta - c'beta
+#     + lambda * sum(pf * ((1 - alpha)/(2 s_y) beta² + alpha beta))
+# c'est-à-dire l'objectif de glmnet(lower.limits = 0, standardize = TRUE) : la
+# famille gaussienne ajuste y / s_y avec lambda / s_y (s_y : écart-type de y en
+# 1/n), ce qui, ramené à l'échelle de y, divise le seul terme L2 par s_y.
+# Descente par coordonnées avec mises à jour « covariance » et ensemble actif :
+# on converge sur les variables non nulles, puis seules les variables nulles qui
+# violent les conditions KKT (test vectorisé) sont balayées. Avec un démarrage
+# à chaud, le coût dépend du nombre de variables qui entrent ou sortent.
+
+
+def facteurs_penalite(facteurs, p):
+    if facteurs is None:
+        return np.ones(p)
+    facteurs = np.asarray(facteurs, dtype=np.float64)
+    return facteurs * p / facteurs.sum()
+
+
+def enet_positif(
+    C,
+    c,
+    lambda_,
+    alpha,
+    facteurs=None,
+    beta=None,
+    ecart_y=1.0,
+    tol=1e-7,
+    max_iter=100_000,
+):
+    p = len(c)
+    pf = facteurs_penalite(facteurs, p)
+    l1 = lambda_ * alpha * pf
+    diagonale = np.diag(C) + lambda_ * (1 - alpha) * pf / ecart_y
+
+    beta = np.zeros(p) if beta is None else np.array(beta, dtype=np.float64)
+    gradient = c - C @ beta  # corrélations résiduelles
+    seuil = tol * max(float(np.max(c**2)), np.finfo(float).tiny)
+
+    def balayage(indices):
+        ecart_max = 0.0
+        for j in indices:
+            ancien = beta[j]
+            z = gradient[j] + C[j, j] * ancien
+            nouveau = max(0.0, (z - l1[j]) / diagonale[j])
+            if nouveau != ancien:
+                delta = nouveau - ancien
+                gradient[:] -= delta * C[j]  # C symétrique : ligne contiguë
+                beta[j] = nouveau
+                ecart_max = max(ecart_max, diagonale[j] * delta * delta)
+        return ecart_max
+
+    iterations = 0
+    while iterations < max_iter:
+        # Convergence sur l'ensemble actif
+        while iterations < max_iter:
+            iterations += 1
+            if balayage(np.flatnonzero(beta)) < seuil:
+                break
+
+        # Variables nulles violant les conditions KKT : elles doivent entrer
+        violation = gradient - l1
+        entrantes = np.flatnonzero(
+            (beta == 0) & (violation > 0) & (violation**2 / diagonale >= seuil)
+        )
+        if entrantes.size == 0:
+            break
+        iterations += 1
+        balayage(entrantes)
+
+    return beta
+
+
+# -----------------------------------------
+# Ajustement sur une fenêtre de moments
+# -----------------------------------------
+
+
+def ajuster(moments, lambda_, alpha, facteurs=None, beta=None):
+    s = moments.standardise()
+    beta = enet_positif(s["C"], s["c"], lambda_, alpha, facteurs, beta, s["ecart_y"])
+    coefficients = beta / s["ecarts"]
+    intercept = s["moyenne_y"] - s["moyennes"] @ coefficients
+    return intercept, coefficients, beta
+
+
+# Chemin de régularisation (lambda décroissant, démarrages à chaud)
+
+
+def chemin_enet(moments, lambdas, alpha, facteurs=None, beta=None):
+    s = moments.standardise()
+    resultats = []
+    for lambda_ in sorted(lambdas, reverse=True):
+        beta = enet_positif(
+            s["C"], s["c"], lambda_, alpha, facteurs, beta, s["ecart_y"]
+        )
+        coefficients = beta / s["ecarts"]
+        intercept = s["moyenne_y"] - s["moyennes"] @ coefficients
+        resultats.append((lambda_, intercept, coefficients, beta.copy()))
+    return resultats
+
+
+# =================================================================================
+#                 Filtrage DC-SIS (corrélation de distance)
+# =================================================================================
+
+# Équivalent de VariableScreening::screenIID(method = "DC-SIS") : les actions
+# sont classées par corrélation de distance (statistique V) avec l'indice et
+# les `taille` premières sont retenues.
+# La matrice de distances de y est doublement centrée (B) une fois ; pour
+# chaque action, seule la covariance exige les n² distances |x_i - x_k|
+# (sum a∘B = sum A∘B, B étant centrée), calculées par blocs d'actions pour
+# borner la mémoire. La variance de distance de x se déduit des moyennes de
+# lignes (tri puis sommes cumulées) et de la somme des carrés : O(n log n).
+
+TAILLE_BLOC_DCSIS = 16
+
+
+def centrer_distances(a):
+    # a : (n, n) distances -> double centrage
+    return a - a.mean(axis=0) - a.mean(axis=1)[:, None] + a.mean()
+
+
+def variances_distance(X):
+    # mean(A²) = mean(a²) - 2 mean(ā_i²) + ā² pour chaque colonne de X
+    n = len(X)
+    ordre = np.argsort(X, axis=0)
+    tries = np.take_along_axis(X, ordre, axis=0)
+    cumul = np.cumsum(tries, axis=0) - tries  # sommes strictement inférieures
+    rangs = np.arange(n)[:, None]
+    sommes_lignes = tries * (2 * rangs - n) + tries.sum(axis=0) - 2 * cumul
+    moyennes_lignes = sommes_lignes / n
+
+    carres = 2 * (n * (X**2).sum(axis=0) - X.sum(axis=0) ** 2) / n**2
+    return (
+        carres
+        - 2 * (moyennes_lignes**2).mean(axis=0)
+        + moyennes_lignes.mean(axis=0) ** 2
+    )
+
+
+def correlations_distance(X, y, taille_bloc=TAILLE_BLOC_DCSIS):
+    B = centrer_distances(np.abs(y[:, None] - y[None, :])).ravel()
+    variance_y = B @ B / len(B)
+
+    XT = np.ascontiguousarray(X.T)
+    covariances = np.empty(X.shape[1])
+    for debut in range(0, X.shape[1], taille_bloc):
+        Xk = XT[debut : debut + taille_bloc]
+        a = np.abs(Xk[:, :, None] - Xk[:, None, :]).reshape(len(Xk), -1)
+        covariances[debut : debut + taille_bloc] = a @ B / len(B)
+
+    return rapport_distance(covariances, variances_distance(X), variance_y)
+
+
+def rapport_distance(covariances, variances_x, variance_y):
+    # dCor = sqrt(dCov² / sqrt(dVar²(x) dVar²(y))), 0 pour une série constante
+    denominateurs = np.sqrt(variances_x * variance_y)
+    return np.sqrt(
+        np.divide(
+            covariances,
+            denominateurs,
+            out=np.zeros_like(covariances),
+            where=denominateurs > 0,
+        ).clip(min=0)
+    )
+
+
+def selection_dcsis(correlations, taille):
+    # Indices (croissants) des `taille` actions les plus liées à l'indice
+    rangs = np.argsort(-correlations, kind="stable")
+    return np.sort(rangs[:taille])
+
+
+def ecran_dcsis(X, y, taille):
+    return selection_dcsis(correlations_distance(X, y), taille)
+
+
+# -----------------------------------------
+# Version glissante (ré-estimations successives)
+# -----------------------------------------
+
+# Statistique V écrite avec les sommes de lignes r_i = sum_k |x_i - x_k| :
+#   dCov² = S_ab / n² + (S_a / n²)(S_b / n²) - 2 / n³ sum_i r_i s_i
+# (S_a : somme des distances, S_ab : sum a_ik b_ik, s_i : sommes de lignes de y ;
+# même forme pour les variances avec S_a²). Ajouter ou retirer une ligne met
+# ces sommes à jour en un passage sur la fenêtre (n x p) : décaler la fenêtre
+# de k lignes coûte O(k n p) au lieu de O(n² p). Comme MomentsGlissants, un
+# recalcul complet est forcé périodiquement pour borner la dérive numérique.
+
+
+class CorrelationsDistanceGlissantes:
+    def __init__(self, X, y, recalcul_periodique=20):
+        self.X = np.ascontiguousarray(X, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.recalcul_periodique = recalcul_periodique
+
+        self.debut = 0
+        self.fin = 0
+        self.nb_mises_a_jour = 0
+        self._reinitialiser()
+
+    def _reinitialiser(self):
+        T, p = self.X.shape
+        self.lignes_x = np.zeros((T, p))  # r_i, lignes de la fenêtre seulement
+        self.lignes_y = np.zeros(T)
+        self.somme_a = np.zeros(p)
+        self.somme_a2 = np.zeros(p)
+        self.somme_ab = np.zeros(p)
+        self.somme_b = 0.0
+        self.somme_b2 = 0.0
+
+    def _basculer(self, j, debut, fin, signe):
+        # Ajoute (+1) ou retire (-1) la ligne j face aux lignes [debut, fin)
+        a = np.abs(self.X[debut:fin] - self.X[j])
+        b = np.abs(self.y[debut:fin] - self.y[j])
+        self.lignes_x[debut:fin] += signe * a
+        self.lignes_y[debut:fin] += signe * b
+        self.lignes_x[j] = a.sum(axis=0) if signe > 0 else 0.0
+        self.lignes_y[j] = b.sum() if signe > 0 else 0.0
+        self.somme_a += 2 * signe * a.sum(axis=0)
+        self.somme_a2 += 2 * signe * (a**2).sum(axis=0)
+        self.somme_ab += 2 * signe * (b @ a)
+        self.somme_b += 2 * signe * b.sum()
+        self.somme_b2 += 2 * signe * (b @ b)
+
+    # -----------------------------------------
+    # Déplacement de la fenêtre [debut, fin)
+    # -----------------------------------------
+
+    def positionner(self, debut, fin):
+        if (debut, fin) == (self.debut, self.fin):
+            return self
+
+        chevauchement = debut < self.fin and self.debut < fin
+        cout_incremental = abs(debut - self.debut) + abs(fin - self.fin)
+
+        if (
+            not chevauchement
+            or cout_incremental >= fin - debut
+            or self.nb_mises_a_jour >= self.recalcul_periodique
+        ):
+            self._reinitialiser()
+            for j in range(debut, fin):
+                self._basculer(j, debut, j, +1)
+            self.nb_mises_a_jour = 0
+        else:
+            d, f = self.debut, self.fin
+            # Lignes entrantes (fin puis début), puis lignes sortantes
+            for j in range(f, fin):
+                self._basculer(j, d, j, +1)
+            f = max(f, fin)
+            for j in range(d - 1, debut - 1, -1):
+                self._basculer(j, j + 1, f, +1)
+            d = min(d, debut)
+            for j in range(d, debut):
+                self._basculer(j, j + 1, f, -1)
+            for j in range(f - 1, fin - 1, -1):
+                self._basculer(j, debut, j, -1)
+            self.nb_mises_a_jour += 1
+
+        self.debut, self.fin = debut, fin
+        return self
+
+    def correlations(self):
+        n = self.fin - self.debut
+        r = self.lignes_x[self.debut : self.fin]
+        s = self.lignes_y[self.debut : self.fin]
+        moyenne_a = self.somme_a / n**2
+        moyenne_b = self.somme_b / n**2
+        covariances = self.somme_ab / n**2 + moyenne_a * moyenne_b - 2 * (s @ r) / n**3
+        variances_x = (
+            self.somme_a2 / n**2 + moyenne_a**2 - 2 * (r**2).sum(axis=0) / n**3
+        )
+        variance_y = self.somme_b2 / n**2 + moyenne_b**2 - 2 * (s @ s) / n**3
+        return rapport_distance(covariances, variances_x, variance_y)
+
+    def ecran(self, taille):
+        return selection_dcsis(self.correlations(), taille)
+
+
+# =================================================================================
+#                    Validation croisée temporelle (rolling origin)
+# =================================================================================
+
+# Même sortie que model$results de caret::train : moyenne et écart-type
+# de RMSE, Rsquared et MAE sur les plis, pour chaque couple (alpha, lambda).
+# Les moments sont déplacés d'un pli à l'autre au lieu d'être recalculés.
+
+
+def metriques_pli(y_test, prevision):
+    erreur = y_test - prevision
+    if np.std(prevision) > 0 and np.std(y_test) > 0:
+        rsquared = np.corrcoef(y_test, prevision)[0, 1] ** 2
+    else:
+        rsquared = math.nan
+    return {
+        "RMSE": math.sqrt(np.mean(erreur**2)),
+        "Rsquared": rsquared,
+        "MAE": np.mean(np.abs(erreur)),
+    }
+
+
+def resultats_plis(moments, plis, grille, facteurs=None, progression=None):
+    alphas = sorted(set(grille["alpha"]))
+    lignes = []
+    for pli, ((debut, fin), (debut_test, fin_test)) in enumerate(plis, start=1):
+        moments.positionner(debut, fin)
+        X_test = moments.X[debut_test:fin_test]
+        y_test = moments.y[debut_test:fin_test]
+        for alpha in alphas:
+            lambdas = grille.loc[grille["alpha"] == alpha, "lambda"]
+            for lambda_, intercept, coefficients, _ in chemin_enet(
+                moments, lambdas, alpha, facteurs
+            ):
+                prevision = intercept + X_test @ coefficients
+                lignes.append(
+                    {
+                        "fold": pli,
+                        "alpha": alpha,
+                        "lambda": lambda_,
+                        **metriques_pli(y_test, prevision),
+                    }
+                )
+        if progression is not None:
+            progression(pli, len(plis))
+    return pd.DataFrame(lignes)
+
+
+def agreger_plis(resultats):
+    agregats = resultats.groupby(["alpha", "lambda"])[["RMSE", "Rsquared", "MAE"]]
+    moyennes = agregats.mean()
+    ecarts = agregats.std().add_suffix("SD")
+    return moyennes.join(ecarts).reset_index()
+
+
+def validation_croisee(X, y, grille, facteurs=None, plis=None, progression=None):
+    moments = MomentsGlissants(X, y)
+    if plis is None:
+        plis = decoupages_temporels(len(moments.y))
+    resultats = agreger_plis(
+        resultats_plis(moments, plis, grille, facteurs, progression)
+    )
+    meilleur = resultats.loc[resultats["RMSE"].idxmin(), ["alpha", "lambda"]]
+    return resultats, meilleur
+
+
+# =================================================================================
+#                 Ré-estimation interactive (simulation « what-if »)
+# =================================================================================
+
+# Données standardisées et matrice de Gram de l'échantillon complet calculées une
+# seule fois ; chaque modèle travaille sur le sous-bloc de son univers (actions à
+# coefficient non manquant : 240 actions pour les modèles DC-SIS).
+# Chaque ré-estimation démarre à chaud depuis la solution en cache la plus proche
+# dans le plan (alpha, log10 lambda) ; l'ajustement publié sert de première graine.
+
+
+class ReestimationInteractive:
+    def __init__(self, X, y, coefficients, hyperparametres, pilotes, taille_cache=256):
+        # X : rendements des actions (T x p), y : rendements de l'indice,
+        # coefficients : une colonne "Action" puis une colonne par modèle,
+        # hyperparametres : colonnes "Modele", "alpha", "lambda",
+        # pilotes : modèle adaptatif -> modèle Ridge fournissant les poids
+        self.actions = list(X.columns)
+        self.X = X.to_numpy(dtype=np.float64)
+        self.moments = MomentsGlissants(self.X, y).positionner(0, len(self.X))
+        self.coefficients = coefficients.set_index("Action").reindex(self.actions)
+        self.hyperparametres = hyperparametres.set_index("Modele")
+        self.pilotes = pilotes
+        self.taille_cache = taille_cache
+
+        self._univers = {}
+        self._solutions = {}
+
+        # Univers (sous-blocs de C, pénalités, graines) de tous les modèles
+        # construits dès le chargement : la première ré-estimation d'un modèle
+        # n'en paie plus le coût
+        for modele in self.coefficients.columns:
+            if modele in self.hyperparametres.index:
+                self.univers(modele)
+
+    # -----------------------------------------
+    # Sous-problème d'un modèle (mis en cache)
+    # -----------------------------------------
+
+    def univers(self, modele):
+        if modele not in self._univers:
+            s = self.moments.standardise()
+            indices = np.flatnonzero(self.coefficients[modele].notna().to_numpy())
+
+            facteurs = None
+            if modele in self.pilotes:
+                ridge = self.coefficients[self.pilotes[modele]].to_numpy()[indices]
+                facteurs = 1 / (np.abs(np.nan_to_num(ridge)) + 1e-5)
+
+            self._univers[modele] = {
+                "indices": indices,
+                "C": np.ascontiguousarray(s["C"][np.ix_(indices, indices)]),
+                "c": s["c"][indices],
+                "moyennes": s["moyennes"][indices],
+                "ecarts": s["ecarts"][indices],
+                "ecart_y": s["ecart_y"],
+                "facteurs": facteurs,
+            }
+
+            # Graine : ajustement publié, ramené à l'échelle standardisée
+            publie = self.coefficients[modele].to_numpy()[indices]
+            self._solutions[modele] = OrderedDict()
+            self._memoriser(
+                modele,
+                float(self.hyperparametres.loc[modele, "alpha"]),
+                float(self.hyperparametres.loc[modele, "lambda"]),
+                np.nan_to_num(publie) * self._univers[modele]["ecarts"],
+            )
+        return self._univers[modele]
+
+    def _memoriser(self, modele, alpha, lambda_, beta):
+        solutions = self._solutions[modele]
+        solutions[(alpha, lambda_)] = beta
+        solutions.move_to_end((alpha, lambda_))
+        while len(solutions) > self.taille_cache:
+            solutions.popitem(last=False)
+
+    def _plus_proche(self, modele, alpha, lambda_):
+        log_lambda = math.log10(lambda_)
+        cle = min(
+            self._solutions[modele],
+            key=lambda k: (k[0] - alpha) ** 2 + (math.log10(k[1]) - log_lambda) ** 2,
+        )
+        return cle, self._solutions[modele][cle]
+
+    # -----------------------------------------
+    # Ré-estimation
+    # -----------------------------------------
+
+    def reestimer(self, modele, alpha, lambda_):
+        u = self.univers(modele)
+        cle, beta = self._plus_proche(modele, alpha, lambda_)
+
+        if cle != (alpha, lambda_):
+            beta = enet_positif(
+                u["C"], u["c"], lambda_, alpha, u["facteurs"], beta, u["ecart_y"]
+            )
+            self._memoriser(modele, alpha, lambda_, beta)
+
+        coefficients = np.full(len(self.actions), np.nan)
+        coefficients[u["indices"]] = beta / u["ecarts"]
+        return pd.Series(coefficients, index=self.actions, name=modele)
+
+    # Spécification d'un modèle (hyperparamètres retenus, univers, pénalités).
+    # Univers et pénalités publiés viennent de l'échantillon complet ; pour une
+    # ré-estimation hors échantillon, taille_ecran (univers réduit par DC-SIS)
+    # et pilote (spécification du Ridge pilote de l'Adaptive Lasso) permettent
+    # de les recalculer sur chaque fenêtre. Le pilote garde les hyperparamètres
+    # publiés de son modèle (Ridge, ou Ridge DC-SIS pour l'Adaptive Lasso
+    # DC-SIS) : thesis.qmd choisit le lambda du pilote par validation croisée
+    # dans chaque pli, ce qui n'est pas refait fenêtre par fenêtre.
+
+    def specification(self, modele):
+        u = self.univers(modele)
+        pilote = self.pilotes.get(modele)
+        return {
+            "alpha": float(self.hyperparametres.loc[modele, "alpha"]),
+            "lambda": float(self.hyperparametres.loc[modele, "lambda"]),
+            "indices": u["indices"],
+            "facteurs": u["facteurs"],
+            "taille_ecran": (
+                len(u["indices"]) if len(u["indices"]) < len(self.actions) else None
+            ),
+            "pilote": None if pilote is None else self.specification(pilote),
+        }
+
+    # Validation croisée complète sur l'univers du modèle (univers fixe : le
+    # filtrage DC-SIS pli par pli reste fait dans thesis.qmd)
+
+    def valider(self, modele, grille, progression=None):
+        u = self.univers(modele)
+        return validation_croisee(
+            self.X[:, u["indices"]],
+            self.moments.y,
+            grille,
+            u["facteurs"],
+            progression=progression,
+        )
+
+    # Rendements logarithmiques quotidiens de l'ETF (poids normalisés à 1)
+
+    def rendements_etf(self, coefficients):
+        poids = np.nan_to_num(coefficients.to_numpy())
+        total = poids.sum()
+        if total == 0:
+            return np.zeros(len(self.X))
+        return self.X @ (poids / total)
+
+    # Contrôle face aux coefficients publiés : chaque modèle est ré-estimé sans
+    # graine aux hyperparamètres retenus ; écart maximal rapporté au plus grand
+    # coefficient publié (relatif)
+
+    def ecarts_publies(self):
+        ecarts = {}
+        for modele in self._univers:
+            u = self._univers[modele]
+            spec = self.specification(modele)
+            beta = enet_positif(
+                u["C"],
+                u["c"],
+                spec["lambda"],
+                spec["alpha"],
+                u["facteurs"],
+                ecart_y=u["ecart_y"],
+            )
+            publie = np.nan_to_num(self.coefficients[modele].to_numpy()[u["indices"]])
+            echelle = max(np.abs(publie).max(), np.finfo(float).tiny)
+            ecarts[modele] = np.abs(beta / u["ecarts"] - publie).max() / echelle
+        return pd.Series(ecarts, name="ecart_relatif")
+
+
+TOLERANCE_PUBLIEE = 1e-3
+
+
+if __name__ == "__main__":
+    import sys
+
+    from thesis_registre import RegistreModeles
+    from thesis_resultats import (
+        lire_coefficients,
+        lire_hyperparametres,
+        lire_modeles,
+        ouvrir_resultats,
+        run_recente,
+    )
+
+    # python thesis_estimation.py : coefficients publiés (glmnet) reproduits à
+    # partir de data/returns.csv et des hyperparamètres retenus
+    ouvrir_resultats()
+    run = run_recente()
+    hyperparametres = lire_hyperparametres(run)
+    registre = RegistreModeles.depuis_tables(lire_modeles(run), hyperparametres)
+    rendements_actions, rendements_indice = charger_rendements()
+    reestimation = ReestimationInteractive(
+        rendements_actions,
+        rendements_indice,
+        lire_coefficients(run),
+        hyperparametres,
+        pilotes=registre.pilotes(),
+    )
+
+    ecarts = reestimation.ecarts_publies()
+    for modele, ecart in ecarts.items():
+        print(f"{modele:<30} écart relatif maximal {ecart:.2e}")
+    if (ecarts > TOLERANCE_PUBLIEE).any():
+        sys.exit(f"Écart supérieur à {TOLERANCE_PUBLIEE:.0e} avec coefficients.csv")
@@ -0,0 +1,255 @@
+# Standard libraries
+from concurrent.futures import ProcessPoolExecutor
+
+# Data manipulation
+import numpy as np
+import pandas as pd
+
+
+# =================================================================================
+#                       Mesures de performance (vectorisées)
+# =================================================================================
+
+# Mêmes définitions que PerformanceAnalytics (thesis.qmd, section 3.2.3) :
+#   Active_Return     = ActiveReturn(Ra, Rb)
+#   Tracking_Error    = TrackingError(Ra, Rb)
+#   Information_Ratio = InformationRatio(Ra, Rb)
+#   Correlation_SP500 = cor(Ra, Rb)
+#   Beta              = CAPM.beta(Ra, Rb, Rf)
+#   Jensen_Alpha      = mean(CAPM.jensenAlpha(Ra, Rb, Rf))
+#
+# Les séries sont des rendements arithmétiques quotidiens, l'axe -2 est le temps :
+#   Ra : (..., T, M) ETF, Rf : (..., T) taux sans risque,
+#   Rb : (..., T) un indice -> mesures (..., M)
+#        (..., T, N) N indices -> mesures (..., N, M), tous les couples en une passe
+#
+# Chaque série n'est centrée qu'une fois : les mesures des N x M couples se
+# déduisent des moments d'ordre 2 partagés (sommes de carrés de Ra, Rb et Rf,
+# produits croisés Rb' Ra en un seul produit matriciel). Un indice de plus
+# coûte une colonne de Rb, pas un nouveau passage sur les ETF.
+
+PERIODES_PAR_AN = 252
+
+MESURES = [
+    "Tracking_Error",
+    "Active_Return",
+    "Information_Ratio",
+    "Correlation_SP500",
+    "Beta",
+    "Jensen_Alpha",
+]
+
+
+def rendement_annualise(R, periodes=PERIODES_PAR_AN):
+    return np.exp(np.log1p(R).mean(axis=-2) * periodes) - 1
+
+
+def moments_centres(R, Rf):
+    # Écarts à la moyenne, sommes de carrés et produits croisés avec Rf
+    R_c = R - R.mean(axis=-2, keepdims=True)
+    return R_c, (R_c**2).sum(axis=-2), (R_c * Rf).sum(axis=-2)
+
+
+def mesures_performance(Ra, Rb, Rf, periodes=PERIODES_PAR_AN):
+    Ra = np.asarray(Ra, dtype=np.float64)
+    Rb = np.asarray(Rb, dtype=np.float64)
+    Rf = np.asarray(Rf, dtype=np.float64)[..., None]
+    un_indice = Rb.ndim < Ra.ndim
+    if un_indice:
+        Rb = Rb[..., None]
+    T = Ra.shape[-2]
+
+    # Rendements annualisés (géométriques) : (..., M), (..., N)
+    annualise_a = rendement_annualise(Ra, periodes)[..., None, :]
+    annualise_b = rendement_annualise(Rb, periodes)[..., :, None]
+    moyenne_rf = Rf.mean(axis=-2)[..., None]
+
+    # Moments partagés
+    Rf_c = Rf - Rf.mean(axis=-2, keepdims=True)
+    Ra_c, saa, saf = moments_centres(Ra, Rf_c)
+    Rb_c, sbb, sbf = moments_centres(Rb, Rf_c)
+    sff = (Rf_c**2).sum(axis=-2)[..., None]
+    sab = np.swapaxes(Rb_c, -1, -2) @ Ra_c  # (..., N, M)
+    saa, saf = saa[..., None, :], saf[..., None, :]
+    sbb, sbf = sbb[..., :, None], sbf[..., :, None]
+
+    # Erreur de suivi : var(Ra - Rb) = var(Ra) + var(Rb) - 2 cov(Ra, Rb)
+    variance_ecart = np.maximum(saa + sbb - 2 * sab, 0) / (T - 1)
+    tracking_error = np.sqrt(variance_ecart * periodes)
+    active_return = annualise_a - annualise_b
+
+    # Corrélation, puis bêta sur rendements excédentaires (Ra - Rf, Rb - Rf)
+    correlation = sab / np.sqrt(saa * sbb)
+    beta = (sab - saf - sbf + sff) / (sbb - 2 * sbf + sff)
+    # CAPM.jensenAlpha retranche la série quotidienne Rf (non annualisée) aux
+    # rendements annualisés, thesis.qmd en prend la moyenne : d'où mean(Rf).
+    # Annualiser Rf s'écarte de performance.csv (voir ecarts_publies)
+    jensen_alpha = annualise_a - moyenne_rf - beta * (annualise_b - moyenne_rf)
+
+    mesures = {
+        "Tracking_Error": tracking_error,
+        "Active_Return": active_return,
+        "Information_Ratio": active_return / tracking_error,
+        "Correlation_SP500": correlation,
+        "Beta": beta,
+        "Jensen_Alpha": jensen_alpha,
+    }
+    if un_indice:
+        mesures = {mesure: valeurs[..., 0, :] for mesure, valeurs in mesures.items()}
+    return mesures
+
+
+def performance_indices(series, indices, Rf, periodes=PERIODES_PAR_AN):
+    # series : DataFrame dates x séries (ETF et indices), indices : colonnes de
+    # référence, Rf : Series -> une ligne par couple (Indice, Index_ETF)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mesures = mesures_performance(
+            series.to_numpy(), series[indices].to_numpy(), Rf.to_numpy(), periodes
+        )
+    tableau = pd.DataFrame(
+        {mesure: valeurs.ravel() for mesure, valeurs in mesures.items()},
+        index=pd.MultiIndex.from_product(
+            [indices, series.columns], names=["Indice", "Index_ETF"]
+        ),
+    )
+
+    # Indice face à lui-même : pas d'erreur de suivi (convention de thesis.qmd)
+    identiques = (
+        tableau.index.get_level_values(0) == tableau.index.get_level_values(1)
+    )
+    tableau.loc[identiques, ["Tracking_Error", "Information_Ratio"]] = np.nan
+    return tableau.reset_index()
+
+
+# ---------------------------------------------------------------------------------
+# Contrôle face aux valeurs publiées (performance.csv, PerformanceAnalytics)
+# ---------------------------------------------------------------------------------
+
+TOLERANCE_PUBLIEE = 1e-5
+
+
+def ecarts_publies(series, indice, Rf, publiees, periodes=PERIODES_PAR_AN):
+    # publiees : performance.csv indexé par Index_ETF -> écart absolu maximal
+    # par mesure entre ce module et thesis.qmd, sur les séries communes
+    calculees = performance_indices(series, [indice], Rf, periodes).set_index(
+        "Index_ETF"
+    )
+    communes = calculees.index.intersection(publiees.index)
+    ecarts = (calculees.loc[communes, MESURES] - publiees.loc[communes, MESURES]).abs()
+    return ecarts.max()
+
+
+# =================================================================================
+#                 Bootstrap par blocs stationnaire (Politis-Romano)
+# =================================================================================
+
+# Les lignes (indices, ETF, Rf) sont rééchantillonnées ensemble, par blocs de
+# longueur géométrique (moyenne longueur_bloc) pour préserver la dépendance
+# temporelle. Chaque lot de réplications est un tableau d'indices (B x T) : les
+# mesures de tous les modèles face à tous les indices sont recalculées en une
+# passe vectorisée (B x T x M, Rb : B x T ou B x T x N), les lots étant
+# répartis entre processus.
+
+
+def indices_bootstrap(generateur, nb_replications, T, longueur_bloc):
+    positions = np.arange(T)
+
+    # Début d'un nouveau bloc avec probabilité 1 / longueur_bloc
+    nouveau_bloc = generateur.random((nb_replications, T)) < 1 / longueur_bloc
+    nouveau_bloc[:, 0] = True
+    debut_bloc = np.maximum.accumulate(np.where(nouveau_bloc, positions, 0), axis=1)
+
+    # Chaque bloc commence à une date tirée au hasard et se prolonge circulairement
+    departs = generateur.integers(0, T, size=(nb_replications, T))
+    depart_bloc = np.take_along_axis(departs, debut_bloc, axis=1)
+    return (depart_bloc + positions - debut_bloc) % T
+
+
+def _lot_bootstrap(arguments):
+    Ra, Rb, Rf, nb_replications, longueur_bloc, graine = arguments
+    generateur = np.random.default_rng(graine)
+    indices = indices_bootstrap(generateur, nb_replications, len(Rb), longueur_bloc)
+    return mesures_performance(Ra[indices], Rb[indices], Rf[indices])
+
+
+def bootstrap_mesures(
+    Ra,
+    Rb,
+    Rf,
+    nb_replications=2000,
+    longueur_bloc=None,
+    graine=2103,
+    taille_lot=250,
+    nb_processus=None,
+    progression=None,
+):
+    Ra = np.asarray(Ra, dtype=np.float64)
+    Rb = np.asarray(Rb, dtype=np.float64)
+    Rf = np.asarray(Rf, dtype=np.float64)
+    if longueur_bloc is None:
+        longueur_bloc = max(1, round(len(Rb) ** (1 / 3)))
+
+    # Lots indépendants (graines dérivées), reproductibles quel que soit le
+    # nombre de processus
+    tailles = [
+        min(taille_lot, nb_replications - debut)
+        for debut in range(0, nb_replications, taille_lot)
+    ]
+    graines = np.random.SeedSequence(graine).spawn(len(tailles))
+    lots = [
+        (Ra, Rb, Rf, taille, longueur_bloc, g) for taille, g in zip(tailles, graines)
+    ]
+
+    resultats = []
+    with ProcessPoolExecutor(max_workers=nb_processus) as executeur:
+        for i, resultat in enumerate(executeur.map(_lot_bootstrap, lots), start=1):
+            resultats.append(resultat)
+            if progression is not None:
+                progression(i, len(lots))
+
+    return {
+        mesure: np.concatenate([r[mesure] for r in resultats]) for mesure in MESURES
+    }
+
+
+def intervalles_confiance(replications, modeles, niveau=0.95, indices=None):
+    # Intervalles par percentiles : une ligne par modèle (par couple
+    # (Indice, Index_ETF) si les réplications portent sur plusieurs indices),
+    # colonnes <mesure>_inf/_sup
+    queues = [(1 - niveau) / 2 * 100, (1 + niveau) / 2 * 100]
+    colonnes = {}
+    for mesure, valeurs in replications.items():
+        bornes = np.nanpercentile(valeurs, queues, axis=0)
+        colonnes[f"{mesure}_inf"] = bornes[0].ravel()
+        colonnes[f"{mesure}_sup"] = bornes[1].ravel()
+    if indices is None:
+        index = pd.Index(modeles, name="Index_ETF")
+    else:
+        index = pd.MultiIndex.from_product(
+            [indices, modeles], names=["Indice", "Index_ETF"]
+        )
+    return pd.DataFrame(colonnes, index=index)
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+
+    from thesis_resultats import REPERTOIRE_CSV, identifiant
+
+    # python thesis_performance.py [répertoire des CSV] : mesures recalculées
+    # face au S&P 500, comparées à celles exportées par thesis.qmd
+    repertoire = sys.argv[1] if len(sys.argv) > 1 else REPERTOIRE_CSV
+    rendements = pd.read_csv(os.path.join(repertoire, "data_performance.csv"))
+    series = rendements.set_index("date").rename(columns=identifiant).dropna()
+    publiees = pd.read_csv(os.path.join(repertoire, "performance.csv"))
+    publiees = publiees.set_index(publiees["Index_ETF"].map(identifiant))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ecarts = ecarts_publies(
+            series.drop(columns="rf"), "sp500", series["rf"], publiees
+        )
+    for mesure, ecart in ecarts.items():
+        print(f"{mesure:<18} écart maximal {ecart:.2e}")
+    if (ecarts > TOLERANCE_PUBLIEE).any():
+        sys.exit(f"Écart supérieur à {TOLERANCE_PUBLIEE:.0e} avec performance.csv")
@@ -0,0 +1,190 @@
+# Standard libraries
+import colorsys
+import hashlib
+from collections import defaultdict
+
+# Grilles de thesis.qmd
+from thesis_estimation import GRILLE_ALPHA
+
+
+# =================================================================================
+#                       Registre des modèles (découvert des données)
+# =================================================================================
+
+# Les identifiants exportés par thesis.qmd suivent une grammaire :
+#   <famille>[_dcsis]   avec famille dans ridge, lasso, en1, en2, adlasso
+# d'où l'on déduit libellé, famille, présélection, alpha de la validation
+# croisée et modèle pilote (Adaptive Lasso). Tout nouvel identifiant apparaît
+# dans le registre dès qu'il est importé, sans modifier le code ; un identifiant
+# inconnu garde son nom comme libellé.
+# Les couleurs sont déterministes : palette du mémoire pour les dix modèles
+# publiés, teinte dérivée de l'identifiant (angle d'or) pour les autres.
+
+FAMILLES = {
+    "ridge": {"famille": "Ridge", "alphas": [0]},
+    "lasso": {"famille": "Lasso", "alphas": [1]},
+    "en1": {"famille": "Elastic Net", "alphas": [0.5], "precision": " (α = 0.5)"},
+    "en2": {"famille": "Elastic Net", "alphas": list(GRILLE_ALPHA)},
+    "adlasso": {"famille": "Adaptive Lasso", "alphas": [1], "pilote": "ridge"},
+}
+
+PRESELECTIONS = {"dcsis": "DC-SIS"}
+
+# Indices de référence (même univers d'actions) : le premier est l'indice
+# répliqué. Un indice exporté par thesis.qmd sans entrée ici garde son nom
+# comme identifiant et comme libellé.
+INDICES_REFERENCE = {"sp500": "S&P 500"}
+
+# Séries qui ne sont pas des modèles (indices, total d'actions, taux sans risque)
+SERIES_REFERENCE = {**INDICES_REFERENCE, "stock": "Action", "rf": "Rf"}
+
+COULEURS_PUBLIEES = {
+    "ridge": "#1f77b4",  # bleu classique
+    "lasso": "#ff7f0e",  # orange
+    "en1": "#2ca02c",  # vert
+    "en2": "#d62728",  # rouge brique
+    "adlasso": "#9467bd",  # violet
+    "ridge_dcsis": "#8c564b",  # brun
+    "lasso_dcsis": "#e377c2",  # rose
+    "en1_dcsis": "#7f7f7f",  # gris
+    "en2_dcsis": "#bcbd22",  # jaune olive
+    "adlasso_dcsis": "#17becf",  # bleu turquoise
+}
+
+
+def decomposer_identifiant(identifiant):
+    prefixe, _, suffixe = identifiant.partition("_")
+    if prefixe not in FAMILLES or (suffixe and suffixe not in PRESELECTIONS):
+        return None
+    return prefixe, PRESELECTIONS.get(suffixe)
+
+
+def libelle_modele(identifiant):
+    if identifiant in SERIES_REFERENCE:
+        return SERIES_REFERENCE[identifiant]
+    decomposition = decomposer_identifiant(identifiant)
+    if decomposition is None:
+        return identifiant
+
+    prefixe, preselection = decomposition
+    libelle = FAMILLES[prefixe]["famille"]
+    if preselection:
+        libelle += f" ({preselection})"
+    return libelle + FAMILLES[prefixe].get("precision", "")
+
+
+def couleur_modele(identifiant):
+    if identifiant in COULEURS_PUBLIEES:
+        return COULEURS_PUBLIEES[identifiant]
+    graine = int.from_bytes(hashlib.sha1(identifiant.encode()).digest()[:4], "big")
+    teinte = (graine * 0.618033988749895) % 1
+    r, v, b = colorsys.hls_to_rgb(teinte, 0.45, 0.65)
+    return f"#{round(r * 255):02x}{round(v * 255):02x}{round(b * 255):02x}"
+
+
+class RegistreModeles:
+    def __init__(self, entrees):
+        # entrees : liste de dict (identifiant, libelle, famille, preselection,
+        # alpha, lambda, alphas, pilote, run, couleur), dans l'ordre d'affichage.
+        # Un libellé n'est unique qu'au sein d'une run : les entrées sont
+        # indexées par (run, libelle) et (run, identifiant) ; sans run précisée,
+        # les accès portent sur la dernière run du registre.
+        self.entrees = entrees
+        self.runs = list(dict.fromkeys(e["run"] for e in entrees))
+        self.par_cle = {(e["run"], e["libelle"]): e for e in entrees}
+        self.par_identifiant = {(e["run"], e["identifiant"]): e for e in entrees}
+
+        # Index inversés : attribut -> valeur -> clés (run, libelle)
+        self.index = defaultdict(lambda: defaultdict(list))
+        for e in entrees:
+            for attribut in ("famille", "preselection", "alpha", "run"):
+                self.index[attribut][e[attribut]].append((e["run"], e["libelle"]))
+
+    # -----------------------------------------
+    # Construction depuis la base de résultats
+    # -----------------------------------------
+
+    @classmethod
+    def depuis_tables(cls, modeles, hyperparametres):
+        # modeles : colonnes run, model, libelle (lire_modeles) ;
+        # hyperparametres : colonnes Modele, alpha, lambda (lire_hyperparametres)
+        # de la même run
+        choix = hyperparametres.set_index("Modele")
+        entrees = []
+        for run, identifiant, libelle in zip(
+            modeles["run"], modeles["model"], modeles["libelle"]
+        ):
+            if identifiant in SERIES_REFERENCE:
+                continue
+            decomposition = decomposer_identifiant(identifiant)
+            prefixe, preselection = decomposition or (None, None)
+            famille = FAMILLES.get(prefixe, {})
+
+            alpha = float(choix.loc[libelle, "alpha"]) if libelle in choix.index else None
+            # Pilote de même présélection (adlasso_dcsis -> ridge_dcsis)
+            pilote = None
+            if "pilote" in famille:
+                pilote = famille["pilote"] + identifiant[len(prefixe) :]
+
+            entrees.append(
+                {
+                    "identifiant": identifiant,
+                    "libelle": libelle,
+                    "famille": famille.get("famille", "Autre"),
+                    "preselection": preselection or "Aucune",
+                    "alpha": alpha,
+                    "lambda": (
+                        float(choix.loc[libelle, "lambda"])
+                        if libelle in choix.index
+                        else None
+                    ),
+                    "alphas": famille.get("alphas", [] if alpha is None else [alpha]),
+                    "pilote": pilote,
+                    "run": run,
+                    "couleur": couleur_modele(identifiant),
+                }
+            )
+        return cls(entrees)
+
+    @classmethod
+    def fusionner(cls, registres):
+        # Registres de plusieurs runs, dans l'ordre d'import
+        return cls([e for registre in registres for e in registre.entrees])
+
+    # -----------------------------------------
+    # Accès
+    # -----------------------------------------
+
+    def run_courante(self, run=None):
+        return self.runs[-1] if run is None else run
+
+    def entree(self, libelle, run=None):
+        return self.par_cle[(self.run_courante(run), libelle)]
+
+    def libelles(self, run=None):
+        run = self.run_courante(run)
+        return [e["libelle"] for e in self.entrees if e["run"] == run]
+
+    def couleurs(self, run=None):
+        run = self.run_courante(run)
+        return {e["libelle"]: e["couleur"] for e in self.entrees if e["run"] == run}
+
+    def rechercher(self, run=None, **criteres):
+        # Intersection des index : rechercher(famille="Lasso", preselection="DC-SIS")
+        run = self.run_courante(run)
+        resultat = set(self.index["run"].get(run, []))
+        for attribut, valeur in criteres.items():
+            resultat &= set(self.index[attribut].get(valeur, []))
+        return [l for l in self.libelles(run) if (run, l) in resultat]
+
+    def pilotes(self, run=None):
+        # Modèle adaptatif -> modèle Ridge fournissant les poids de pénalité
+        run = self.run_courante(run)
+        return {
+            e["libelle"]: self.par_identifiant[(run, e["pilote"])]["libelle"]
+            for e in self.entrees
+            if e["run"] == run and (run, e["pilote"]) in self.par_identifiant
+        }
+
+    def alphas_validation(self, libelle, run=None):
+        return self.entree(libelle, run)["alphas"]
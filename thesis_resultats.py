@@ -0,0 +1,656 @@
+# Standard libraries
+import datetime
+import hashlib
+import os
+import sqlite3
+import threading
+
+# Data manipulation
+import pandas as pd
+
+# Mesures de performance (voir thesis_performance.py)
+from thesis_performance import performance_indices
+
+# Libellés déduits des identifiants (voir thesis_registre.py)
+from thesis_registre import INDICES_REFERENCE, SERIES_REFERENCE, libelle_modele
+
+
+# =================================================================================
+#                  Base de résultats (SQLite, un fichier local)
+# =================================================================================
+
+# Les exports de thesis.qmd (CSV) sont importés dans une base SQLite, une
+# « run » par import. Les tables sont en format long et indexées par leur clé
+# primaire (WITHOUT ROWID : la table est l'index) :
+#   coefficients (run, model, stock), rendements (run, model, date),
+#   hyperparametres / nb_variables (run, model), performance (run, indice, model).
+# Les chemins de régularisation (thesis_chemins.py) s'y ajoutent :
+#   chemins (run, model, point), chemins_poids (run, model, point, stock) et
+#   l'index cardinalites (run, model, k) -> point.
+# Ils ne sont pas effacés par une réimportation : chemins_sources (run, model)
+# garde l'empreinte du contenu des fichiers dont ils sont calculés, seuls les
+# chemins dont les entrées ont changé sont invalidés (à recalculer par
+# thesis_chemins.py).
+# Les callbacks ne lisent que les modèles et colonnes affichés ; la mémoire et
+# la latence restent bornées quel que soit le nombre de runs accumulées.
+
+CHEMIN_BASE = "data/results.sqlite"
+VERSION_SCHEMA = 2  # PRAGMA user_version (2 : performance par indice)
+REPERTOIRE_CSV = "data"
+RUN_PUBLIE = "publie"
+
+FICHIERS_CSV = {
+    "coefficients": "coefficients.csv",
+    "rendements": "data_performance.csv",
+    "hyperparametres": "hyperparameters.csv",
+    "nb_variables": "nb_variables.csv",
+    "performance": "performance.csv",
+}
+
+# Entrées des chemins de régularisation (rendements des actions compris)
+FICHIERS_CHEMINS = [
+    "coefficients.csv",
+    "hyperparameters.csv",
+    "data_performance.csv",
+    "returns.csv",
+]
+
+MESURES_PERFORMANCE = [
+    "Active_Return",
+    "Beta",
+    "Correlation_SP500",
+    "Information_Ratio",
+    "Jensen_Alpha",
+    "Tracking_Error",
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    run TEXT PRIMARY KEY,
+    importe_le TEXT NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS modeles (
+    run TEXT NOT NULL,
+    model TEXT NOT NULL,
+    libelle TEXT NOT NULL,
+    ordre INTEGER NOT NULL,
+    PRIMARY KEY (run, model)
+) WITHOUT ROWID;
+CREATE UNIQUE INDEX IF NOT EXISTS modeles_libelle ON modeles (run, libelle);
+CREATE TABLE IF NOT EXISTS coefficients (
+    run TEXT NOT NULL,
+    model TEXT NOT NULL,
+    stock TEXT NOT NULL,
+    rang INTEGER NOT NULL,
+    coefficient REAL,
+    PRIMARY KEY (run, model, stock)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rendements (
+    run TEXT NOT NULL,
+    model TEXT NOT NULL,
+    date TEXT NOT NULL,
+    rendement REAL,
+    PRIMARY KEY (run, model, date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS hyperparametres (
+    run TEXT NOT NULL,
+    model TEXT NOT NULL,
+    alpha REAL,
+    lambda REAL,
+    PRIMARY KEY (run, model)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS nb_variables (
+    run TEXT NOT NULL,
+    model TEXT NOT NULL,
+    nb_variables INTEGER,
+    PRIMARY KEY (run, model)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS performance (
+    run TEXT NOT NULL,
+    indice TEXT NOT NULL,
+    model TEXT NOT NULL,
+    {", ".join(f"{mesure} REAL" for mesure in MESURES_PERFORMANCE)},
+    PRIMARY KEY (run, indice, model)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chemins (
+    run TEXT NOT NULL,
+    model TEXT NOT NULL,
+    point INTEGER NOT NULL,
+    alpha REAL,
+    lambda REAL,
+    nb_variables INTEGER,
+    {", ".join(f"{mesure} REAL" for mesure in MESURES_PERFORMANCE)},
+    PRIMARY KEY (run, model, point)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chemins_poids (
+    run TEXT NOT NULL,
+    model TEXT NOT NULL,
+    point INTEGER NOT NULL,
+    stock TEXT NOT NULL,
+    coefficient REAL,
+    PRIMARY KEY (run, model, point, stock)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cardinalites (
+    run TEXT NOT NULL,
+    model TEXT NOT NULL,
+    k INTEGER NOT NULL,
+    point INTEGER NOT NULL,
+    PRIMARY KEY (run, model, k)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS chemins_sources (
+    run TEXT NOT NULL,
+    model TEXT NOT NULL,
+    empreinte TEXT NOT NULL,
+    PRIMARY KEY (run, model)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS historique (
+    run TEXT NOT NULL,
+    date TEXT NOT NULL,
+    model TEXT NOT NULL,
+    stock TEXT NOT NULL,
+    coefficient REAL,
+    PRIMARY KEY (run, date, model, stock)
+) WITHOUT ROWID;
+"""
+
+TABLES_RUN = [
+    "modeles",
+    "coefficients",
+    "rendements",
+    "hyperparametres",
+    "nb_variables",
+    "performance",
+]
+
+# Conservées d'un import à l'autre tant que leurs entrées sont inchangées
+# (chemins_sources en dernier : les autres s'y réfèrent)
+TABLES_CHEMINS = ["chemins", "chemins_poids", "cardinalites", "chemins_sources"]
+
+
+# -----------------------------------------
+# Connexions (une par thread et par processus : workers gunicorn / callbacks)
+# -----------------------------------------
+
+# Une connexion SQLite ne doit pas traverser un fork : avec gunicorn --preload,
+# le processus maître ouvre la base avant de créer les workers, chacun rouvre
+# alors la sienne (même principe que diskcache).
+_connexions = threading.local()
+
+
+def connexion(chemin=CHEMIN_BASE):
+    if getattr(_connexions, "pid", None) != os.getpid():
+        _connexions.pid = os.getpid()
+        _connexions.ouvertes = {}
+    ouvertes = _connexions.ouvertes
+    if chemin not in ouvertes:
+        con = sqlite3.connect(chemin)
+        migrer(con)
+        con.executescript(SCHEMA)
+        con.execute(f"PRAGMA user_version = {VERSION_SCHEMA}")
+        ouvertes[chemin] = con
+    return ouvertes[chemin]
+
+
+def migrer(con):
+    # Version 1 -> 2 : les mesures publiées l'étaient face au seul S&P 500
+    version = con.execute("PRAGMA user_version").fetchone()[0]
+    existe = con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'performance'"
+    ).fetchone()
+    if version < 2 and existe:
+        with con:
+            con.execute("ALTER TABLE performance RENAME TO performance_v1")
+            con.executescript(SCHEMA)
+            mesures = ", ".join(MESURES_PERFORMANCE)
+            con.execute(
+                f"INSERT INTO performance (run, indice, model, {mesures}) "
+                f"SELECT run, 'sp500', model, {mesures} FROM performance_v1"
+            )
+            con.execute("DROP TABLE performance_v1")
+
+
+# =================================================================================
+#                               Import des CSV
+# =================================================================================
+
+
+def empreinte_contenu(chemins):
+    # Empreinte du contenu (et non de la date) des fichiers existants
+    empreinte = hashlib.sha1()
+    for chemin in chemins:
+        if os.path.exists(chemin):
+            empreinte.update(os.path.basename(chemin).encode())
+            with open(chemin, "rb") as fichier:
+                for bloc in iter(lambda: fichier.read(1 << 20), b""):
+                    empreinte.update(bloc)
+    return empreinte.hexdigest()
+
+
+def empreinte_chemins(repertoire=REPERTOIRE_CSV):
+    return empreinte_contenu(os.path.join(repertoire, f) for f in FICHIERS_CHEMINS)
+
+
+def identifiant(colonne):
+    # Colonnes de data_performance.csv : indices et "Rf" nommés par leur libellé
+    return {l: i for i, l in SERIES_REFERENCE.items()}.get(colonne, colonne)
+
+
+def performance_publiee(rendements, performance):
+    # Mesures de toutes les séries face à tous les indices, en une passe
+    # (thesis_performance.py) ; les valeurs exportées par thesis.qmd priment.
+    # Indices : ceux du registre présents dans data_performance.csv et ceux de
+    # la colonne Benchmark de performance.csv (S&P 500 si elle est absente).
+    if "Benchmark" not in performance.columns:
+        performance = performance.assign(Benchmark="sp500")
+    performance = performance.rename(
+        columns={"Benchmark": "indice", "Index_ETF": "model"}
+    )
+    performance["indice"] = performance["indice"].map(identifiant)
+    performance["model"] = performance["model"].map(identifiant)
+
+    series = rendements.set_index("date").rename(columns=identifiant)
+    indices = list(
+        dict.fromkeys(
+            [i for i in series.columns if i in INDICES_REFERENCE]
+            + [i for i in performance["indice"] if i in series.columns]
+        )
+    )
+    if "rf" in series.columns and indices:
+        series = series.dropna()
+        calculees = performance_indices(
+            series.drop(columns="rf"), indices, series["rf"]
+        ).rename(columns={"Indice": "indice", "Index_ETF": "model"})
+        performance = (
+            performance.set_index(["indice", "model"])
+            .combine_first(calculees.set_index(["indice", "model"]))
+            .reset_index()
+        )
+    return performance[["indice", "model", *MESURES_PERFORMANCE]]
+
+
+def importer_csv(repertoire=REPERTOIRE_CSV, run=RUN_PUBLIE, chemin=CHEMIN_BASE):
+    lire = lambda nom: pd.read_csv(os.path.join(repertoire, FICHIERS_CSV[nom]))
+
+    coefficients = lire("coefficients")
+    rendements = lire("rendements")
+    hyperparametres = lire("hyperparametres")
+    nb_variables = lire("nb_variables")
+    performance = lire("performance")
+
+    # Mesures face à chaque indice (avant la mise en format long des rendements)
+    performance = performance_publiee(rendements, performance)
+
+    # Format long
+    coefficients = coefficients.assign(rang=range(len(coefficients))).melt(
+        id_vars=["stock", "rang"], var_name="model", value_name="coefficient"
+    )
+    rendements = rendements.melt(
+        id_vars="date", var_name="model", value_name="rendement"
+    )
+    rendements["model"] = rendements["model"].map(identifiant)
+    nb_variables = nb_variables.melt(var_name="model", value_name="nb_variables")
+    hyperparametres = hyperparametres.rename(columns={"Model": "model"})
+
+    # Modèles rencontrés, dans l'ordre des exports
+    ordre = list(
+        dict.fromkeys(
+            ["sp500", "stock"]
+            + list(coefficients["model"])
+            + list(rendements["model"])
+            + list(performance["indice"])
+            + list(performance["model"])
+        )
+    )
+    modeles = pd.DataFrame(
+        {
+            "model": ordre,
+            "libelle": [libelle_modele(m) for m in ordre],
+            "ordre": range(len(ordre)),
+        }
+    )
+
+    con = connexion(chemin)
+    with con:
+        for table in TABLES_RUN:
+            con.execute(f"DELETE FROM {table} WHERE run = ?", (run,))
+        con.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?)",
+            (run, datetime.datetime.now().isoformat(timespec="seconds"), repertoire),
+        )
+        for table, data in [
+            ("modeles", modeles),
+            ("coefficients", coefficients),
+            ("rendements", rendements),
+            ("hyperparametres", hyperparametres),
+            ("nb_variables", nb_variables),
+            ("performance", performance),
+        ]:
+            inserer(con, table, run, data)
+        invalider_chemins(con, run, empreinte_chemins(repertoire))
+    return run
+
+
+def invalider_chemins(con, run, empreinte):
+    # Supprime les chemins calculés sur d'autres entrées que les actuelles
+    for table in TABLES_CHEMINS:
+        con.execute(
+            f"DELETE FROM {table} WHERE run = ? AND model NOT IN "
+            "(SELECT model FROM chemins_sources WHERE run = ? AND empreinte = ?)",
+            (run, run, empreinte),
+        )
+
+
+def inserer(con, table, run, data, **cles):
+    # cles : colonnes constantes ajoutées après la run (ex. model="lasso")
+    data = data.astype(object).where(data.notna(), None)
+    colonnes = ["run", *cles, *data.columns]
+    con.executemany(
+        f"INSERT INTO {table} ({', '.join(colonnes)}) "
+        f"VALUES ({', '.join('?' * len(colonnes))})",
+        [(run, *cles.values(), *ligne) for ligne in data.itertuples(index=False)],
+    )
+
+
+def enregistrer_chemin(
+    run, model, chemin, poids, cardinalites, empreinte, chemin_base=CHEMIN_BASE
+):
+    # Remplace le chemin d'un modèle (identifiant) pour une run ; empreinte :
+    # empreinte_chemins() des fichiers dont il est calculé
+    con = connexion(chemin_base)
+    with con:
+        for table, data in [
+            ("chemins", chemin),
+            ("chemins_poids", poids),
+            ("cardinalites", cardinalites),
+            ("chemins_sources", pd.DataFrame({"empreinte": [empreinte]})),
+        ]:
+            con.execute(f"DELETE FROM {table} WHERE run = ? AND model = ?", (run, model))
+            inserer(con, table, run, data, model=model)
+
+
+def enregistrer_historique(run, historique, chemin_base=CHEMIN_BASE):
+    # Remplace l'historique de la ré-estimation glissante (thesis_backtest.py)
+    # d'une run ; historique : date, Modele (libellé), Action, coefficient
+    con = connexion(chemin_base)
+    modeles = dict(
+        con.execute("SELECT libelle, model FROM modeles WHERE run = ?", (run,))
+    )
+    data = pd.DataFrame(
+        {
+            "date": pd.to_datetime(historique["date"]).dt.strftime("%Y-%m-%d"),
+            "model": historique["Modele"].map(modeles),
+            "stock": historique["Action"],
+            "coefficient": historique["coefficient"],
+        }
+    )
+    with con:
+        con.execute("DELETE FROM historique WHERE run = ?", (run,))
+        inserer(con, "historique", run, data)
+
+
+def ouvrir_resultats(repertoire=REPERTOIRE_CSV, chemin=CHEMIN_BASE):
+    # (Ré)importe les CSV publiés s'ils sont plus récents que la base
+    fichiers = [os.path.join(repertoire, f) for f in FICHIERS_CSV.values()]
+    fichiers = [f for f in fichiers if os.path.exists(f)]
+    a_jour = os.path.exists(chemin) and all(
+        os.path.getmtime(f) <= os.path.getmtime(chemin) for f in fichiers
+    )
+    if fichiers and (not a_jour or not liste_runs(chemin)):
+        importer_csv(repertoire, RUN_PUBLIE, chemin)
+    return chemin
+
+
+# =================================================================================
+#                                  Requêtes
+# =================================================================================
+
+# Les modèles sont désignés par leur libellé ; None = tous les modèles de la run
+
+
+def requete(sql, parametres=(), chemin=CHEMIN_BASE):
+    return pd.read_sql_query(sql, connexion(chemin), params=parametres)
+
+
+def filtre_modeles(modeles):
+    if modeles is None:
+        return "", []
+    modeles = list(modeles)
+    return f" AND m.libelle IN ({', '.join('?' * len(modeles))})", modeles
+
+
+def liste_runs(chemin=CHEMIN_BASE):
+    # Ordre d'import : clé entière de la table runs (INSERT OR REPLACE attribue
+    # un rowid plus grand à chaque réimportation), importe_le n'étant qu'à la
+    # seconde près
+    return list(requete("SELECT run FROM runs ORDER BY rowid", chemin=chemin)["run"])
+
+
+def run_recente(chemin=CHEMIN_BASE):
+    return liste_runs(chemin)[-1]
+
+
+def lire_modeles(run, chemin=CHEMIN_BASE):
+    # Indices de référence exclus (voir lire_indices)
+    return requete(
+        "SELECT run, model, libelle FROM modeles WHERE run = ? AND model NOT IN "
+        "(SELECT indice FROM performance WHERE run = ?) ORDER BY ordre",
+        (run, run),
+        chemin,
+    )
+
+
+def lire_indices(run, chemin=CHEMIN_BASE):
+    # Libellés des indices de référence de la run, l'indice répliqué en tête
+    return list(
+        requete(
+            "SELECT m.libelle FROM modeles m WHERE m.run = ? AND m.model IN "
+            "(SELECT indice FROM performance WHERE run = ?) ORDER BY m.ordre",
+            (run, run),
+            chemin,
+        )["libelle"]
+    )
+
+
+def lire_actions(run, chemin=CHEMIN_BASE):
+    # Actions de l'univers complet, dans l'ordre de coefficients.csv
+    return list(
+        requete(
+            "SELECT stock FROM coefficients WHERE run = ? "
+            "GROUP BY stock ORDER BY MIN(rang)",
+            (run,),
+            chemin,
+        )["stock"]
+    )
+
+
+def lire_coefficients(run, modeles=None, chemin=CHEMIN_BASE):
+    # Une ligne par action, une colonne par modèle (NaN hors de l'univers)
+    filtre, valeurs = filtre_modeles(modeles)
+    longues = requete(
+        "SELECT c.stock AS Action, c.rang, m.libelle, m.ordre, c.coefficient "
+        "FROM coefficients c JOIN modeles m ON m.run = c.run AND m.model = c.model "
+        f"WHERE c.run = ?{filtre}",
+        (run, *valeurs),
+        chemin,
+    )
+    colonnes = longues.drop_duplicates("libelle").sort_values("ordre")["libelle"]
+    large = longues.pivot(index=["rang", "Action"], columns="libelle", values="coefficient")
+    return large.reindex(columns=list(colonnes)).reset_index("Action").reset_index(
+        drop=True
+    ).rename_axis(columns=None)
+
+
+def lire_hyperparametres(run, modeles=None, chemin=CHEMIN_BASE):
+    filtre, valeurs = filtre_modeles(modeles)
+    return requete(
+        "SELECT m.libelle AS Modele, h.alpha, h.lambda "
+        "FROM hyperparametres h JOIN modeles m ON m.run = h.run AND m.model = h.model "
+        f"WHERE h.run = ?{filtre} ORDER BY m.ordre",
+        (run, *valeurs),
+        chemin,
+    )
+
+
+def lire_nb_variables(run, modeles=None, chemin=CHEMIN_BASE):
+    # Une ligne, une colonne par modèle précédée du nombre total d'actions
+    filtre, valeurs = filtre_modeles(None if modeles is None else ["Action", *modeles])
+    longues = requete(
+        "SELECT m.libelle, v.nb_variables "
+        "FROM nb_variables v JOIN modeles m ON m.run = v.run AND m.model = v.model "
+        f"WHERE v.run = ?{filtre} ORDER BY m.ordre",
+        (run, *valeurs),
+        chemin,
+    )
+    return pd.DataFrame([longues["nb_variables"].to_numpy()], columns=longues["libelle"])
+
+
+def lire_performance(run, modeles=None, indices=None, chemin=CHEMIN_BASE):
+    # Une ligne par couple (indice, série) ; indices : libellés, None = tous
+    filtre, valeurs = filtre_modeles(modeles)
+    if indices is not None:
+        indices = list(indices)
+        filtre += f" AND i.libelle IN ({', '.join('?' * len(indices))})"
+        valeurs += indices
+    return requete(
+        f"SELECT i.libelle AS Indice, m.libelle AS Index_ETF, "
+        f"{', '.join(MESURES_PERFORMANCE)} "
+        "FROM performance p JOIN modeles m ON m.run = p.run AND m.model = p.model "
+        "JOIN modeles i ON i.run = p.run AND i.model = p.indice "
+        f"WHERE p.run = ?{filtre} ORDER BY i.ordre, m.ordre",
+        (run, *valeurs),
+        chemin,
+    )
+
+
+def lire_rendements(run, modeles=None, debut=None, fin=None, chemin=CHEMIN_BASE):
+    # Une ligne par date, une colonne par série (indice, ETF, Rf)
+    filtre, valeurs = filtre_modeles(modeles)
+    if debut is not None:
+        filtre += " AND r.date >= ?"
+        valeurs.append(str(debut))
+    if fin is not None:
+        filtre += " AND r.date <= ?"
+        valeurs.append(str(fin))
+    longues = requete(
+        "SELECT r.date, m.libelle, m.ordre, r.rendement "
+        "FROM rendements r JOIN modeles m ON m.run = r.run AND m.model = r.model "
+        f"WHERE r.run = ?{filtre}",
+        (run, *valeurs),
+        chemin,
+    )
+    colonnes = longues.drop_duplicates("libelle").sort_values("ordre")["libelle"]
+    large = longues.pivot(index="date", columns="libelle", values="rendement")
+    large = large.reindex(columns=list(colonnes)).rename_axis(columns=None)
+    large.index = pd.to_datetime(large.index)
+    return large.reset_index()
+
+
+# -----------------------------------------
+# Ré-estimation glissante
+# -----------------------------------------
+
+
+def lire_dates_historique(run, chemin=CHEMIN_BASE):
+    # Dates de rééquilibrage enregistrées (liste vide sans ré-estimation)
+    dates = requete(
+        "SELECT DISTINCT date FROM historique WHERE run = ? ORDER BY date",
+        (run,),
+        chemin,
+    )["date"]
+    return list(pd.to_datetime(dates))
+
+
+def lire_nb_variables_historique(run, modeles=None, chemin=CHEMIN_BASE):
+    # Une ligne par (date, modèle) : nombre d'actions retenues
+    filtre, valeurs = filtre_modeles(modeles)
+    nb_variables = requete(
+        "SELECT h.date, m.libelle AS Modele, COUNT(*) AS Nb_variables "
+        "FROM historique h JOIN modeles m ON m.run = h.run AND m.model = h.model "
+        f"WHERE h.run = ?{filtre} GROUP BY h.date, m.model ORDER BY h.date, m.ordre",
+        (run, *valeurs),
+        chemin,
+    )
+    nb_variables["date"] = pd.to_datetime(nb_variables["date"])
+    return nb_variables
+
+
+def lire_historique(run, date, modeles=None, chemin=CHEMIN_BASE):
+    # Coefficients non nuls à une date : une ligne par (modèle, action)
+    filtre, valeurs = filtre_modeles(modeles)
+    return requete(
+        "SELECT m.libelle AS Modele, h.stock AS Action, h.coefficient "
+        "FROM historique h JOIN modeles m ON m.run = h.run AND m.model = h.model "
+        f"WHERE h.run = ? AND h.date = ?{filtre} ORDER BY m.ordre",
+        (run, pd.Timestamp(date).strftime("%Y-%m-%d"), *valeurs),
+        chemin,
+    )
+
+
+# -----------------------------------------
+# Chemins de régularisation
+# -----------------------------------------
+
+
+def lire_modeles_chemins(run, empreinte=None, chemin=CHEMIN_BASE):
+    # Modèles dont le chemin est enregistré ; avec empreinte, seulement ceux
+    # calculés sur ces entrées (returns.csv peut changer sans réimportation)
+    filtre, valeurs = "", []
+    if empreinte is not None:
+        filtre, valeurs = " AND s.empreinte = ?", [empreinte]
+    return list(
+        requete(
+            "SELECT m.libelle FROM modeles m JOIN chemins_sources s "
+            "ON s.run = m.run AND s.model = m.model "
+            f"WHERE m.run = ?{filtre} ORDER BY m.ordre",
+            (run, *valeurs),
+            chemin,
+        )["libelle"]
+    )
+
+
+def lire_chemin(run, modele, chemin=CHEMIN_BASE):
+    # Tous les points du chemin d'un modèle (libellé), lambda décroissant
+    return requete(
+        f"SELECT c.point, c.alpha, c.lambda, c.nb_variables, "
+        f"{', '.join('c.' + mesure for mesure in MESURES_PERFORMANCE)} "
+        "FROM chemins c JOIN modeles m ON m.run = c.run AND m.model = c.model "
+        "WHERE c.run = ? AND m.libelle = ? ORDER BY c.point",
+        (run, modele),
+        chemin,
+    )
+
+
+def lire_portefeuille(run, modele, k, chemin=CHEMIN_BASE):
+    # Meilleur portefeuille à au plus k actions : (point du chemin, poids)
+    # deux lectures par clé primaire (cardinalites puis chemins_poids)
+    point = requete(
+        f"SELECT c.point, c.alpha, c.lambda, c.nb_variables, "
+        f"{', '.join('c.' + mesure for mesure in MESURES_PERFORMANCE)} "
+        "FROM cardinalites k "
+        "JOIN modeles m ON m.run = k.run AND m.model = k.model "
+        "JOIN chemins c ON c.run = k.run AND c.model = k.model AND c.point = k.point "
+        "WHERE k.run = ? AND m.libelle = ? AND k.k = ?",
+        (run, modele, int(k)),
+        chemin,
+    )
+    if point.empty:
+        return None, None
+    point = point.iloc[0]
+    poids = requete(
+        "SELECT p.stock AS Action, p.coefficient "
+        "FROM chemins_poids p JOIN modeles m ON m.run = p.run AND m.model = p.model "
+        "WHERE p.run = ? AND m.libelle = ? AND p.point = ? "
+        "ORDER BY p.coefficient DESC",
+        (run, modele, int(point["point"])),
+        chemin,
+    )
+    return point, poids
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python thesis_resultats.py [répertoire des CSV] [nom de la run]
+    run = importer_csv(*sys.argv[1:3])
+    print(f"Run « {run} » importée dans {CHEMIN_BASE}")
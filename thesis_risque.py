@@ -0,0 +1,174 @@
+# Standard libraries
+import threading
+from collections import OrderedDict
+
+# Data manipulation
+import numpy as np
+import pandas as pd
+
+# Moteurs de calcul du mémoire
+from thesis_estimation import MomentsGlissants
+from thesis_performance import PERIODES_PAR_AN
+
+
+# =================================================================================
+#               Attribution de l'erreur de suivi (poids actifs)
+# =================================================================================
+
+# Erreur de suivi ex ante d'un ETF de poids w face à un portefeuille répliquant
+# l'indice w_b, sous une covariance des actions Sigma :
+#   a = w - w_b,  TE = sqrt(a' Sigma a),  contribution_i = a_i (Sigma a)_i / TE
+# Les contributions somment à TE. Sigma et w_b ne dépendent que de la fenêtre :
+# ils sont calculés une fois par fenêtre (moments glissants mis à jour de façon
+# incrémentale), puis l'attribution de n'importe quel modèle est un produit
+# matrice-vecteur.
+
+
+# -----------------------------------------
+# Covariance rétrécie (Ledoit-Wolf, cible : variance moyenne x identité)
+# -----------------------------------------
+
+
+def covariance_ledoit_wolf(xtx, somme_x, quartique, n):
+    # xtx, somme_x : moments bruts de la fenêtre ; quartique : sum_t ||x_t - m||^4
+    p = len(somme_x)
+    moyennes = somme_x / n
+    S = xtx / n - np.outer(moyennes, moyennes)
+
+    m = np.trace(S) / p
+    norme_S = np.sum(S**2)
+    d2 = (norme_S - 2 * m * np.trace(S) + p * m**2) / p
+    b2 = min(max((quartique / n - norme_S) / (n * p), 0.0), d2)
+    intensite = b2 / d2 if d2 > 0 else 1.0
+
+    covariance = (1 - intensite) * S
+    covariance[np.diag_indices(p)] += intensite * m
+    return covariance, intensite
+
+
+# -----------------------------------------
+# Portefeuille répliquant : min 1/2 w'Sigma w - s'w sous w >= 0
+# -----------------------------------------
+
+# Gradient projeté accéléré (FISTA avec redémarrage) : chaque itération est un
+# produit matrice-vecteur, et Sigma rétrécie est bien conditionnée. Démarré à
+# chaud sur la fenêtre précédente, il converge en quelques itérations.
+
+
+def moindres_carres_positifs(A, b, x=None, tol=1e-5, max_iter=5_000):
+    p = len(b)
+    x = np.zeros(p) if x is None else np.array(x, dtype=np.float64)
+
+    # Constante de Lipschitz : plus grande valeur propre (puissance itérée)
+    v = np.full(p, 1 / np.sqrt(p))
+    for _ in range(30):
+        v = A @ v
+        v /= np.linalg.norm(v)
+    pas = 1 / (1.05 * float(v @ A @ v))
+
+    z, t = x.copy(), 1.0
+    for _ in range(max_iter):
+        precedent = x
+        x = np.maximum(z - pas * (A @ z - b), 0.0)
+        ecart = x - precedent
+        if np.linalg.norm(ecart) <= tol * max(np.linalg.norm(x), np.finfo(float).tiny):
+            break
+        # Redémarrage si la direction accélérée remonte l'objectif
+        if (z - x) @ ecart > 0:
+            z, t = x.copy(), 1.0
+            continue
+        t_suivant = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        z = x + (t - 1) / t_suivant * ecart
+        t = t_suivant
+    return x
+
+
+class RisqueActif:
+    def __init__(self, X, y, fenetre=504, taille_cache=16):
+        # X : rendements arithmétiques des actions (T x p), y : ceux de l'indice
+        self.actions = list(X.columns)
+        self.dates = X.index
+        self.fenetre = fenetre
+        self.taille_cache = taille_cache
+        self.moments = MomentsGlissants(X.to_numpy(dtype=np.float64), y)
+
+        self._fenetres = OrderedDict()
+        self._indice = None  # démarrage à chaud du portefeuille répliquant
+
+        # Moments glissants, démarrage à chaud et cache sont partagés entre les
+        # callbacks (threads) : une fenêtre est positionnée et lue sous verrou
+        self._verrou = threading.Lock()
+
+    # -----------------------------------------
+    # Modèle de risque d'une fenêtre (mis en cache)
+    # -----------------------------------------
+
+    def fenetre_risque(self, fin):
+        fin = int(min(max(fin, self.fenetre), len(self.dates)))
+        with self._verrou:
+            if fin in self._fenetres:
+                self._fenetres.move_to_end(fin)
+                return self._fenetres[fin]
+
+            debut = fin - self.fenetre
+            m = self.moments.positionner(debut, fin)
+            n = m.n
+            moyennes = m.somme_x / n
+            centre = m.X[debut:fin] - moyennes
+            quartique = float(np.sum(np.einsum("tj,tj->t", centre, centre) ** 2))
+            covariance, intensite = covariance_ledoit_wolf(
+                m.xtx, m.somme_x, quartique, n
+            )
+
+            # Portefeuille répliquant (proxy de l'indice) : poids positifs
+            # minimisant la variance de l'écart à l'indice
+            covariance_indice = m.xty / n - moyennes * (m.somme_y / n)
+            self._indice = moindres_carres_positifs(
+                covariance, covariance_indice, self._indice
+            )
+            indice = self._indice / max(self._indice.sum(), np.finfo(float).tiny)
+
+            risque = {
+                "debut": self.dates[debut],
+                "fin": self.dates[fin - 1],
+                "covariance": covariance,
+                "intensite": intensite,
+                "indice": indice,
+            }
+            self._fenetres[fin] = risque
+            while len(self._fenetres) > self.taille_cache:
+                self._fenetres.popitem(last=False)
+            return risque
+
+    # -----------------------------------------
+    # Attribution d'un modèle
+    # -----------------------------------------
+
+    def attribution(self, coefficients, fin=None):
+        risque = self.fenetre_risque(len(self.dates) if fin is None else fin)
+
+        poids = np.nan_to_num(
+            pd.Series(coefficients).reindex(self.actions).to_numpy(dtype=np.float64)
+        )
+        total = poids.sum()
+        if total != 0:
+            poids = poids / total
+        actifs = poids - risque["indice"]
+
+        sigma_a = risque["covariance"] @ actifs
+        erreur_suivi = np.sqrt(max(actifs @ sigma_a, 0.0))
+        contributions = (
+            actifs * sigma_a / erreur_suivi if erreur_suivi > 0 else np.zeros_like(actifs)
+        )
+        annualisation = np.sqrt(PERIODES_PAR_AN)
+
+        return pd.DataFrame(
+            {
+                "Action": self.actions,
+                "poids": poids,
+                "poids_indice": risque["indice"],
+                "poids_actif": actifs,
+                "contribution": contributions * annualisation,
+                "part": contributions / erreur_suivi if erreur_suivi > 0 else 0.0,
+            }
+        ), erreur_suivi * annualisation
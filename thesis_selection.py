@@ -0,0 +1,331 @@
+# Data manipulation
+import numpy as np
+import pandas as pd
+
+# Moteur d'estimation
+from thesis_estimation import MomentsGlissants, decoupages_temporels, enet_positif
+
+
+# =================================================================================
+#                 Ensembles d'actions sélectionnées (bitsets)
+# =================================================================================
+
+# L'ensemble des actions retenues par un modèle (coefficient non nul) est codé
+# en bits (np.packbits), complété en mots de 64 bits. Intersections et unions
+# de toutes les paires de modèles se ramènent à des ET bit à bit suivis d'un
+# comptage des bits à 1 : M² x p / 64 opérations vectorisées.
+
+TAILLE_BLOC = 128  # lignes de la matrice traitées à la fois (mémoire bornée)
+
+
+def bitsets_selection(coefficients):
+    # coefficients : (M x p), NaN ou 0 = action non retenue
+    selection = np.nan_to_num(np.asarray(coefficients, dtype=np.float64)) != 0
+    octets = np.packbits(selection, axis=1)
+    complement = -octets.shape[1] % 8
+    octets = np.pad(octets, ((0, 0), (0, complement)))
+    return np.ascontiguousarray(octets).view(np.uint64)
+
+
+def popcount(mots):
+    # Comptage des bits à 1 par mot (méthode SWAR), numpy < 2.0
+    mots = mots - ((mots >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    mots = (mots & np.uint64(0x3333333333333333)) + (
+        (mots >> np.uint64(2)) & np.uint64(0x3333333333333333)
+    )
+    mots = (mots + (mots >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (mots * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+
+def intersections(bits):
+    M = len(bits)
+    resultat = np.empty((M, M), dtype=np.int64)
+    for debut in range(0, M, TAILLE_BLOC):
+        bloc = bits[debut : debut + TAILLE_BLOC, None, :] & bits[None, :, :]
+        resultat[debut : debut + TAILLE_BLOC] = popcount(bloc).sum(axis=-1)
+    return resultat
+
+
+# -----------------------------------------
+# Matrices de recouvrement entre modèles
+# -----------------------------------------
+
+
+def poids_communs(poids):
+    # sum_i min(w_a, w_b) : nul hors du support de a, on ne parcourt que celui-ci
+    M = len(poids)
+    resultat = np.empty((M, M))
+    for a in range(M):
+        support = np.flatnonzero(poids[a])
+        resultat[a] = np.minimum(poids[a, support], poids[:, support]).sum(axis=1)
+    return resultat
+
+
+def recouvrements(coefficients):
+    # coefficients : une ligne par action, une colonne par modèle
+    modeles = list(coefficients.columns)
+    valeurs = np.nan_to_num(coefficients.to_numpy(dtype=np.float64).T)
+
+    bits = bitsets_selection(valeurs)
+    communes = intersections(bits)
+    tailles = np.diag(communes)
+    unions = tailles[:, None] + tailles[None, :] - communes
+    plus_petit = np.minimum(tailles[:, None], tailles[None, :])
+
+    totaux = valeurs.sum(axis=1, keepdims=True)
+    poids = np.divide(valeurs, totaux, out=np.zeros_like(valeurs), where=totaux != 0)
+
+    def matrice(valeurs_matrice):
+        return pd.DataFrame(valeurs_matrice, index=modeles, columns=modeles)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return {
+            "Jaccard": matrice(np.where(unions > 0, communes / unions, np.nan)),
+            "Chevauchement": matrice(
+                np.where(plus_petit > 0, communes / plus_petit, np.nan)
+            ),
+            "Poids communs": matrice(poids_communs(poids)),
+            "Actions communes": matrice(communes),
+        }
+
+
+# =================================================================================
+#             Stabilité de la sélection (plis x actions x modèles)
+# =================================================================================
+
+# Les sélections de chaque modèle sont relevées sur plusieurs sources :
+#   - "pli"            : plis de la validation croisée temporelle (exports de
+#                        thesis.qmd pour les modèles DC-SIS, dont la
+#                        présélection change d'un pli à l'autre ; ré-estimation
+#                        aux hyperparamètres retenus pour les autres) ;
+#   - "rééquilibrage"  : dates de la ré-estimation glissante (thesis_backtest.py).
+# Chaque relevé (source, pli) x modèle est un bitset : le stockage compressé
+# (npz) contient les bitsets et les fréquences de sélection déjà calculées,
+# le tableau de bord ne relit jamais les plis.
+
+CHEMIN_STABILITE = "data/selection_stability.npz"
+MOTIF_PLIS_R = "data/fold_coefficients_*.csv"
+
+
+def selections_plis(X, y, specifications, plis=None):
+    # Ré-estimation de chaque modèle sur la fenêtre d'apprentissage de chaque pli
+    # (moments glissants, démarrage à chaud d'un pli au suivant)
+    actions = np.asarray(X.columns)
+    moments = MomentsGlissants(X.to_numpy(dtype=np.float64), y)
+    plis = decoupages_temporels(len(X)) if plis is None else plis
+
+    betas = {modele: None for modele in specifications}
+    releves = []
+    for pli, ((debut, fin), _) in enumerate(plis, start=1):
+        s = moments.positionner(debut, fin).standardise()
+        for modele, spec in specifications.items():
+            indices = spec["indices"]
+            betas[modele] = enet_positif(
+                s["C"][np.ix_(indices, indices)],
+                s["c"][indices],
+                spec["lambda"],
+                spec["alpha"],
+                spec["facteurs"],
+                betas[modele],
+                s["ecart_y"],
+            )
+            releves.append(
+                pd.DataFrame(
+                    {
+                        "source": "pli",
+                        "pli": str(pli),
+                        "Modele": modele,
+                        "Action": actions[indices[np.flatnonzero(betas[modele])]],
+                    }
+                )
+            )
+    return pd.concat(releves, ignore_index=True)
+
+
+class StabiliteSelection:
+    def __init__(self, bits, releves, modeles, actions, presence):
+        # bits : (relevés x modèles x octets), presence : (relevés x modèles)
+        self.bits = bits
+        self.releves = releves
+        self.modeles = list(modeles)
+        self.actions = list(actions)
+        self.presence = presence
+        self.position_releve = {tuple(r): i for i, r in enumerate(releves)}
+        self.position_modele = {m: i for i, m in enumerate(self.modeles)}
+        self._frequences = {}
+
+    # -----------------------------------------
+    # Construction depuis des relevés (source, pli, Modele, Action)
+    # -----------------------------------------
+
+    @classmethod
+    def depuis_releves(cls, releves, modeles, actions):
+        cles = releves[["source", "pli"]].drop_duplicates()
+        cles = cles.to_numpy(dtype=str)
+        position_releve = {tuple(r): i for i, r in enumerate(cles)}
+        position_modele = {m: i for i, m in enumerate(modeles)}
+        position_action = {a: i for i, a in enumerate(actions)}
+
+        releves = releves[
+            releves["Modele"].isin(position_modele)
+            & releves["Action"].isin(position_action)
+        ]
+        i = np.array(
+            [position_releve[(s, p)] for s, p in zip(releves["source"], releves["pli"])]
+        )
+        j = releves["Modele"].map(position_modele).to_numpy()
+        k = releves["Action"].map(position_action).to_numpy()
+
+        selection = np.zeros((len(cles), len(modeles), len(actions)), dtype=bool)
+        selection[i, j, k] = True
+        presence = np.zeros((len(cles), len(modeles)), dtype=bool)
+        presence[i, j] = True
+
+        stockage = cls(np.packbits(selection, axis=2), cles, modeles, actions, presence)
+        stockage._calculer_frequences(selection)
+        return stockage
+
+    def _calculer_frequences(self, selection):
+        sources = [None] + sorted(set(self.releves[:, 0]))
+        for source in sources:
+            lignes = (
+                np.ones(len(self.releves), dtype=bool)
+                if source is None
+                else self.releves[:, 0] == source
+            )
+            nb_releves = self.presence[lignes].sum(axis=0)
+            comptes = selection[lignes].sum(axis=0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                self._frequences[source] = (comptes / nb_releves[:, None]).astype(
+                    np.float32
+                )
+
+    # -----------------------------------------
+    # Stockage compressé
+    # -----------------------------------------
+
+    def enregistrer(self, chemin=CHEMIN_STABILITE):
+        sources = [s for s in self._frequences if s is not None]
+        np.savez_compressed(
+            chemin,
+            bits=self.bits,
+            releves=self.releves,
+            modeles=np.array(self.modeles),
+            actions=np.array(self.actions),
+            presence=self.presence,
+            sources=np.array(sources, dtype=str),
+            frequences=np.stack(
+                [self._frequences[None]] + [self._frequences[s] for s in sources]
+            ),
+        )
+
+    @classmethod
+    def charger(cls, chemin=CHEMIN_STABILITE):
+        with np.load(chemin) as fichier:
+            stockage = cls(
+                fichier["bits"],
+                fichier["releves"],
+                fichier["modeles"],
+                fichier["actions"],
+                fichier["presence"],
+            )
+            sources = [None] + list(fichier["sources"])
+            stockage._frequences = dict(zip(sources, fichier["frequences"]))
+        return stockage
+
+    # -----------------------------------------
+    # Accès indexé
+    # -----------------------------------------
+
+    def frequences(self, source=None):
+        # Fréquences de sélection précalculées : actions x modèles
+        return pd.DataFrame(
+            self._frequences[source].T, index=self.actions, columns=self.modeles
+        )
+
+    def selection(self, source, pli, modele):
+        bits = self.bits[
+            self.position_releve[(source, str(pli))], self.position_modele[modele]
+        ]
+        masque = np.unpackbits(bits, count=len(self.actions)).astype(bool)
+        return [a for a, retenue in zip(self.actions, masque) if retenue]
+
+
+if __name__ == "__main__":
+    import glob
+
+    from thesis_estimation import ReestimationInteractive, charger_rendements
+    from thesis_registre import RegistreModeles
+    from thesis_resultats import (
+        lire_coefficients,
+        lire_dates_historique,
+        lire_historique,
+        lire_hyperparametres,
+        lire_modeles,
+        ouvrir_resultats,
+        run_recente,
+    )
+
+    ouvrir_resultats()
+    run = run_recente()
+    hyperparametres = lire_hyperparametres(run)
+    registre = RegistreModeles.depuis_tables(lire_modeles(run), hyperparametres)
+    libelles = {e["identifiant"]: e["libelle"] for e in registre.entrees}
+
+    coefficients = lire_coefficients(run)
+    releves = []
+
+    # Plis exportés par thesis.qmd (modèles DC-SIS)
+    for chemin in sorted(glob.glob(MOTIF_PLIS_R)):
+        plis_r = pd.read_csv(chemin)
+        releves.append(
+            pd.DataFrame(
+                {
+                    "source": "pli",
+                    "pli": plis_r["fold"].astype(str),
+                    "Modele": plis_r["model"].map(libelles),
+                    "Action": plis_r["stock"],
+                }
+            )
+        )
+    modeles_r = set(pd.concat(releves)["Modele"]) if releves else set()
+
+    # Plis ré-estimés pour les autres modèles
+    rendements_actions, rendements_indice = charger_rendements()
+    reestimation = ReestimationInteractive(
+        rendements_actions,
+        rendements_indice,
+        coefficients,
+        hyperparametres,
+        pilotes=registre.pilotes(),
+    )
+    specifications = {
+        modele: reestimation.specification(modele)
+        for modele in registre.libelles()
+        if modele not in modeles_r
+    }
+    releves.append(
+        selections_plis(rendements_actions, rendements_indice, specifications)
+    )
+
+    # Dates de rééquilibrage de la ré-estimation glissante (base de résultats)
+    for date in lire_dates_historique(run):
+        historique = lire_historique(run, date)
+        releves.append(
+            pd.DataFrame(
+                {
+                    "source": "rééquilibrage",
+                    "pli": date.strftime("%Y-%m-%d"),
+                    "Modele": historique["Modele"],
+                    "Action": historique["Action"],
+                }
+            )
+        )
+
+    stockage = StabiliteSelection.depuis_releves(
+        pd.concat(releves, ignore_index=True),
+        registre.libelles(),
+        coefficients["Action"],
+    )
+    stockage.enregistrer()
+    print(stockage.frequences().describe().T[["mean", "max"]])
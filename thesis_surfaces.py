@@ -0,0 +1,195 @@
+# Standard libraries
+import warnings
+
+# Data manipulation
+import numpy as np
+import pandas as pd
+
+# Libellés déduits des identifiants (voir thesis_registre.py)
+from thesis_registre import libelle_modele
+
+
+# =================================================================================
+#          Surfaces de validation croisée (alpha x lambda x pli) par modèle
+# =================================================================================
+
+# Les résultats de la validation croisée de chaque pli (exports cv_results_*.csv
+# de thesis.qmd) sont rangés en cubes denses plis x alphas x lambdas, un tableau
+# par modèle et par mesure dans un fichier npz : une cellule de la grille est
+# un indice, pas une recherche. NaN = couple non évalué (recherche par
+# halving : les candidats éliminés n'ont que les premiers plis).
+# Précalculés une fois :
+#   - la moyenne sur les plis (surface alpha x lambda affichée par défaut) ;
+#   - une pyramide de niveaux de zoom : au niveau k, plis et lambdas sont
+#     regroupés par blocs de 2^k (moyenne des cellules évaluées). Le tableau de
+#     bord lit le niveau le plus fin dont la fenêtre visible tient dans
+#     NB_CELLULES_MAX cellules, quel que soit le nombre de plis et de modèles.
+
+CHEMIN_SURFACES = "data/cv_surfaces.npz"
+MOTIF_CV_R = "data/cv_results_*.csv"
+
+MESURES_CV = ["RMSE", "Rsquared", "MAE"]
+NB_CELLULES_MAX = 2500
+
+
+def moyenne_evaluees(tableau, axe):
+    # Moyenne des cellules évaluées ; NaN si aucune ne l'est
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmean(tableau, axis=axe)
+
+
+def moyenne_blocs(tableau, axe):
+    # Moyenne des paires consécutives le long d'un axe (NaN ignorés)
+    if tableau.shape[axe] <= 1:
+        return tableau
+    if tableau.shape[axe] % 2:
+        forme = list(tableau.shape)
+        forme[axe] = 1
+        tableau = np.concatenate([tableau, np.full(forme, np.nan)], axis=axe)
+    forme = list(tableau.shape)
+    forme[axe : axe + 1] = [forme[axe] // 2, 2]
+    return moyenne_evaluees(tableau.reshape(forme), axe + 1)
+
+
+def pyramide(cube, plis, log_lambdas):
+    # cube : plis x alphas x lambdas -> niveaux (cube, plis, log10 lambdas)
+    niveaux = [(cube, plis, log_lambdas)]
+    while len(plis) > 1 or len(log_lambdas) > 1:
+        cube = moyenne_blocs(moyenne_blocs(cube, 0), 2)
+        plis = moyenne_blocs(plis[:, None], 0)[:, 0]
+        log_lambdas = moyenne_blocs(log_lambdas[:, None], 0)[:, 0]
+        niveaux.append((cube, plis, log_lambdas))
+    return niveaux
+
+
+def dans_fenetre(coordonnees, fenetre):
+    if fenetre is None:
+        return np.ones(len(coordonnees), dtype=bool)
+    bas, haut = sorted(fenetre)
+    return (coordonnees >= bas) & (coordonnees <= haut)
+
+
+class MembresNpz(dict):
+    # Membres d'un npz décompressés au premier accès puis conservés
+    def __init__(self, fichier):
+        super().__init__()
+        self.fichier = fichier
+
+    def __missing__(self, cle):
+        self[cle] = self.fichier[cle]
+        return self[cle]
+
+
+class SurfacesValidation:
+    def __init__(self, tableaux):
+        # tableaux : "<modele>/<nom>" -> np.ndarray (npz ou dict)
+        self.tableaux = tableaux
+        self.modeles = list(tableaux["modeles"])
+        self.libelles = dict(zip(tableaux["modeles"], tableaux["libelles"]))
+        self.identifiants = {l: m for m, l in self.libelles.items()}
+
+    def tableau(self, modele, nom):
+        return self.tableaux[f"{self.identifiants[modele]}/{nom}"]
+
+    # -----------------------------------------
+    # Construction depuis des résultats par pli
+    # -----------------------------------------
+
+    @classmethod
+    def depuis_resultats(cls, resultats):
+        # resultats : colonnes model, fold, alpha, lambda, RMSE, Rsquared, MAE
+        tableaux = {}
+        modeles = list(dict.fromkeys(resultats["model"]))
+        for modele in modeles:
+            r = resultats[resultats["model"] == modele]
+            plis = np.unique(r["fold"].to_numpy())
+            alphas = np.unique(r["alpha"].to_numpy(dtype=np.float64))
+            lambdas = np.unique(r["lambda"].to_numpy(dtype=np.float64))
+            i = np.searchsorted(plis, r["fold"].to_numpy())
+            j = np.searchsorted(alphas, r["alpha"].to_numpy(dtype=np.float64))
+            k = np.searchsorted(lambdas, r["lambda"].to_numpy(dtype=np.float64))
+
+            tableaux[f"{modele}/alphas"] = alphas
+            for mesure in MESURES_CV:
+                cube = np.full((len(plis), len(alphas), len(lambdas)), np.nan)
+                cube[i, j, k] = r[mesure].to_numpy(dtype=np.float64)
+                tableaux[f"{modele}/{mesure}/moyenne"] = moyenne_evaluees(cube, 0).astype(
+                    np.float32
+                )
+
+                niveaux = pyramide(cube, plis.astype(np.float64), np.log10(lambdas))
+                for niveau, (c, p, l) in enumerate(niveaux):
+                    tableaux[f"{modele}/{mesure}/{niveau}"] = c.astype(np.float32)
+                    tableaux[f"{modele}/plis/{niveau}"] = p
+                    tableaux[f"{modele}/log_lambdas/{niveau}"] = l
+            tableaux[f"{modele}/nb_niveaux"] = np.array(len(niveaux))
+
+        tableaux["modeles"] = np.array(modeles)
+        tableaux["libelles"] = np.array([libelle_modele(m) for m in modeles])
+        return cls(tableaux)
+
+    # -----------------------------------------
+    # Stockage (npz : un membre par tableau, lu à la demande)
+    # -----------------------------------------
+
+    def enregistrer(self, chemin=CHEMIN_SURFACES):
+        np.savez_compressed(chemin, **self.tableaux)
+
+    @classmethod
+    def charger(cls, chemin=CHEMIN_SURFACES):
+        return cls(MembresNpz(np.load(chemin)))
+
+    # -----------------------------------------
+    # Accès
+    # -----------------------------------------
+
+    def alphas(self, modele):
+        return self.tableau(modele, "alphas")
+
+    def surface_moyenne(self, modele, mesure="RMSE"):
+        # alphas x lambdas, moyenne sur les plis
+        return {
+            "z": self.tableau(modele, f"{mesure}/moyenne"),
+            "x": self.tableau(modele, "log_lambdas/0"),
+            "y": self.alphas(modele),
+            "niveau": 0,
+        }
+
+    def tuile(self, modele, mesure="RMSE", alpha=None, fenetre_x=None, fenetre_y=None):
+        # plis x lambdas pour un alpha, au niveau le plus fin qui tient dans
+        # NB_CELLULES_MAX cellules sur la fenêtre visible (log10 lambda, pli)
+        alphas = self.alphas(modele)
+        j = 0 if alpha is None else int(np.argmin(np.abs(alphas - alpha)))
+
+        nb_niveaux = int(self.tableau(modele, "nb_niveaux"))
+        for niveau in range(nb_niveaux):
+            x = self.tableau(modele, f"log_lambdas/{niveau}")
+            y = self.tableau(modele, f"plis/{niveau}")
+            colonnes = dans_fenetre(x, fenetre_x)
+            lignes = dans_fenetre(y, fenetre_y)
+            if colonnes.sum() * lignes.sum() <= NB_CELLULES_MAX:
+                break
+
+        cube = self.tableau(modele, f"{mesure}/{niveau}")
+        return {
+            "z": cube[np.ix_(lignes, [j], colonnes)][:, 0, :],
+            "x": x[colonnes],
+            "y": y[lignes],
+            "niveau": niveau,
+        }
+
+
+if __name__ == "__main__":
+    import glob
+
+    fichiers = sorted(glob.glob(MOTIF_CV_R))
+    resultats = pd.concat([pd.read_csv(f) for f in fichiers], ignore_index=True)
+    surfaces = SurfacesValidation.depuis_resultats(resultats)
+    surfaces.enregistrer()
+    for modele in surfaces.modeles:
+        print(
+            f"{surfaces.libelles[modele]} : "
+            f"{surfaces.tableaux[f'{modele}/RMSE/0'].shape} (plis x alphas x lambdas), "
+            f"{int(surfaces.tableaux[f'{modele}/nb_niveaux'])} niveaux"
+        )
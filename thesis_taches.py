@@ -0,0 +1,174 @@
+# Standard libraries
+import functools
+import hashlib
+import os
+import pickle
+import threading
+import time
+import uuid
+
+# Background callbacks (dash[diskcache])
+import diskcache
+from dash import DiskcacheManager
+
+
+# =================================================================================
+#                  File de calculs longs (callbacks en arrière-plan)
+# =================================================================================
+
+# Les calculs lourds (validation croisée, bootstrap, backtests...) tournent dans
+# des processus séparés pilotés par Dash : les workers gunicorn restent libres
+# pour les callbacks interactifs.
+#   - les résultats sont conservés sur disque, partagés entre utilisateurs et
+#     indexés par les entrées du callback et l'empreinte des données ;
+#   - deux demandes identiques simultanées ne lancent qu'un seul calcul : la
+#     seconde attend le résultat de la première.
+
+REPERTOIRE_TACHES = "data/cache/taches"
+DUREE_CONSERVATION = 7 * 24 * 3600  # secondes
+INTERVALLE_ATTENTE = 0.25  # secondes
+DUREE_VERROU = 60  # secondes, prolongée tant que le calcul tourne
+
+FICHIERS_DONNEES = [
+    "data/coefficients.csv",
+    "data/data_performance.csv",
+    "data/hyperparameters.csv",
+    "data/nb_variables.csv",
+    "data/performance.csv",
+    "data/returns.csv",
+]
+
+cache_taches = diskcache.Cache(REPERTOIRE_TACHES)
+
+
+# -----------------------------------------
+# Empreinte des données (invalide le cache si un fichier change)
+# -----------------------------------------
+
+# Empreinte du contenu des CSV exportés par thesis.qmd, pas de leurs dates :
+# une réexportation identique (ou une réécriture de results.sqlite, exclue)
+# conserve les résultats. Recalculée à chaque tâche, le contenu n'étant relu
+# que si la taille ou la date d'un fichier a changé depuis le dernier appel.
+
+_empreintes = {}
+_verrou_empreintes = threading.Lock()
+
+
+def empreinte_fichier(chemin):
+    try:
+        statut = os.stat(chemin)
+    except FileNotFoundError:
+        return None
+    signature = (statut.st_size, statut.st_mtime_ns)
+    with _verrou_empreintes:
+        connue = _empreintes.get(chemin)
+    if connue is not None and connue[0] == signature:
+        return connue[1]
+
+    empreinte = hashlib.sha1()
+    with open(chemin, "rb") as fichier:
+        for bloc in iter(lambda: fichier.read(1 << 20), b""):
+            empreinte.update(bloc)
+    with _verrou_empreintes:
+        _empreintes[chemin] = (signature, empreinte.hexdigest())
+    return empreinte.hexdigest()
+
+
+def empreinte_donnees(chemins=FICHIERS_DONNEES):
+    empreinte = hashlib.sha1()
+    for chemin in chemins:
+        contenu = empreinte_fichier(chemin)
+        empreinte.update(f"{os.path.basename(chemin)}:{contenu}".encode())
+    return empreinte.hexdigest()
+
+
+gestionnaire_taches = DiskcacheManager(
+    cache_taches,
+    cache_by=[empreinte_donnees],
+    expire=DUREE_CONSERVATION,
+)
+
+
+# -----------------------------------------
+# Déduplication des calculs identiques en cours
+# -----------------------------------------
+
+
+def cle_tache(fonction, args):
+    contenu = pickle.dumps(
+        (fonction.__module__, fonction.__qualname__, args, empreinte_donnees())
+    )
+    return hashlib.sha256(contenu).hexdigest()
+
+
+# Verrou à durée limitée : le processus qui calcule le prolonge régulièrement
+# (fil d'entretien). Si la tâche est annulée (processus arrêté par Dash) ou
+# plante, le verrou expire de lui-même et une demande en attente reprend le
+# calcul ; le jeton évite de libérer le verrou d'un autre propriétaire.
+
+
+def acquerir_verrou(cle_verrou):
+    jeton = uuid.uuid4().hex
+    if cache_taches.add(cle_verrou, jeton, expire=DUREE_VERROU):
+        return jeton
+    return None
+
+
+def entretenir_verrou(cle_verrou, jeton, arret):
+    while not arret.wait(DUREE_VERROU / 3):
+        with cache_taches.transact():
+            if cache_taches.get(cle_verrou) != jeton:
+                return
+            cache_taches.touch(cle_verrou, expire=DUREE_VERROU)
+
+
+def liberer_verrou(cle_verrou, jeton):
+    with cache_taches.transact():
+        if cache_taches.get(cle_verrou) == jeton:
+            cache_taches.delete(cle_verrou)
+
+
+def tache_partagee(attente=None):
+    # attente : valeur de progression affichée pendant l'attente d'un calcul
+    # identique lancé par une autre session
+    def decorateur(fonction):
+        @functools.wraps(fonction)
+        def enveloppe(set_progress, *args):
+            cle = cle_tache(fonction, args)
+            cle_resultat = f"resultat:{cle}"
+            cle_verrou = f"verrou:{cle}"
+
+            while True:
+                resultat = cache_taches.get(cle_resultat, default=None)
+                if resultat is not None:
+                    return pickle.loads(resultat)
+
+                # Premier arrivé : réserve le calcul
+                jeton = acquerir_verrou(cle_verrou)
+                if jeton is not None:
+                    break
+
+                # Calcul identique en cours (verrou prolongé) : attendre
+                if attente is not None:
+                    set_progress(attente)
+                time.sleep(INTERVALLE_ATTENTE)
+
+            arret = threading.Event()
+            entretien = threading.Thread(
+                target=entretenir_verrou, args=(cle_verrou, jeton, arret), daemon=True
+            )
+            entretien.start()
+            try:
+                resultat = fonction(set_progress, *args)
+                cache_taches.set(
+                    cle_resultat, pickle.dumps(resultat), expire=DUREE_CONSERVATION
+                )
+            finally:
+                arret.set()
+                entretien.join()
+                liberer_verrou(cle_verrou, jeton)
+            return resultat
+
+        return enveloppe
+
+    return decorateur